@@ -0,0 +1,95 @@
+"""Startup time when importing every route module vs. loading a snapshot.
+
+Usage:
+    python -m benchmarks.cold_start [modules] [routes_per_module]
+
+Generates a package of route modules in a temporary directory, builds a
+snapshot of it, then times (in fresh interpreters) registering the
+routes by importing every module, and loading the snapshot, each up to
+the first request being served and up to one request to every module
+having been served (with the snapshot, each of those imports a module
+into the serving app, which must publish its routes in one rebuild).
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+
+MODULE = """from blank import GET, POST
+
+# Stand-in for the module-level setup real handler modules do.
+TABLE = {{i: str(i) * 4 for i in range(20000)}}
+{routes}"""
+
+ROUTE = textwrap.dedent('''
+    @{method}("/m{m}/r{r}/{{id}}")
+    def handler_{r}(id):
+        return f"{m}/{r}/{{id}}"
+''')
+
+BOOT = textwrap.dedent('''
+    import sys, time
+    started = time.perf_counter()
+    from blank import load_app, load_snapshot
+    from blank.testing import Client
+    if sys.argv[1] == "import":
+        app = load_app(*[f"routes_pkg.m{{i}}" for i in range({modules})])
+    else:
+        app = load_snapshot(sys.argv[2])
+    ready = time.perf_counter()
+    assert Client(app).get("/m0/r0/1").status_code == 200
+    first = time.perf_counter()
+    for i in range(1, {modules}):
+        assert Client(app).get(f"/m{{i}}/r0/1").status_code == 200
+    every = time.perf_counter()
+    print(f"{{ready - started:.3f}} {{first - started:.3f}} {{every - started:.3f}}")
+''')
+
+
+def boot(workdir, mode, snapshot, modules):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([workdir, os.getcwd()]))
+    env["PYTHONDONTWRITEBYTECODE"] = "0"
+    out = subprocess.run(
+        [sys.executable, "-c", BOOT.format(modules=modules), mode, snapshot],
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout.split()
+    return float(out[0]), float(out[1]), float(out[2])
+
+
+def main():
+    modules = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    per_module = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+
+    with tempfile.TemporaryDirectory() as workdir:
+        package = os.path.join(workdir, "routes_pkg")
+        os.mkdir(package)
+        open(os.path.join(package, "__init__.py"), "w").close()
+        for m in range(modules):
+            routes = "".join(
+                ROUTE.format(method="GET" if r % 2 == 0 else "POST", m=m, r=r)
+                for r in range(per_module)
+            )
+            with open(os.path.join(package, f"m{m}.py"), "w") as f:
+                f.write(MODULE.format(routes=routes))
+
+        snapshot = os.path.join(workdir, "routes.snapshot")
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([workdir, os.getcwd()]))
+        subprocess.run(
+            [sys.executable, "-m", "blank", "snapshot",
+             *[f"routes_pkg.m{i}" for i in range(modules)], "-o", snapshot],
+            env=env, check=True, capture_output=True,
+        )
+
+        print(f"{modules * per_module} routes in {modules} modules")
+        for mode in ("import", "snapshot"):
+            runs = [boot(workdir, mode, snapshot, modules) for _ in range(3)]
+            ready = min(r[0] for r in runs)
+            first = min(r[1] for r in runs)
+            every = min(r[2] for r in runs)
+            print(f"{mode:9} ready: {ready * 1000:7.1f} ms   first response: {first * 1000:7.1f} ms"
+                  f"   every module: {every * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Latency of a light route while CPU-bound requests run inline or in processes.
+
+Usage:
+    python -m benchmarks.process_offload [heavy_requests] [n]
+
+Serves /fib/{n} twice on a local SelectorServer, once inline and once
+with executor='process', and measures /ping latency while the given
+number of heavy requests are in flight.
+"""
+import http.client
+import statistics
+import sys
+import threading
+import time
+
+from blank import App, ProcessPool, SelectorServer
+
+
+def fib(n):
+    n = int(n)
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, (a + b) % 1000000007
+    return str(a)
+
+
+def ping():
+    return "pong"
+
+
+def run(executor, heavy, n):
+    app = App()
+    app.processes = ProcessPool(max_pending=heavy)
+    app.get("/fib/{n}", executor=executor)(fib)
+    app.get("/ping")(ping)
+
+    server = SelectorServer(("127.0.0.1", 0), app, workers=heavy + 2)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    address = server.server_address
+
+    def get(path):
+        conn = http.client.HTTPConnection(*address, timeout=120)
+        conn.request("GET", path)
+        conn.getresponse().read()
+        conn.close()
+
+    get("/fib/1")
+    workers = [threading.Thread(target=get, args=(f"/fib/{n}",)) for _ in range(heavy)]
+    for thread in workers:
+        thread.start()
+
+    latencies = []
+    while any(thread.is_alive() for thread in workers):
+        started = time.perf_counter()
+        get("/ping")
+        latencies.append(time.perf_counter() - started)
+
+    for thread in workers:
+        thread.join()
+    server.shutdown()
+    server.server_close()
+    app.processes.shutdown()
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99)] if latencies else 0.0
+    median = statistics.median(latencies) if latencies else 0.0
+    print(
+        f"{executor:8} pings: {len(latencies):6}  "
+        f"median: {median * 1000:8.2f} ms  p99: {p99 * 1000:8.2f} ms"
+    )
+
+
+def main():
+    heavy = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 3000000
+    run("inline", heavy, n)
+    run("process", heavy, n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Request cost in production mode versus debug mode.
+
+Usage:
+    python -m benchmarks.production_mode [requests] [clients]
+
+Times App.dispatch in-process for a dynamic route and for a failing
+route (where debug mode formats the exception into the body and
+production answers with the precomputed 500, printing the traceback of
+a 1% sample to stderr, also redirected to /dev/null), then measures requests
+per second through Router, whose request log goes to stdout (redirected
+to /dev/null here) for every request in debug mode and for a 1% sample
+in production.
+"""
+import contextlib
+import http.client
+import os
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+from blank import App, Router
+
+
+def build(production):
+    app = App(production=production)
+
+    @app.get("/hello/{name}")
+    def hello(name):
+        return f"Hello, {name}"
+
+    @app.get("/fail/{name}")
+    def fail(name):
+        raise LookupError(f"no such thing: {name}")
+
+    return app
+
+
+def per_request(app, path, requests):
+    dispatch = app.dispatch
+    started = time.perf_counter()
+    for i in range(requests):
+        dispatch("GET", f"{path}/{i}")
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def router_rate(app, requests, clients):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Router)
+    server.app = app
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    per_client = requests // clients
+
+    def run():
+        for i in range(per_client):
+            conn = http.client.HTTPConnection(*server.server_address, timeout=10)
+            conn.request("GET", f"/hello/{i}")
+            conn.getresponse().read()
+            conn.close()
+
+    threads = [threading.Thread(target=run) for _ in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+    server.server_close()
+    return per_client * clients / elapsed
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    debug, production = build(False), build(True)
+    with open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+        results = {}
+        for label, app in (("debug", debug), ("production", production)):
+            per_request(app, "/hello", requests // 10)
+            router_rate(app, requests // 10, clients)
+            results[label] = (
+                per_request(app, "/hello", requests * 10),
+                per_request(app, "/fail", requests),
+                router_rate(app, requests, clients),
+            )
+
+    for label, (ok, failed, rate) in results.items():
+        print(f"{label:11} dispatch {ok:6.2f} us   500 {failed:6.2f} us   "
+              f"Router {rate:7.0f} req/s")
+    (ok_d, failed_d, rate_d), (ok_p, failed_p, rate_p) = results.values()
+    print(f"{'speedup':11} dispatch {ok_d / ok_p:5.2f}x   500 {failed_d / failed_p:5.2f}x   "
+          f"Router {rate_p / rate_d:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Checking many routes with Client one by one versus Runner.
+
+Usage:
+    python -m benchmarks.runner [requests] [workers]
+
+Registers 1000 routes and requests them round-robin, first with a
+Client loop (a TestResponse per request), then with Runner on threads
+and on forked processes (compact results).
+"""
+import sys
+import time
+
+from blank import App, Client, Runner
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    app = App()
+    for r in range(1000):
+        app.get(f"/r{r}/{{id}}")(lambda id, r=r: f"{r}/{id}")
+    targets = [f"/r{i % 1000}/{i}" for i in range(requests)]
+
+    client = Client(app)
+    started = time.perf_counter()
+    for target in targets:
+        client.get(target)
+    baseline = requests / (time.perf_counter() - started)
+    print(f"{'Client loop':22} {baseline:9.0f} req/s")
+
+    for executor in ("thread", "process"):
+        summary = Runner(app, workers, executor).run(targets).summary()
+        print(f"{'Runner ' + executor:22} {summary['rps']:9.0f} req/s   "
+              f"p50 {summary['p50_ms']:.3f} ms   p99 {summary['p99_ms']:.3f} ms   "
+              f"({summary['rps'] / baseline:4.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
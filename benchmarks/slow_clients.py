@@ -0,0 +1,84 @@
+"""Throughput of well-behaved clients while thousands of slow clients hold connections.
+
+Usage:
+    python -m benchmarks.slow_clients [slow_clients] [requests]
+
+Opens the given number of slowloris-style connections (partial headers,
+one byte every second) against a local SelectorServer, and compares the
+request rate of a keep-alive client before and during the attack.
+"""
+import http.client
+import socket
+import sys
+import threading
+import time
+
+from blank import App, SelectorServer
+
+
+def measure(address, requests):
+    conn = http.client.HTTPConnection(*address, timeout=10)
+    started = time.perf_counter()
+    for i in range(requests):
+        conn.request("GET", f"/hello/{i}")
+        conn.getresponse().read()
+    conn.close()
+    return requests / (time.perf_counter() - started)
+
+
+def main():
+    slow_clients = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    app = App()
+
+    @app.get("/hello/{name}")
+    def hello(name):
+        return f"Hello, {name}"
+
+    server = SelectorServer(
+        ("127.0.0.1", 0),
+        app,
+        header_timeout=60,
+        read_timeout=60,
+        max_connections=slow_clients + 100,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    baseline = measure(server.server_address, requests)
+    print(f"baseline:        {baseline:10.0f} req/s")
+
+    slow = []
+    for _ in range(slow_clients):
+        sock = socket.create_connection(server.server_address)
+        sock.sendall(b"GET / HTTP/1.1\r\n")
+        slow.append(sock)
+
+    stop = threading.Event()
+
+    def trickle():
+        while not stop.wait(1):
+            for sock in slow:
+                try:
+                    sock.sendall(b"X")
+                except OSError:
+                    pass
+
+    threading.Thread(target=trickle, daemon=True).start()
+
+    while server.connection_count < slow_clients:
+        time.sleep(0.05)
+
+    under_attack = measure(server.server_address, requests)
+    print(f"{slow_clients} slow clients: {under_attack:10.0f} req/s "
+          f"({under_attack / baseline:.0%} of baseline)")
+
+    stop.set()
+    for sock in slow:
+        sock.close()
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Memory and fan-out latency with thousands of SSE subscribers on one server.
+
+Usage:
+    python -m benchmarks.sse_fanout [subscribers] [events]
+
+Runs a SelectorServer with one Broadcaster in this process, and opens
+the given number of subscriber connections from a child process (so
+each side stays within its own file descriptor limit). Reports the
+server's resident memory per subscriber and how long each published
+event takes to reach every subscriber.
+"""
+import multiprocessing
+import os
+import resource
+import selectors
+import socket
+import sys
+import threading
+import time
+
+from blank import App, Broadcaster, SelectorServer
+
+
+def rss_kib():
+    with open(f"/proc/{os.getpid()}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def subscribers(address, count, events, ready, done):
+    """Child process: open count streams and count received events."""
+    selector = selectors.DefaultSelector()
+    socks = []
+    for _ in range(count):
+        sock = socket.create_connection(address)
+        sock.sendall(b"GET /events HTTP/1.1\r\n\r\n")
+        sock.setblocking(False)
+        selector.register(sock, selectors.EVENT_READ)
+        socks.append(sock)
+    ready.set()
+
+    expected = events * count
+    received = 0
+    while received < expected:
+        for key, _ in selector.select(5):
+            try:
+                data = key.fileobj.recv(65536)
+            except BlockingIOError:
+                continue
+            received += data.count(b"data: tick")
+    done.set()
+    for sock in socks:
+        sock.close()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    events = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    app = App()
+    updates = Broadcaster(heartbeat=15)
+    app.sse("/events")(lambda: updates)
+
+    server = SelectorServer(("127.0.0.1", 0), app, max_connections=count + 100)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    baseline = rss_kib()
+
+    context = multiprocessing.get_context("fork")
+    ready, done = context.Event(), context.Event()
+    child = context.Process(
+        target=subscribers, args=(server.server_address, count, events, ready, done)
+    )
+    child.start()
+    ready.wait()
+    while updates.stats()["subscribers"] < count:
+        time.sleep(0.05)
+    subscribed = rss_kib()
+
+    started = time.perf_counter()
+    for i in range(events):
+        updates.publish(f"tick {i}", id=str(i))
+    done.wait()
+    elapsed = time.perf_counter() - started
+    child.join()
+
+    print(f"subscribers:        {count}")
+    print(f"memory:             {(subscribed - baseline) / 1024:.1f} MiB "
+          f"({(subscribed - baseline) * 1024 / count:.0f} bytes per subscriber)")
+    print(f"events:             {events}, delivered to all in {elapsed:.3f} s "
+          f"({elapsed / events * 1000:.1f} ms per event)")
+    print(f"writes:             {count * events / elapsed:,.0f} per second")
+
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == "__main__":
+    main()
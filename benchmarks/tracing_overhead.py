@@ -0,0 +1,54 @@
+"""Per-request dispatch cost with tracing off, unsampled and sampled.
+
+Usage:
+    python -m benchmarks.tracing_overhead [requests]
+
+Dispatches the same request through App.dispatch without a tracer, with
+a tracer sampling nothing, sampling 1% and sampling everything, and
+prints the mean cost per request.
+"""
+import sys
+import time
+
+from blank import App, MemoryExporter, Tracer
+
+
+def measure(app, requests):
+    dispatch = app.dispatch
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = dispatch("GET", "/users/42?active=true")
+        if response.trace is not None:
+            response.trace.finish(response.status)
+    return (time.perf_counter() - started) / requests
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    app = App()
+
+    @app.get("/users/{id}")
+    def user(id, active):
+        return f"User {id}"
+
+    results = []
+    for label, tracer in (
+        ("no tracer", None),
+        ("rate 0", Tracer(sample_rate=0.0)),
+        ("rate 0.01", Tracer(sample_rate=0.01, exporter=MemoryExporter())),
+        ("rate 1", Tracer(sample_rate=1.0, exporter=MemoryExporter())),
+    ):
+        app.tracer = tracer
+        measure(app, requests // 10)
+        results.append((label, measure(app, requests)))
+        if tracer is not None:
+            tracer.shutdown()
+
+    baseline = results[0][1]
+    for label, cost in results:
+        print(f"{label:10} {cost * 1e6:8.2f} us/request  ({cost / baseline:5.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
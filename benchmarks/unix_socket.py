@@ -0,0 +1,87 @@
+"""Request rate over a Unix domain socket versus loopback TCP.
+
+Usage:
+    python -m benchmarks.unix_socket [requests] [clients]
+
+Serves the same app with SelectorServer and with Router (UnixHTTPServer
+and ThreadingHTTPServer), once on 127.0.0.1 and once on a socket file,
+and measures keep-alive requests per second from concurrent clients
+(one connection per request for Router, which closes after each
+response to HTTP/1.0 clients).
+"""
+import http.client
+import os
+import sys
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import ThreadingHTTPServer
+
+from blank import App, Router, SelectorServer, UnixHTTPServer
+from blank.testing import UnixHTTPConnection
+
+
+def measure(connect, requests, clients):
+    per_client = requests // clients
+
+    def run():
+        conn = connect()
+        for i in range(per_client):
+            conn.request("GET", f"/hello/{i}")
+            conn.getresponse().read()
+        conn.close()
+
+    threads = [threading.Thread(target=run) for _ in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return per_client * clients / (time.perf_counter() - started)
+
+
+def serve(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    app = App()
+
+    @app.get("/hello/{name}")
+    def hello(name):
+        return f"Hello, {name}"
+
+    Router.log_message = lambda self, format, *args: None
+    path = os.path.join(tempfile.mkdtemp(), "blank.sock")
+
+    pairs = (
+        ("SelectorServer", partial(SelectorServer, app=app), partial(SelectorServer, app=app)),
+        ("Router", partial(ThreadingHTTPServer, RequestHandlerClass=Router),
+         partial(UnixHTTPServer, RequestHandlerClass=Router)),
+    )
+    for label, make_tcp, make_unix in pairs:
+        tcp, unix = make_tcp(("127.0.0.1", 0)), make_unix(path)
+        tcp.app = unix.app = app
+        serve(tcp)
+        serve(unix)
+        connect_tcp = partial(http.client.HTTPConnection, *tcp.server_address, timeout=10)
+        connect_unix = partial(UnixHTTPConnection, unix.server_address, timeout=10)
+        measure(connect_tcp, requests // 10, clients)
+        measure(connect_unix, requests // 10, clients)
+
+        tcp_rate = measure(connect_tcp, requests, clients)
+        unix_rate = measure(connect_unix, requests, clients)
+        print(f"{label:15} tcp {tcp_rate:9.0f} req/s   unix {unix_rate:9.0f} req/s"
+              f"   ({unix_rate / tcp_rate:4.2f}x)")
+        for server in (tcp, unix):
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""Command line tools.
+
+Usage:
+    python -m blank snapshot myservice.routes -o routes.snapshot
+"""
+import sys
+
+from blank.core.snapshot import main as snapshot
+
+
+def main() -> None:
+    commands = {"snapshot": snapshot}
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print(__doc__.strip())
+        sys.exit(2)
+    commands[sys.argv[1]](sys.argv[2:])
+
+
+if __name__ == "__main__":
+    main()
@@ -117,8 +117,15 @@ class URLParser:
             Dictionary of extracted parameters with type coercion,
             or None if path doesn't match pattern
         """
-        normalized = cls._normalize_path(path)
-        match = pattern.match(normalized)
+        return cls.match_path_params(pattern, cls._normalize_path(path))
+    
+    @classmethod
+    def match_path_params(cls, pattern: re.Pattern, path: str) -> Optional[Dict[str, Any]]:
+        """Like extract_path_params, for a path that is already normalized.
+        
+        Used by the dispatch core, which normalizes each request path once.
+        """
+        match = pattern.match(path)
         
         if not match:
             return None
@@ -5,4 +5,5 @@ from typing import Callable, Tuple, Dict, Any, TypeAlias
 RouteHandler: TypeAlias = Callable[..., str]
 RouteEntry: TypeAlias = Tuple[RouteHandler, re.Pattern]
 RouteDict: TypeAlias = Dict[str, RouteEntry]
-ParamsDict: TypeAlias = Dict[str, Any]
\ No newline at end of file
+ParamsDict: TypeAlias = Dict[str, Any]
+Middleware: TypeAlias = Callable[..., Any]
@@ -1,12 +1,85 @@
-from blank.core.server import Router, HTTPServer
-from blank.core.routing import GET, POST, find_route, get_routes, post_routes
+from blank.core.server import (
+    Router,
+    HTTPServer,
+    ThreadingHTTPServer,
+    UnixHTTPServer,
+    SocketHTTPServer,
+)
+from blank.core.listeners import bind_unix, listen_fds
+from blank.core.admission import AdmissionController
+from blank.core.ratelimit import RateLimiter, RateLimit
+from blank.core.tasks import TaskQueue
+from blank.core.offload import ProcessPool
+from blank.core.batch import BatchHandler
+from blank.core.singleflight import SingleFlight, Coalesce
+from blank.core.sse import Broadcaster, EventStream, Subscription
+from blank.core.tracing import Tracer, JSONLinesExporter, MemoryExporter, span
+from blank.core.memory import MemoryProfiler
+from blank.core.timing import server_timing
+from blank.core.selector_server import SelectorServer
+from blank.core.reload import Reloader, load_app
+from blank.core.snapshot import StaleSnapshotError, load_snapshot, save_snapshot
+from blank.core.app import App
+from blank.core.routing import (
+    GET,
+    POST,
+    PUT,
+    PATCH,
+    DELETE,
+    SSE,
+    find_route,
+    get_routes,
+    post_routes,
+    use,
+    default_app,
+)
+from blank.core.middleware import UseMiddleware
+from blank.core.http import Request, Response
 
 __all__ = [
     "Router",
     "HTTPServer",
+    "ThreadingHTTPServer",
+    "UnixHTTPServer",
+    "SocketHTTPServer",
+    "SelectorServer",
+    "bind_unix",
+    "listen_fds",
+    "Reloader",
+    "load_app",
+    "load_snapshot",
+    "save_snapshot",
+    "StaleSnapshotError",
+    "AdmissionController",
+    "RateLimiter",
+    "RateLimit",
+    "TaskQueue",
+    "ProcessPool",
+    "BatchHandler",
+    "SingleFlight",
+    "Coalesce",
+    "Broadcaster",
+    "EventStream",
+    "Subscription",
+    "Tracer",
+    "JSONLinesExporter",
+    "MemoryExporter",
+    "span",
+    "MemoryProfiler",
+    "server_timing",
+    "App",
+    "default_app",
     "GET",
     "POST",
+    "PUT",
+    "PATCH",
+    "DELETE",
+    "SSE",
     "find_route",
     "get_routes",
     "post_routes",
+    "use",
+    "UseMiddleware",
+    "Request",
+    "Response",
 ]
@@ -0,0 +1,165 @@
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from blank.common.parsing import URLParser
+from blank.core.http import StaticResponse
+
+__all__ = ["AdmissionController"]
+
+
+class AdmissionController:
+    """Caps in-flight requests and sheds the excess with a fast 503.
+
+    A request that finds no free slot waits at most ``max_queue_wait``
+    seconds (and only if fewer than ``max_queued`` requests are already
+    waiting); otherwise it is rejected before routing with a precomputed
+    ``503 Service Unavailable`` carrying ``Retry-After``.
+
+    With ``target_latency`` set, the limit adapts between ``min_limit``
+    and ``max_in_flight``: it shrinks multiplicatively while the observed
+    latency exceeds the target and grows by one slot while it does not.
+
+    Example:
+        app.admission = AdmissionController(
+            max_in_flight=32,
+            max_queue_wait=0.05,
+            exempt=['/health'],
+        )
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 64,
+        max_queue_wait: float = 0.0,
+        max_queued: int = 64,
+        retry_after: int = 1,
+        exempt: Iterable[str] = (),
+        target_latency: Optional[float] = None,
+        min_limit: int = 1,
+        adjust_every: int = 16,
+    ):
+        """Initialize the controller.
+
+        Args:
+            max_in_flight: Maximum concurrently running requests
+            max_queue_wait: Seconds a request may wait for a free slot
+            max_queued: Maximum number of requests waiting for a slot
+            retry_after: Value of the Retry-After header on 503 responses
+            exempt: Paths that are never shed (e.g. health checks)
+            target_latency: Latency in seconds to steer the limit towards,
+                or None for a fixed limit
+            min_limit: Lowest limit the adaptive mode may reach
+            adjust_every: Completed requests between adaptive adjustments
+        """
+        self.max_in_flight = max_in_flight
+        self.max_queue_wait = max_queue_wait
+        self.max_queued = max_queued
+        self.exempt = frozenset(URLParser._normalize_path(p) for p in exempt)
+        self.target_latency = target_latency
+        self.min_limit = min_limit
+        self.adjust_every = adjust_every
+        self.limit = max_in_flight
+        self.rejection = StaticResponse(
+            "503 Service Unavailable",
+            503,
+            "Service Unavailable",
+            {"Content-Type": "text/plain", "Retry-After": str(retry_after)},
+        )
+
+        self._cond = threading.Condition(threading.Lock())
+        self._in_flight = 0
+        self._queued = 0
+        self._admitted = 0
+        self._shed = 0
+        self._exempted = 0
+        self._completed = 0
+        self._latency_sum = 0.0
+
+    def enter(self, target: str, wait: bool = True) -> Optional[float]:
+        """Try to admit a request.
+
+        Args:
+            target: Raw request target, used only for the exemption check
+            wait: Wait up to ``max_queue_wait`` for a slot; False sheds at
+                once when none is free (for callers that must not block)
+
+        Returns:
+            Start time to pass to leave() if admitted, 0.0 if the request
+            is exempt (and untracked), or None if it must be shed
+        """
+        if self.exempt and URLParser._normalize_path(target.partition("?")[0]) in self.exempt:
+            self._exempted += 1
+            return 0.0
+
+        with self._cond:
+            if self._in_flight < self.limit:
+                self._in_flight += 1
+                self._admitted += 1
+                return time.perf_counter()
+
+            if not wait or self.max_queue_wait <= 0 or self._queued >= self.max_queued:
+                self._shed += 1
+                return None
+
+            self._queued += 1
+            deadline = time.monotonic() + self.max_queue_wait
+            try:
+                while self._in_flight >= self.limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._cond.wait(remaining):
+                        if self._in_flight < self.limit:
+                            break
+                        self._shed += 1
+                        return None
+            finally:
+                self._queued -= 1
+
+            self._in_flight += 1
+            self._admitted += 1
+            return time.perf_counter()
+
+    def leave(self, started: float) -> None:
+        """Release the slot taken by enter() and record the latency."""
+        if not started:
+            return
+
+        elapsed = time.perf_counter() - started
+        with self._cond:
+            self._in_flight -= 1
+            if self.target_latency is not None:
+                self._observe(elapsed)
+            self._cond.notify()
+
+    def _observe(self, elapsed: float) -> None:
+        """Adjust the limit from the mean latency of the last window."""
+        self._completed += 1
+        self._latency_sum += elapsed
+        if self._completed < self.adjust_every:
+            return
+
+        mean = self._latency_sum / self._completed
+        self._completed = 0
+        self._latency_sum = 0.0
+
+        if mean > self.target_latency:
+            self.limit = max(self.min_limit, int(self.limit * 0.9))
+        elif self.limit < self.max_in_flight:
+            self.limit += 1
+            self._cond.notify()
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of admission counters.
+
+        Returns:
+            Dict with admitted, shed, exempt, in_flight, queued and limit
+        """
+        with self._cond:
+            return {
+                "admitted": self._admitted,
+                "shed": self._shed,
+                "exempt": self._exempted,
+                "in_flight": self._in_flight,
+                "queued": self._queued,
+                "limit": self.limit,
+            }
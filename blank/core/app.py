@@ -0,0 +1,801 @@
+import itertools
+import os
+import random
+import re
+import sys
+import threading
+import traceback
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from blank.common.parsing import URLParser
+from blank.common.types import Middleware, RouteDict, RouteEntry, RouteHandler
+from blank.core.admission import AdmissionController
+from blank.core.batch import BatchHandler
+from blank.core.http import Request, Response, StaticResponse
+from blank.core.memory import MemoryProfiler
+from blank.core.middleware import _compiled_in, _wants_request, compose, endpoint
+from blank.core.offload import EXECUTORS, ProcessPool, ProcessRoute, process_endpoint
+from blank.core.ratelimit import RateLimiter
+from blank.core.singleflight import coalesce_endpoint
+from blank.core.snapshot import LazyHandler, lazy_chain
+from blank.core.sse import EventRoute, stream_endpoint
+from blank.core.tasks import TaskQueue
+from blank.core.timing import BOUND, HANDLED, MATCHED, PARSED, ServerTiming
+from blank.core.tracing import Trace, Tracer
+
+__all__ = ["App", "METHODS", "MethodMap", "RouteRegistry", "RouteTable"]
+
+Chain = Callable[[Request], Response]
+
+METHODS = ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS")
+
+INTERNAL_ERROR = StaticResponse(
+    "500 Internal Server Error",
+    500,
+    "Internal Server Error",
+    {"Content-Type": "text/plain"},
+)
+
+
+# Serializes route registration and table compilation across all apps,
+# since a mounted app compiles against its parents' middleware.
+_registry_lock = threading.RLock()
+
+# Registration sequence shared by every method, for route precedence.
+_sequence = itertools.count()
+
+
+def production_from_env() -> bool:
+    """Whether the BLANK_ENV environment variable selects production mode."""
+    return os.environ.get("BLANK_ENV", "").strip().lower() == "production"
+
+
+class RouteRegistry(dict):
+    """Route dictionary (path -> (handler, pattern)) owned by an App.
+
+    Behaves like a plain dict, but every mutation holds the registration
+    lock and replaces the owning app's compiled route index. Dispatch
+    only reads the compiled index, never this dict.
+    """
+
+    def __init__(self, app: "App"):
+        super().__init__()
+        self._app = app
+        # Position of each path in the registration sequence of all methods
+        self.order: Dict[str, int] = {}
+
+    def __setitem__(self, path: str, entry: RouteEntry):
+        with _registry_lock:
+            super().__setitem__(path, entry)
+            self._record(path)
+            self._app._invalidate()
+
+    def __delitem__(self, path: str):
+        with _registry_lock:
+            super().__delitem__(path)
+            self.order.pop(path, None)
+            self._app._invalidate()
+
+    def clear(self):
+        with _registry_lock:
+            super().clear()
+            self.order.clear()
+            self._app._invalidate()
+
+    def pop(self, path: str, *default):
+        with _registry_lock:
+            result = super().pop(path, *default)
+            self.order.pop(path, None)
+            self._app._invalidate()
+            return result
+
+    def popitem(self):
+        with _registry_lock:
+            result = super().popitem()
+            self.order.pop(result[0], None)
+            self._app._invalidate()
+            return result
+
+    def setdefault(self, path: str, entry: RouteEntry = None):
+        with _registry_lock:
+            result = super().setdefault(path, entry)
+            self._record(path)
+            self._app._invalidate()
+            return result
+
+    def update(self, *args, **kwargs):
+        with _registry_lock:
+            super().update(*args, **kwargs)
+            for path in dict(*args, **kwargs):
+                self._record(path)
+            self._app._invalidate()
+
+    def _record(self, path: str) -> None:
+        if path not in self.order:
+            self.order[path] = next(_sequence)
+
+
+class MethodMap:
+    """Chains registered for one path, keyed by HTTP method.
+
+    HEAD falls back to the GET chain, and the Allow header value is
+    computed once at compile time.
+    """
+
+    __slots__ = ("chains", "allow", "path")
+
+    def __init__(self, chains: Dict[str, Chain], path: str = ""):
+        if "GET" in chains:
+            chains.setdefault("HEAD", chains["GET"])
+        self.chains = chains
+        self.path = path
+        self.allow = ", ".join(
+            m for m in METHODS if m in chains or m == "OPTIONS"
+        )
+
+
+class RouteTable:
+    """Compiled, immutable route index covering every HTTP method.
+
+    Static paths (no {params}) are resolved with a single dict lookup;
+    parameterized paths are tried afterwards in the order their method
+    registered them. Each path maps to a MethodMap, so a path match
+    immediately tells a missing method (405) apart from a missing route
+    (404); for that, all parameterized paths are kept in the order of
+    their first registration for any method, and the Allow header of a
+    405 or OPTIONS reply lists the methods of every route matching the
+    path, static or parameterized.
+    """
+
+    __slots__ = ("static", "dynamic", "by_method")
+
+    def __init__(
+        self,
+        static: Dict[str, MethodMap],
+        dynamic: Tuple[Tuple[re.Pattern, MethodMap], ...],
+        by_method: Dict[str, Tuple[Tuple[re.Pattern, Chain, MethodMap], ...]],
+    ):
+        self.static = static
+        self.dynamic = dynamic
+        self.by_method = by_method
+
+    def match(
+        self,
+        path: str,
+        method: str
+    ) -> Tuple[Optional[Chain], Dict[str, Any], Optional[MethodMap]]:
+        """Find the chain for a normalized path and method.
+
+        Returns:
+            Tuple of (chain, path parameters dict, method map). The chain is
+            None if no route handles the method; the method map then covers
+            every route matching the path (for 405/OPTIONS), or is None if
+            no path matched.
+        """
+        allowed = self.static.get(path)
+        if allowed is not None:
+            chain = allowed.chains.get(method)
+            if chain is not None:
+                return chain, {}, allowed
+
+        for pattern, chain, methods in self.by_method.get(method, ()):
+            path_params = URLParser.match_path_params(pattern, path)
+            if path_params is not None:
+                return chain, path_params, methods
+
+        matches = [] if allowed is None else [allowed]
+        for pattern, methods in self.dynamic:
+            if pattern.match(path):
+                matches.append(methods)
+        if len(matches) <= 1:
+            return None, {}, matches[0] if matches else None
+        chains: Dict[str, Chain] = {}
+        for methods in reversed(matches):
+            chains.update(methods.chains)
+        return None, {}, MethodMap(chains, matches[0].path)
+
+
+def _rate_limited(limiter: RateLimiter, chain: Chain, request: Request) -> Response:
+    rejection = limiter.check(request)
+    if rejection is not None:
+        return rejection
+    return chain(request)
+
+
+class App:
+    """An application: its own route index, middleware and mounted sub-apps.
+
+    Independent apps can coexist in one process. Sub-apps mounted under a
+    path prefix keep their own small route indexes.
+
+    Example:
+        api = App()
+
+        @api.get('/users/{id}')
+        def get_user(id):
+            return f'User {id}'
+
+        app = App()
+        app.mount('/api', api)
+        app.dispatch('GET', '/api/users/42').text  # 'User 42'
+
+    In production mode (``App(production=True)``, or ``BLANK_ENV=production``
+    in the environment) a failing handler gets a precomputed 500 without
+    the exception text, and both the tracebacks printed to stderr and
+    the requests Router logs are sampled at ``log_sample_rate``.
+    """
+
+    def __init__(self, production: Optional[bool] = None, log_sample_rate: float = 0.01):
+        """Initialize an empty application.
+
+        Args:
+            production: Production mode; None reads BLANK_ENV
+            log_sample_rate: Fraction of requests Router logs, and of handler
+                failures whose traceback is printed, in production
+        """
+        self.routes: Dict[str, RouteDict] = {
+            method: RouteRegistry(self) for method in METHODS
+        }
+        self.middleware: List[Middleware] = []
+        self._mounts: Dict[str, "App"] = {}
+        self._parent: Optional["App"] = None
+        self._prefix = ""
+        self._table: Optional[RouteTable] = None
+        self._batches = 0
+        self._stale = False
+        self._chains: Tuple[List[Middleware], Dict[int, Tuple[RouteHandler, Any, Chain]]] = (
+            [], {}
+        )
+        self.admission: Optional[AdmissionController] = None
+        self.rate_limiter: Optional[RateLimiter] = None
+        self.tasks = TaskQueue()
+        self.tracer: Optional[Tracer] = None
+        self.memory: Optional[MemoryProfiler] = None
+        self.server_timing = False
+        self.production = production_from_env() if production is None else production
+        self.log_sample_rate = log_sample_rate
+        self.processes = ProcessPool()
+
+    def route(
+        self,
+        method: str,
+        path: str,
+        *,
+        executor: str = "inline",
+        timeout: Optional[float] = None,
+    ):
+        """Decorator to register a route handler for an HTTP method.
+
+        HEAD and OPTIONS are answered automatically unless registered
+        explicitly. Routes may be registered while the app is serving:
+        a new route index is compiled and swapped in at once, or when the
+        enclosing registering() block ends.
+
+        Args:
+            method: HTTP method
+            path: Path pattern, e.g. '/users/{id}'
+            executor: 'inline' to call the handler on the serving thread,
+                or 'process' to call it in ``app.processes`` (for
+                CPU-bound, module-level handlers)
+            timeout: Seconds to wait for a 'process' handler before
+                answering 504, or None for the pool default
+
+        Raises:
+            ValueError: If the executor is unknown, or a 'process' handler
+                declares a ``request`` parameter
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor {executor!r}, expected one of {EXECUTORS}")
+        routes = self.routes[method]
+
+        def wrapper(func: RouteHandler):
+            entry = func
+            if executor == "process":
+                if _wants_request(func):
+                    raise ValueError(
+                        f"Handler {func.__qualname__} takes a request and cannot run in a process"
+                    )
+                entry = ProcessRoute(func, timeout)
+            pattern = URLParser.path_to_regex(path)
+            routes[path] = (entry, pattern)
+            return func
+        return wrapper
+
+    def get(self, path: str, **options):
+        """Decorator to register a GET route handler on this app."""
+        return self.route("GET", path, **options)
+
+    def post(self, path: str, **options):
+        """Decorator to register a POST route handler on this app."""
+        return self.route("POST", path, **options)
+
+    def put(self, path: str, **options):
+        """Decorator to register a PUT route handler on this app."""
+        return self.route("PUT", path, **options)
+
+    def patch(self, path: str, **options):
+        """Decorator to register a PATCH route handler on this app."""
+        return self.route("PATCH", path, **options)
+
+    def delete(self, path: str, **options):
+        """Decorator to register a DELETE route handler on this app."""
+        return self.route("DELETE", path, **options)
+
+    def sse(self, path: str):
+        """Decorator to register a Server-Sent Events route on this app.
+
+        The handler is called like a GET handler and returns the
+        Broadcaster to subscribe the client to. SelectorServer then keeps
+        the connection open on its event loop (no thread per client).
+
+        Example:
+            updates = Broadcaster()
+
+            @app.sse('/updates')
+            def stream():
+                return updates
+        """
+        routes = self.routes["GET"]
+
+        def wrapper(func: RouteHandler):
+            pattern = URLParser.path_to_regex(path)
+            routes[path] = (EventRoute(func), pattern)
+            return func
+        return wrapper
+
+    def batch(
+        self,
+        path: str = "/batch",
+        *,
+        max_items: int = 50,
+        timeout: float = 5.0,
+        workers: int = 0,
+    ) -> BatchHandler:
+        """Register a POST route running a JSON list of sub-requests.
+
+        Each entry of the body, e.g. ``{"method": "GET", "path":
+        "/users/42"}``, is dispatched to this app in-process and the
+        response lists their status, headers and body in order.
+
+        Args:
+            path: Path of the batch route
+            max_items: Maximum entries per batch (more are answered 413)
+            timeout: Seconds for the whole batch; entries not finished
+                in time are answered 504. Without workers it is checked
+                between entries, so a slow entry can exceed it
+            workers: Threads running entries in parallel (0: sequential)
+
+        Returns:
+            The BatchHandler (see its stats() and shutdown())
+
+        Example:
+            app.batch('/batch', max_items=20, workers=4)
+            # POST /batch [{"path": "/users/1"}, {"path": "/users/2"}]
+        """
+        handler = BatchHandler(self, path, max_items, timeout, workers)
+        self.routes["POST"][path] = (handler, URLParser.path_to_regex(path))
+        return handler
+
+    def use(self, *middleware: Middleware) -> None:
+        """Register middleware that runs around every route of this app.
+
+        A middleware is a callable taking the request and the next callable
+        in the chain (passed as the ``call_next`` keyword), and returning a
+        Response:
+
+            def timing(request, call_next):
+                start = time.perf_counter()
+                response = call_next(request)
+                response.headers['X-Elapsed'] = f'{time.perf_counter() - start:.6f}'
+                return response
+
+            app.use(timing)
+
+        Middleware run in registration order, outermost first. Middleware
+        of a parent app also run around the routes of its mounted sub-apps.
+        """
+        with _registry_lock:
+            self.middleware.extend(middleware)
+            self._invalidate()
+
+    def mount(self, prefix: str, app: "App") -> None:
+        """Mount a sub-application under a single-segment path prefix.
+
+        Requests whose first path segment equals the prefix are dispatched
+        to the sub-app with the prefix stripped. Deeper prefixes are built
+        by mounting apps inside mounted apps.
+
+        Raises:
+            ValueError: If the prefix is not a single segment like '/api',
+                or the app is already mounted elsewhere
+        """
+        prefix = URLParser._normalize_path(prefix)
+        if not prefix.startswith("/") or prefix == "/" or "/" in prefix[1:]:
+            raise ValueError(f"Mount prefix must be a single path segment, got {prefix!r}")
+        with _registry_lock:
+            if app._parent is not None:
+                raise ValueError("App is already mounted")
+
+            app._parent = self
+            app._prefix = prefix
+            self._mounts[prefix] = app
+            app._invalidate()
+
+    @contextmanager
+    def registering(self) -> Iterator["App"]:
+        """Batch route and middleware changes into a single index rebuild.
+
+        On a serving app every registration otherwise compiles a new
+        route index. Inside the block, changes to this app and its
+        mounted sub-apps only mark the index stale; it is rebuilt once
+        when the outermost block ends, and requests are served from the
+        previous index until then. Blocks may be nested.
+
+        Example:
+            with app.registering():
+                importlib.import_module('myservice.admin')
+        """
+        with _registry_lock:
+            self._batches += 1
+        try:
+            yield self
+        finally:
+            with _registry_lock:
+                self._batches -= 1
+                self._flush()
+
+    def reset(self) -> None:
+        """Remove all routes, middleware, mounts, admission control, rate limits and profiling.
+
+        Production mode goes back to what BLANK_ENV selects, and the route
+        index is compiled again on the next request, as for a new app.
+        """
+        with _registry_lock:
+            for routes in self.routes.values():
+                dict.clear(routes)
+                routes.order.clear()
+            self.middleware.clear()
+            for app in self._mounts.values():
+                app._parent = None
+                app._prefix = ""
+                app._invalidate()
+            self._mounts.clear()
+            self._table = None
+            self._stale = False
+            self._chains = ([], {})
+        self.admission = None
+        self.rate_limiter = None
+        self.tracer = None
+        self.memory = None
+        self.server_timing = False
+        self.production = production_from_env()
+
+    def dispatch(
+        self,
+        method: str,
+        target: str,
+        headers: Optional[Mapping[str, str]] = None,
+        client: Optional[str] = None,
+        body: bytes = b""
+    ) -> Response:
+        """Route a request and run its compiled handler chain.
+
+        This is the dispatch core shared by Router and the test Client.
+
+        Args:
+            method: HTTP method
+            target: Request target (path with optional query string)
+            headers: Optional request headers
+            client: Client address, used e.g. for rate limiting
+            body: Raw request body, available to handlers as request.body
+
+        Returns:
+            Response from the handler chain, a 404 if no route matched,
+            a 405 (or an automatic OPTIONS reply) if the path matched but
+            not the method, or a 500 if the handler raised. HEAD responses
+            carry the GET status and headers with an empty body. Tasks
+            the handler scheduled are attached as ``response.background``
+            for the server to submit to ``app.tasks`` once the response
+            is written. Requests sampled by ``app.tracer`` carry their
+            Trace as ``response.trace``; the server records the write
+            phase and finishes it. With admission control enabled, excess requests get a precomputed
+            503 before any parsing or routing; with a rate limiter, clients
+            over their limit get a precomputed 429 before routing. With
+            ``app.server_timing`` set, responses carry a Server-Timing
+            header with the parse, lookup, binding and handler durations
+            and any metrics added with server_timing().
+        """
+        admission = self.admission
+        if admission is None:
+            return self._dispatch(method, target, headers, client, body)
+
+        started = admission.enter(target)
+        if started is None:
+            return admission.rejection
+        try:
+            return self._dispatch(method, target, headers, client, body)
+        finally:
+            admission.leave(started)
+
+    def _dispatch(
+        self,
+        method: str,
+        target: str,
+        headers: Optional[Mapping[str, str]],
+        client: Optional[str],
+        body: bytes = b""
+    ) -> Response:
+        """Route and run a request that has passed admission."""
+        limiter = self.rate_limiter
+        if limiter is not None and not limiter.allow(client):
+            return limiter.rejection
+
+        timing = ServerTiming.start() if self.server_timing else None
+        try:
+            tracer = self.tracer
+            trace = tracer.start(method, target, headers) if tracer is not None else None
+            if trace is not None:
+                trace.begin("parse")
+
+            url = URLParser(target)
+            app, path = self._resolve(url.path)
+            table = app._table
+            if table is None:
+                table = app._compile()
+
+            if timing is not None:
+                timing.mark(PARSED)
+            if trace is not None:
+                # Parse the query string now, so the time counts toward the parse span.
+                _ = url.query_params
+                trace.begin("match")
+            chain, path_params, methods = table.match(path, method)
+            if timing is not None:
+                timing.mark(MATCHED)
+
+            if chain is None:
+                response = self._unmatched(method, methods)
+                if timing is not None:
+                    response = timing.finish(response, 2)
+                if trace is not None:
+                    response.trace = trace
+                return response
+
+            request = Request(
+                method, path, {**url.query_params, **path_params}, headers, client, body
+            )
+            memory = self.memory
+            if memory is not None:
+                route = f"{method} {self._prefix_of(app)}{methods.path}"
+                chain = partial(memory.call, route, chain)
+
+            if timing is not None:
+                timing.mark(BOUND)
+            if trace is None:
+                try:
+                    response = chain(request)
+                except Exception as e:
+                    request.tasks = None
+                    response = self._internal_error(e)
+            else:
+                response = self._traced_call(trace, chain, request)
+
+            if method == "HEAD":
+                response = Response("", status=response.status, headers=dict(response.headers))
+            if timing is not None:
+                timing.mark(HANDLED)
+                response = timing.finish(response, 4)
+            if request.tasks is not None or trace is not None:
+                if isinstance(response, StaticResponse):
+                    response = Response(response.body, response.status, dict(response.headers))
+                response.background = request.tasks
+                response.trace = trace
+            return response
+        except BaseException:
+            # e.g. a target URLParser rejects: do not leave the timer current
+            if timing is not None:
+                timing.release()
+            raise
+
+    @staticmethod
+    def _unmatched(method: str, methods: Optional[MethodMap]) -> Response:
+        """404, automatic OPTIONS reply or 405 for a request without a chain."""
+        if methods is None:
+            return Response("404 Not Found", status=404)
+        if method == "OPTIONS":
+            return Response("", status=204, headers={"Allow": methods.allow})
+        return Response(
+            "405 Method Not Allowed",
+            status=405,
+            headers={"Content-Type": "text/plain", "Allow": methods.allow}
+        )
+
+    def _traced_call(self, trace: Trace, chain: Chain, request: Request) -> Response:
+        """Run the chain inside the 'handler' span, so handlers can open child spans."""
+        with trace.begin("handler") as phase:
+            try:
+                return chain(request)
+            except Exception as e:
+                phase.set("error", repr(e))
+                request.tasks = None
+                return self._internal_error(e)
+
+    def _internal_error(self, error: Exception) -> Response:
+        """500 for a failed handler: the error text in debug mode, a static body in production."""
+        if not self.production:
+            return Response(f"Internal Server Error: {error}", status=500)
+        if random.random() < self.log_sample_rate:
+            traceback.print_exception(type(error), error, error.__traceback__)
+        return INTERNAL_ERROR
+
+    def _resolve(self, path: str) -> Tuple["App", str]:
+        """Walk mounted sub-apps, stripping one prefix per level."""
+        app = self
+        while app._mounts:
+            end = path.find("/", 1)
+            head = path if end < 0 else path[:end]
+            sub = app._mounts.get(head)
+            if sub is None:
+                break
+            app, path = sub, (path[end:] if end >= 0 else "/")
+        return app, path
+
+    def _prefix_of(self, app: "App") -> str:
+        """Mount prefixes between this app and a sub-app resolved from it."""
+        prefix = ""
+        while app is not self:
+            prefix = app._prefix + prefix
+            app = app._parent
+        return prefix
+
+    def _middleware_stack(self) -> List[Middleware]:
+        """Middleware of this app, preceded by those of its parents."""
+        if self._parent is None:
+            return list(self.middleware)
+        return self._parent._middleware_stack() + self.middleware
+
+    def _compile(self) -> RouteTable:
+        """Compile and publish the route index unless another thread already has."""
+        with _registry_lock:
+            table = self._table
+            if table is None:
+                table = self._table = self._build_table()
+            return table
+
+    def _build_table(self) -> RouteTable:
+        """Build a new route index, composing each route's chain once.
+
+        Chains of the previous build are reused for unchanged handlers
+        while the middleware stack stays the same, so registering a route
+        on a serving app only composes the new one. A handler counts as
+        changed when route decorators were applied to it since.
+        """
+        stack = self._middleware_stack()
+        cached_stack, cached = self._chains
+        reuse = cached_stack == stack
+        chains_by_handler: Dict[int, Tuple[RouteHandler, Any, Chain]] = {}
+        static: Dict[str, Dict[str, Chain]] = {}
+        # pattern -> [pattern, path, chains, first position]
+        dynamic: Dict[str, List[Any]] = {}
+        # method -> [(position, pattern)] in the method's registration order
+        sequences: Dict[str, List[Tuple[int, str]]] = {}
+
+        for method, routes in self.routes.items():
+            order = routes.order
+            for path, (handler, pattern) in list(routes.items()):
+                marks = (
+                    getattr(handler, "__blank_middleware__", None),
+                    getattr(handler, "__blank_single_flight__", None),
+                    getattr(handler, "__blank_rate_limit__", None),
+                )
+                hit = cached.get(id(handler)) if reuse else None
+                if hit is not None and hit[0] is handler and hit[1] == marks:
+                    chain = hit[2]
+                else:
+                    chain = self._compile_route(handler, stack, self.processes)
+                    if isinstance(handler, (ProcessRoute, EventRoute)):
+                        _compiled_in(handler.handler, self)
+                    elif not isinstance(handler, LazyHandler):
+                        _compiled_in(handler, self)
+                chains_by_handler[id(handler)] = (handler, marks, chain)
+                if not pattern.groups:
+                    static.setdefault(URLParser._normalize_path(path), {}).setdefault(method, chain)
+                    continue
+                position = order.get(path, sys.maxsize)
+                entry = dynamic.get(pattern.pattern)
+                if entry is None:
+                    entry = dynamic[pattern.pattern] = [pattern, path, {}, position]
+                elif position < entry[3]:
+                    entry[1], entry[3] = path, position
+                if method not in entry[2]:
+                    entry[2][method] = chain
+                    sequences.setdefault(method, []).append((position, pattern.pattern))
+
+        self._chains = (stack, chains_by_handler)
+        maps = {key: MethodMap(chains, path) for key, (_, path, chains, _) in dynamic.items()}
+        if "GET" in sequences:
+            explicit = {key for _, key in sequences.get("HEAD", ())}
+            head = sequences.get("HEAD", []) + [
+                item for item in sequences["GET"] if item[1] not in explicit
+            ]
+            sequences["HEAD"] = sorted(head, key=lambda item: item[0])
+        return RouteTable(
+            {path: MethodMap(chains, path) for path, chains in static.items()},
+            tuple(
+                (dynamic[key][0], maps[key])
+                for key in sorted(dynamic, key=lambda key: dynamic[key][3])
+            ),
+            {
+                method: tuple(
+                    (dynamic[key][0], maps[key].chains[method], maps[key]) for _, key in items
+                )
+                for method, items in sequences.items()
+            },
+        )
+
+    @staticmethod
+    def _compile_route(
+        handler: RouteHandler,
+        stack: List[Middleware],
+        processes: ProcessPool,
+    ) -> Chain:
+        """Compose one route's chain: rate limit, middleware, single-flight, handler."""
+        if isinstance(handler, LazyHandler):
+            compile = partial(App._compile_route, stack=stack, processes=processes)
+            return lazy_chain(handler, compile)
+
+        route_middleware = getattr(handler, "__blank_middleware__", ())
+        if isinstance(handler, ProcessRoute):
+            target = process_endpoint(processes, handler.handler, handler.timeout)
+        elif isinstance(handler, EventRoute):
+            target = stream_endpoint(handler.handler)
+        else:
+            target = endpoint(handler)
+
+        flight = getattr(handler, "__blank_single_flight__", None)
+        if flight is not None:
+            target = coalesce_endpoint(flight, target)
+        chain = compose(target, (*stack, *route_middleware))
+
+        limiter = getattr(handler, "__blank_rate_limit__", None)
+        if limiter is not None:
+            chain = partial(_rate_limited, limiter, chain)
+        return chain
+
+    def _invalidate(self) -> None:
+        """Replace the compiled route index of this app and its mounted sub-apps.
+
+        Once an app has a published index, a complete new one is built and
+        swapped in with a single assignment, so dispatching threads take
+        no lock and see either the old table or the new one. Before the
+        first request nothing is built; _compile() does that on demand.
+        Inside a registering() block the rebuild waits for the block to end.
+        """
+        with _registry_lock:
+            if self._table is not None:
+                if self._batched():
+                    self._stale = True
+                else:
+                    self._table = self._build_table()
+            for app in self._mounts.values():
+                app._invalidate()
+
+    def _batched(self) -> bool:
+        """Whether a registering() block is open on this app or a parent."""
+        app: Optional[App] = self
+        while app is not None:
+            if app._batches:
+                return True
+            app = app._parent
+        return False
+
+    def _flush(self) -> None:
+        """Rebuild the stale indexes of this app and its sub-apps outside any batch."""
+        if self._stale and not self._batched():
+            self._stale = False
+            if self._table is not None:
+                self._table = self._build_table()
+        for app in self._mounts.values():
+            app._flush()
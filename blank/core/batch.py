@@ -0,0 +1,200 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+from blank.common.parsing import URLParser
+from blank.core.http import Headers, Request, Response
+from blank.core.sse import EventStream
+
+__all__ = ["BatchHandler"]
+
+_SKIPPED_HEADERS = frozenset(("content-length", "content-type", "transfer-encoding"))
+
+
+def _item(status: int, body: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    return {"status": status, "headers": headers or {}, "body": body}
+
+
+def _error(status: int, message: str) -> Response:
+    return Response(
+        json.dumps({"error": message}), status=status, headers={"Content-Type": "application/json"}
+    )
+
+
+class BatchHandler:
+    """Route handler running many sub-requests in one round-trip.
+
+    The request body is a JSON list of entries such as
+    ``{"method": "GET", "path": "/users/42?full=true"}`` (``method``
+    defaults to GET; a ``headers`` object and a string ``body`` are
+    optional, and a malformed entry is answered 400 on its own).
+    Each entry is dispatched in-process through the app's normal
+    routing, with the batch request's headers plus its own, and the
+    response is a JSON list of ``{"status", "headers", "body"}`` in the
+    same order. Sub-requests skip admission control (the batch itself
+    was admitted) but count against the app's rate limiter.
+
+    At most ``max_items`` entries are accepted (413 otherwise). Entries
+    not finished within ``timeout`` seconds of the batch starting get
+    status 504. With ``workers`` > 0 entries run in parallel on a shared
+    thread pool, and the batch is answered once ``timeout`` has passed
+    even if entries are still running. Otherwise entries run one after
+    the other on the serving thread, which cannot abandon a running
+    entry: the deadline is checked before each entry, so one slow entry
+    can hold the whole batch past ``timeout`` (the entries after it get
+    504). Use ``workers`` where the bound must be strict.
+
+    Example:
+        app.batch('/batch', max_items=20, timeout=2.0, workers=4)
+    """
+
+    def __init__(
+        self,
+        app,
+        path: str = "/batch",
+        max_items: int = 50,
+        timeout: float = 5.0,
+        workers: int = 0,
+    ):
+        """Initialize the handler.
+
+        Args:
+            app: App whose routes the sub-requests are dispatched to
+            path: Path the batch route is registered under (not batchable)
+            max_items: Maximum number of entries per batch
+            timeout: Seconds allowed for the whole batch
+            workers: Threads for running entries in parallel (0: sequential)
+        """
+        self.app = app
+        self.path = URLParser._normalize_path(path)
+        self.max_items = max_items
+        self.timeout = timeout
+        self.workers = workers
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._batches = 0
+        self._items = 0
+        self._timeouts = 0
+
+    def __call__(self, request: Request) -> Response:
+        try:
+            entries = request.json()
+        except ValueError:
+            return _error(400, "Body must be a JSON list of requests")
+        if not isinstance(entries, list):
+            return _error(400, "Body must be a JSON list of requests")
+        if len(entries) > self.max_items:
+            return _error(413, f"At most {self.max_items} requests per batch")
+
+        deadline = time.monotonic() + self.timeout
+        headers = Headers()
+        for name, value in request.headers.items():
+            if name.lower() not in _SKIPPED_HEADERS:
+                headers[name] = value
+
+        if self.workers and len(entries) > 1:
+            results = self._run_parallel(entries, headers, request, deadline)
+        else:
+            results = []
+            for entry in entries:
+                if time.monotonic() >= deadline:
+                    results.append(self._timed_out())
+                else:
+                    results.append(self._run(entry, headers, request))
+
+        with self._lock:
+            self._batches += 1
+            self._items += len(entries)
+        return Response(json.dumps(results), headers={"Content-Type": "application/json"})
+
+    def shutdown(self) -> None:
+        """Stop the worker threads, if any were started."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of batch counters.
+
+        Returns:
+            Dict with batches, items and timeouts (items answered 504)
+        """
+        with self._lock:
+            return {"batches": self._batches, "items": self._items, "timeouts": self._timeouts}
+
+    def _run_parallel(
+        self,
+        entries: List[Any],
+        headers: Headers,
+        request: Request,
+        deadline: float,
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, "blank-batch")
+            executor = self._executor
+
+        futures = [executor.submit(self._run, entry, headers, request) for entry in entries]
+        wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+
+        results = []
+        for future in futures:
+            if future.done():
+                results.append(future.result())
+            else:
+                future.cancel()
+                results.append(self._timed_out())
+        return results
+
+    def _run(self, entry: Any, headers: Headers, request: Request) -> Dict[str, Any]:
+        """Dispatch one entry and describe its response."""
+        if not isinstance(entry, dict) or not isinstance(entry.get("path"), str):
+            return _item(400, "Each request needs a path")
+        method = str(entry.get("method", "GET")).upper()
+        target = entry["path"]
+        if not target.startswith("/"):
+            return _item(400, "Path must start with /")
+        try:
+            nested = URLParser(target).path == self.path
+        except ValueError:
+            return _item(400, "Invalid path")
+        if nested:
+            return _item(400, "Batches cannot be nested")
+        extra = entry.get("headers")
+        if extra is not None and not isinstance(extra, dict):
+            return _item(400, "Headers must be an object")
+        body = entry.get("body")
+        if body is None:
+            body = ""
+        elif not isinstance(body, str):
+            return _item(400, "Body must be a string")
+
+        sub_headers = headers
+        if extra:
+            sub_headers = Headers(headers)
+            for name, value in extra.items():
+                sub_headers[name] = str(value)
+
+        response = self.app._dispatch(method, target, sub_headers, request.client, body.encode())
+        if response.trace is not None:
+            response.trace.finish(response.status)
+        if response.background is not None:
+            for task in response.background:
+                request.add_task(task[0], *task[1], **task[2])
+        if isinstance(response, EventStream):
+            return _item(400, "Event streams cannot be batched")
+
+        return _item(
+            response.status,
+            response.encode().decode("utf-8", "replace"),
+            dict(response.headers),
+        )
+
+    def _timed_out(self) -> Dict[str, Any]:
+        with self._lock:
+            self._timeouts += 1
+        return _item(504, "Gateway Timeout")
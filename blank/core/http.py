@@ -0,0 +1,141 @@
+import json
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+__all__ = ["Headers", "Request", "Response", "StaticResponse"]
+
+
+class Headers(dict):
+    """Header mapping with case-insensitive lookups.
+
+    Names are stored lower-cased; lookups lower-case the key first.
+    """
+
+    __slots__ = ()
+
+    def __setitem__(self, name: str, value: str):
+        super().__setitem__(name.lower(), value)
+
+    def __getitem__(self, name: str) -> str:
+        return super().__getitem__(name.lower())
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and super().__contains__(name.lower())
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return super().get(name.lower(), default)
+
+
+class Request:
+    """A single incoming request as seen by middleware.
+
+    Attributes:
+        method: HTTP method (GET, POST, etc.)
+        path: Normalized URL path
+        params: Merged query and path parameters passed to the handler
+        headers: Request headers mapping (supports .get())
+        client: Client address (IP), if known
+        body: Raw request body (empty if none was sent)
+        state: Scratch space for middleware (request IDs, timers, ...)
+        tasks: Background tasks scheduled with add_task(), or None
+
+    Handlers that declare a ``request`` parameter receive the Request.
+    """
+
+    __slots__ = ("method", "path", "params", "headers", "client", "body", "state", "tasks")
+
+    def __init__(
+        self,
+        method: str,
+        path: str,
+        params: Dict[str, Any],
+        headers: Optional[Mapping[str, str]] = None,
+        client: Optional[str] = None,
+        body: bytes = b"",
+    ):
+        self.method = method
+        self.path = path
+        self.params = params
+        self.headers = headers if headers is not None else {}
+        self.client = client
+        self.body = body
+        self.state: Dict[str, Any] = {}
+        self.tasks: Optional[List[Tuple[Callable[..., Any], tuple, Dict[str, Any]]]] = None
+
+    def json(self) -> Any:
+        """Parse the request body as JSON.
+
+        Raises:
+            ValueError: If the body is not valid JSON
+        """
+        return json.loads(self.body)
+
+    def add_task(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """Schedule fn(*args, **kwargs) to run after the response is sent.
+
+        Example:
+            @POST('/signup')
+            def signup(email, request):
+                request.add_task(send_welcome_email, email)
+                return 'Welcome!'
+        """
+        if self.tasks is None:
+            self.tasks = []
+        self.tasks.append((fn, args, kwargs))
+
+
+class Response:
+    """Response produced by a route (or short-circuited by middleware).
+
+    Handlers normally return a plain string; it is wrapped in a Response
+    with status 200. Handlers and middleware may also return a Response
+    directly to control the status code and headers.
+
+    Example:
+        return Response('Created', status=201, headers={'Location': '/users/1'})
+    """
+
+    __slots__ = ("body", "status", "headers", "background", "trace")
+
+    def __init__(
+        self,
+        body: Union[str, bytes] = "",
+        status: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.body = body
+        self.status = status
+        self.headers = headers if headers is not None else {"Content-Type": "text/plain"}
+        self.background: Optional[List[Tuple[Callable[..., Any], tuple, Dict[str, Any]]]] = None
+        self.trace: Optional[Any] = None
+
+    @property
+    def text(self) -> str:
+        """Response body as string."""
+        if isinstance(self.body, bytes):
+            return self.body.decode()
+        return self.body
+
+    def encode(self) -> bytes:
+        """Response body as bytes, ready to be written to the socket."""
+        if isinstance(self.body, bytes):
+            return self.body
+        return self.body.encode()
+
+
+class StaticResponse(Response):
+    """A fully precomputed response, shared between requests.
+
+    Besides the usual fields it carries the complete HTTP message as
+    bytes, so servers can write it without formatting anything.
+    """
+
+    __slots__ = ("raw",)
+
+    def __init__(self, body: str, status: int, reason: str, headers: Dict[str, str]):
+        super().__init__(body, status, headers)
+        payload = body.encode()
+        head = "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        self.raw = (
+            f"HTTP/1.1 {status} {reason}\r\n{head}"
+            f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n"
+        ).encode() + payload
@@ -0,0 +1,119 @@
+import os
+import socket
+import stat
+from typing import List, Optional, Tuple, Union
+
+__all__ = ["bind_unix", "create_listener", "close_listener", "from_fd", "listen_fds"]
+
+Address = Union[str, Tuple[str, int]]
+
+# First file descriptor passed by systemd socket activation (SD_LISTEN_FDS_START)
+LISTEN_FDS_START = 3
+
+
+def bind_unix(path: str, mode: Optional[int] = 0o660, backlog: int = 1024) -> socket.socket:
+    """Create a listening Unix domain stream socket at path.
+
+    A stale socket file left behind by a previous process is replaced;
+    any other existing file is an error.
+
+    Args:
+        path: Filesystem path of the socket
+        mode: Permission bits for the socket file (who may connect), or
+            None to leave them to the umask
+        backlog: Listen backlog
+
+    Raises:
+        FileExistsError: If path exists and is not a socket
+    """
+    try:
+        if stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+        else:
+            raise FileExistsError(f"{path} exists and is not a socket")
+    except FileNotFoundError:
+        pass
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.bind(path)
+        if mode is not None:
+            os.chmod(path, mode)
+        sock.listen(backlog)
+    except BaseException:
+        sock.close()
+        raise
+    return sock
+
+
+def create_listener(
+    address: Address,
+    backlog: int = 1024,
+    mode: Optional[int] = 0o660,
+) -> socket.socket:
+    """Create a listening socket: a Unix socket for a path, TCP for (host, port).
+
+    Args:
+        address: Socket path, or (host, port)
+        backlog: Listen backlog
+        mode: Permission bits of a Unix socket file (see bind_unix)
+    """
+    if isinstance(address, (str, bytes, os.PathLike)):
+        return bind_unix(os.fsdecode(address), mode, backlog)
+    return socket.create_server(address, backlog=backlog)
+
+
+def close_listener(sock: socket.socket) -> None:
+    """Close a listening socket created by create_listener(), removing its socket file."""
+    path = sock.getsockname() if sock.family == socket.AF_UNIX and sock.fileno() != -1 else None
+    sock.close()
+    if path and isinstance(path, str) and not path.startswith("\0"):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def from_fd(fd: int) -> socket.socket:
+    """Adopt an inherited, already listening stream socket.
+
+    The address family is read from the descriptor, so TCP and Unix
+    sockets both work.
+
+    Raises:
+        ValueError: If fd is not a listening stream socket
+    """
+    sock = socket.socket(fileno=fd)
+    if sock.type != socket.SOCK_STREAM or not sock.getsockopt(
+        socket.SOL_SOCKET, socket.SO_ACCEPTCONN
+    ):
+        sock.detach()
+        raise ValueError(f"File descriptor {fd} is not a listening stream socket")
+    sock.set_inheritable(False)
+    return sock
+
+
+def listen_fds(unset_environment: bool = True) -> List[socket.socket]:
+    """Sockets passed by systemd socket activation (or a compatible supervisor).
+
+    Reads ``LISTEN_FDS`` (and ``LISTEN_PID``, which must name this
+    process when set); the sockets are file descriptors 3, 4, ... By
+    default the variables are removed so child processes do not adopt
+    the same sockets.
+
+    Returns:
+        The inherited listening sockets, in order (empty if none)
+
+    Example:
+        sockets = listen_fds()
+        server = SelectorServer(sock=sockets[0]) if sockets else SelectorServer(('', 7740))
+    """
+    pid = os.environ.get("LISTEN_PID")
+    count = os.environ.get("LISTEN_FDS")
+    if unset_environment:
+        for name in ("LISTEN_PID", "LISTEN_FDS", "LISTEN_FDNAMES"):
+            os.environ.pop(name, None)
+
+    if not count or (pid and pid != str(os.getpid())):
+        return []
+    return [from_fd(fd) for fd in range(LISTEN_FDS_START, LISTEN_FDS_START + int(count))]
@@ -0,0 +1,272 @@
+import json
+import random
+import signal
+import sys
+import threading
+import tracemalloc
+from collections import Counter, deque
+from itertools import pairwise
+from typing import Any, Callable, Deque, Dict, List, Optional, TextIO
+
+from blank.core.http import Request, Response
+
+__all__ = ["MemoryProfiler"]
+
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _line(trace: tracemalloc.Statistic) -> str:
+    frame = trace.traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+class _RouteMemory:
+    """Allocation counters of one route."""
+
+    __slots__ = ("calls", "sampled", "allocated", "blocks", "lines")
+
+    def __init__(self):
+        self.calls = 0
+        self.sampled = 0
+        self.allocated = 0
+        self.blocks = 0
+        self.lines: Counter = Counter()
+
+
+class MemoryProfiler:
+    """Per-route allocation profiling and growth detection with tracemalloc.
+
+    Every request is counted against its route (method and path pattern
+    under any mount prefix, e.g. ``GET /api/users/{id}``). A sampled fraction of requests is run
+    between two tracemalloc snapshots; the difference, grouped by
+    source line, is added to the route's allocated bytes and blocks.
+    Snapshots are costly, so keep ``sample_rate`` low in production.
+    Sampled handlers run concurrently, so allocations made by other
+    threads in the meantime are attributed to each of them too.
+
+    Every ``checkpoint_every`` sampled requests the size still held by
+    each allocating line is recorded. A route is reported as growing
+    when memory held by one of its lines has not shrunk over the last
+    ``window`` checkpoints and grew by ``min_growth`` bytes or more in
+    total: the signature of a cache or list that is never cleared.
+
+    Example:
+        app.memory = MemoryProfiler(sample_rate=0.05)
+        app.get('/_debug/memory')(app.memory.endpoint)
+        app.memory.install_signal_handler()   # kill -USR1 <pid> prints a report
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.01,
+        frames: int = 1,
+        checkpoint_every: int = 20,
+        window: int = 5,
+        min_growth: int = 65536,
+    ):
+        """Initialize the profiler and start tracemalloc if it is not running.
+
+        Args:
+            sample_rate: Fraction of requests measured with snapshots
+            frames: Traceback depth stored by tracemalloc (when started here)
+            checkpoint_every: Sampled requests between growth checkpoints
+            window: Checkpoints without shrinking needed to report growth
+            min_growth: Bytes a line must have grown over the window
+        """
+        self.sample_rate = sample_rate
+        self.checkpoint_every = checkpoint_every
+        self.window = window
+        self.min_growth = min_growth
+
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start(frames)
+        self._lock = threading.RLock()
+        self._random = random.random
+        self._routes: Dict[str, _RouteMemory] = {}
+        self._checkpoints: Deque[Dict[str, int]] = deque(maxlen=window + 1)
+        self._since_checkpoint = 0
+
+    def call(self, route: str, chain: Callable[[Request], Response], request: Request) -> Response:
+        """Run chain(request), counted against route and possibly measured."""
+        stats = self._routes.get(route)
+        if stats is None:
+            stats = self._routes.setdefault(route, _RouteMemory())
+        stats.calls += 1
+        if self._random() >= self.sample_rate:
+            return chain(request)
+
+        before = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        try:
+            return chain(request)
+        finally:
+            after = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+            diff = after.compare_to(before, "lineno")
+            with self._lock:
+                self._record(stats, diff)
+                self._since_checkpoint += 1
+                if self._since_checkpoint >= self.checkpoint_every:
+                    self._checkpoint(after)
+
+    def growing(self) -> Dict[str, int]:
+        """Routes whose allocating lines have grown steadily.
+
+        Returns:
+            Dict mapping each growing route to the bytes its growing
+            lines gained over the window
+        """
+        with self._lock:
+            lines = self._growing_lines()
+            result = {}
+            for route, stats in self._routes.items():
+                growth = sum(lines[line] for line in stats.lines if line in lines)
+                if growth:
+                    result[route] = growth
+            return result
+
+    def report(self, limit: int = 10) -> Dict[str, Any]:
+        """Summary of the top allocating routes and source lines.
+
+        Args:
+            limit: Number of routes, and of lines per route, to include
+
+        Returns:
+            Dict with ``routes`` (by allocated bytes, each with calls,
+            sampled, allocated_bytes, allocated_blocks, bytes_per_call,
+            top_lines and growth_bytes), ``lines`` (top lines overall),
+            ``growing`` and ``traced`` (current and peak traced bytes)
+        """
+        growing = self.growing()
+        with self._lock:
+            totals: Counter = Counter()
+            routes = []
+            for route, stats in self._routes.items():
+                totals.update(stats.lines)
+                routes.append({
+                    "route": route,
+                    "calls": stats.calls,
+                    "sampled": stats.sampled,
+                    "allocated_bytes": stats.allocated,
+                    "allocated_blocks": stats.blocks,
+                    "bytes_per_call": stats.allocated // stats.sampled if stats.sampled else 0,
+                    "top_lines": [
+                        {"line": line, "bytes": size}
+                        for line, size in stats.lines.most_common(limit)
+                    ],
+                    "growth_bytes": growing.get(route, 0),
+                })
+        routes.sort(key=lambda item: item["allocated_bytes"], reverse=True)
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "routes": routes[:limit],
+            "lines": [{"line": line, "bytes": size} for line, size in totals.most_common(limit)],
+            "growing": growing,
+            "traced": {"current": current, "peak": peak},
+        }
+
+    def format_report(self, limit: int = 10) -> str:
+        """report() as plain text."""
+        report = self.report(limit)
+        out = [
+            f"traced memory: {report['traced']['current']} bytes "
+            f"(peak {report['traced']['peak']})",
+            "top routes (sampled allocations):",
+        ]
+        for item in report["routes"]:
+            out.append(
+                f"  {item['route']:40} {item['allocated_bytes']:>12} B "
+                f"{item['allocated_blocks']:>8} blocks  {item['calls']} calls "
+                f"({item['sampled']} sampled)"
+            )
+            out.extend(
+                f"      {line['bytes']:>10} B  {line['line']}" for line in item["top_lines"][:3]
+            )
+        out.append("top lines:")
+        out.extend(f"  {line['bytes']:>12} B  {line['line']}" for line in report["lines"])
+        if report["growing"]:
+            out.append("growing routes:")
+            out.extend(f"  {route}: +{size} B" for route, size in report["growing"].items())
+        return "\n".join(out) + "\n"
+
+    def endpoint(self, limit: int = 10) -> Response:
+        """Route handler answering with report() as JSON.
+
+        Example:
+            app.get('/_debug/memory')(app.memory.endpoint)
+        """
+        return Response(
+            json.dumps(self.report(limit)), headers={"Content-Type": "application/json"}
+        )
+
+    def install_signal_handler(
+        self,
+        signum: int = getattr(signal, "SIGUSR1", 10),
+        stream: Optional[TextIO] = None,
+    ) -> None:
+        """Write format_report() to stream (stderr by default) on the given signal.
+
+        Must be called from the main thread.
+        """
+        def handler(signum, frame):
+            threading.Thread(
+                target=lambda: (stream or sys.stderr).write(self.format_report()),
+                name="blank-memory-report",
+                daemon=True,
+            ).start()
+
+        signal.signal(signum, handler)
+
+    def reset(self) -> None:
+        """Forget all counters and checkpoints."""
+        with self._lock:
+            self._routes.clear()
+            self._checkpoints.clear()
+            self._since_checkpoint = 0
+
+    def stop(self) -> None:
+        """Stop tracemalloc if this profiler started it."""
+        if self._started and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started = False
+
+    def checkpoint(self) -> None:
+        """Record the memory held per line now (normally done every checkpoint_every samples)."""
+        snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        with self._lock:
+            self._checkpoint(snapshot)
+
+    def _record(self, stats: _RouteMemory, diff: List[tracemalloc.StatisticDiff]) -> None:
+        stats.sampled += 1
+        for item in diff:
+            if item.size_diff > 0:
+                stats.allocated += item.size_diff
+                stats.blocks += max(item.count_diff, 0)
+                stats.lines[_line(item)] += item.size_diff
+
+    def _checkpoint(self, snapshot: tracemalloc.Snapshot) -> None:
+        self._since_checkpoint = 0
+        tracked = set()
+        for stats in self._routes.values():
+            tracked.update(stats.lines)
+        self._checkpoints.append({
+            line: item.size
+            for item in snapshot.statistics("lineno")
+            if (line := _line(item)) in tracked
+        })
+
+    def _growing_lines(self) -> Dict[str, int]:
+        checkpoints = list(self._checkpoints)
+        if len(checkpoints) <= self.window:
+            return {}
+        growing = {}
+        for line, last in checkpoints[-1].items():
+            sizes = [checkpoint.get(line, 0) for checkpoint in checkpoints]
+            if all(a <= b for a, b in pairwise(sizes)) and last - sizes[0] >= self.min_growth:
+                growing[line] = last - sizes[0]
+        return growing
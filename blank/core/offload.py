@@ -0,0 +1,216 @@
+import multiprocessing
+import threading
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from blank.common.types import RouteHandler
+from blank.core.http import Request, Response
+
+__all__ = ["ProcessPool", "ProcessRoute", "EXECUTORS", "process_endpoint"]
+
+EXECUTORS = ("inline", "process")
+
+Result = Union[str, Tuple[Union[str, bytes], int, Dict[str, str]]]
+
+
+def _run(handler: RouteHandler, params: Dict[str, Any]) -> Result:
+    """Call a handler in a worker process and flatten its result.
+
+    A Response is sent back as a plain (body, status, headers) tuple,
+    which pickles smaller and faster than the object itself.
+    """
+    result = handler(**params)
+    if isinstance(result, Response):
+        return result.body, result.status, dict(result.headers)
+    return str(result)
+
+
+def _fresh(template: Response) -> Response:
+    """Copy of a template response, for the chain's middleware to modify."""
+    return Response(template.body, template.status, dict(template.headers))
+
+
+class ProcessPool:
+    """Lazily created process pool for CPU-bound route handlers.
+
+    Routes registered with ``executor='process'`` have their handler
+    called in a worker process, so heavy computation does not hold the
+    GIL of the serving process. Middleware still run inline. The handler
+    and its parameters are pickled; the handler is pickled by reference
+    (module and name), so it must be defined at module level.
+
+    At most ``max_pending`` calls may be running or queued at once;
+    further requests get a copy of ``rejection``, a ``503 Service
+    Unavailable``. A call not finished within its route's timeout gets a
+    copy of ``timed_out``, a ``504 Gateway Timeout``; the worker keeps
+    running it until it returns, so timeouts should be generous enough
+    for this to be rare.
+
+    Example:
+        app.processes = ProcessPool(workers=4, max_pending=16)
+
+        @app.get('/report/{id}', executor='process', timeout=5)
+        def report(id):
+            return render_report(id)
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        timeout: Optional[float] = None,
+        context: Optional[str] = "spawn",
+        retry_after: int = 1,
+    ):
+        """Initialize the pool (no processes are started yet).
+
+        Args:
+            workers: Number of worker processes (defaults to the CPU count)
+            max_pending: Maximum calls running or queued (defaults to
+                twice the number of workers)
+            timeout: Default seconds to wait for a result, or None for no limit
+            context: multiprocessing start method; 'spawn' avoids forking
+                a process that is running server threads
+            retry_after: Value of the Retry-After header on 503 responses
+        """
+        self.workers = workers or multiprocessing.cpu_count()
+        self.max_pending = max_pending if max_pending is not None else 2 * self.workers
+        self.timeout = timeout
+        self.context = context
+        self.rejection = Response(
+            "503 Service Unavailable",
+            503,
+            {"Content-Type": "text/plain", "Retry-After": str(retry_after)},
+        )
+        self.timed_out = Response("504 Gateway Timeout", 504, {"Content-Type": "text/plain"})
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._timeouts = 0
+
+    def call(
+        self,
+        handler: RouteHandler,
+        params: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> Response:
+        """Run handler(**params) in a worker process and wait for the result.
+
+        Args:
+            handler: Module-level route handler
+            params: Keyword arguments for the handler
+            timeout: Seconds to wait, or None to use the pool default
+
+        Returns:
+            The handler's Response, a 503 if the pool is saturated, or a
+            504 if the call timed out. Exceptions raised by the handler
+            are re-raised here.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                return _fresh(self.rejection)
+            self._pending += 1
+            executor = self._executor or self._start()
+
+        try:
+            future = executor.submit(_run, handler, params)
+            result = future.result(self.timeout if timeout is None else timeout)
+        except TimeoutError:
+            future.cancel()
+            with self._lock:
+                self._timeouts += 1
+            return _fresh(self.timed_out)
+        except BrokenProcessPool:
+            with self._lock:
+                self._failed += 1
+                if self._executor is executor:
+                    self._executor = None
+            raise
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+        with self._lock:
+            self._completed += 1
+        if isinstance(result, str):
+            return Response(result)
+        return Response(*result)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker processes; the pool restarts on the next call."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of pool counters.
+
+        Returns:
+            Dict with pending, completed, failed, rejected and timeouts
+        """
+        with self._lock:
+            return {
+                "pending": self._pending,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "timeouts": self._timeouts,
+            }
+
+    def _start(self) -> ProcessPoolExecutor:
+        """Create the executor; called with the lock held."""
+        context = multiprocessing.get_context(self.context) if self.context else None
+        self._executor = ProcessPoolExecutor(self.workers, mp_context=context)
+        return self._executor
+
+
+class ProcessRoute:
+    """Registry entry for a handler registered with ``executor='process'``.
+
+    Calling it calls the handler inline (e.g. through find_route); the
+    App compiles it into a chain that calls the handler in its pool.
+    Other attributes are read from the handler, so decorators such as
+    UseMiddleware work on the handler as usual.
+    """
+
+    __slots__ = ("handler", "timeout")
+
+    def __init__(self, handler: RouteHandler, timeout: Optional[float] = None):
+        self.handler = handler
+        self.timeout = timeout
+
+    def __call__(self, **params: Any) -> Any:
+        return self.handler(**params)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.handler, name)
+
+
+def _call_in_process(
+    pool: ProcessPool,
+    handler: RouteHandler,
+    timeout: Optional[float],
+    request: Request,
+) -> Response:
+    return pool.call(handler, request.params, timeout)
+
+
+def process_endpoint(
+    pool: ProcessPool,
+    handler: RouteHandler,
+    timeout: Optional[float] = None,
+) -> Callable[[Request], Response]:
+    """Adapt a route handler into a request -> Response callable run in the pool."""
+    return partial(_call_in_process, pool, handler, timeout)
@@ -0,0 +1,185 @@
+import math
+import threading
+import time
+from array import array
+from typing import Callable, Dict, Hashable, List, Optional
+
+from blank.core.http import Request, Response, StaticResponse
+from blank.core.middleware import _decorated
+from blank.common.types import RouteHandler
+
+__all__ = ["RateLimiter", "RateLimit"]
+
+
+def client_key(request: Request) -> Optional[str]:
+    """Default bucket key: the client address."""
+    return request.client
+
+
+class RateLimiter:
+    """Token-bucket rate limiter with bounded, array-backed per-client state.
+
+    Each key (by default the client address) gets a bucket holding up to
+    ``burst`` tokens, refilled at ``rate`` tokens per second; a request
+    takes one token or is rejected with a precomputed ``429 Too Many
+    Requests``.
+
+    Bucket state lives in flat arrays (tokens and last-seen time as C
+    doubles, a reference bit per slot), with a dict mapping keys to slots.
+    At most ``capacity`` keys are tracked; when full, a CLOCK sweep evicts
+    a slot not referenced since the hand last passed, approximating LRU.
+    A bucket idle for ``burst / rate`` seconds is full again, so evicting
+    it loses nothing.
+
+    A limiter set as ``app.rate_limiter`` runs before routing and keys by
+    client address; per-route limiters (see RateLimit) use ``key``.
+
+    Example:
+        app.rate_limiter = RateLimiter(rate=10, burst=20)
+
+        @GET('/login')
+        @RateLimit(rate=1, burst=5)
+        def login():
+            ...
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[int] = None,
+        capacity: int = 100000,
+        key: Callable[[Request], Hashable] = client_key,
+    ):
+        """Initialize the limiter.
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket size (defaults to rate rounded up, at least 1)
+            capacity: Maximum number of tracked keys
+            key: Callable mapping a request to its bucket key
+        """
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1, math.ceil(rate)))
+        self.capacity = capacity
+        self.key = key
+        retry_after = max(1, math.ceil(1 / self.rate))
+        self.rejection = StaticResponse(
+            "429 Too Many Requests",
+            429,
+            "Too Many Requests",
+            {"Content-Type": "text/plain", "Retry-After": str(retry_after)},
+        )
+
+        self._lock = threading.Lock()
+        self._index: Dict[Hashable, int] = {}
+        self._keys: List[Optional[Hashable]] = [None] * capacity
+        self._tokens = array("d", bytes(8 * capacity))
+        self._stamps = array("d", bytes(8 * capacity))
+        self._referenced = bytearray(capacity)
+        self._used = 0
+        self._hand = 0
+        self._allowed = 0
+        self._rejected = 0
+        self._evicted = 0
+
+    def allow(self, key: Hashable, now: Optional[float] = None) -> bool:
+        """Take a token from the key's bucket.
+
+        Returns:
+            True if the request may proceed, False if it is over the limit
+        """
+        if now is None:
+            now = time.monotonic()
+
+        with self._lock:
+            slot = self._index.get(key)
+            if slot is None:
+                slot = self._allocate(key)
+                tokens = self.burst
+            else:
+                tokens = self._tokens[slot] + (now - self._stamps[slot]) * self.rate
+                if tokens > self.burst:
+                    tokens = self.burst
+
+            self._stamps[slot] = now
+            self._referenced[slot] = 1
+
+            if tokens >= 1.0:
+                self._tokens[slot] = tokens - 1.0
+                self._allowed += 1
+                return True
+
+            self._tokens[slot] = tokens
+            self._rejected += 1
+            return False
+
+    def check(self, request: Request) -> Optional[Response]:
+        """Return the 429 response if the request is over the limit, else None."""
+        if self.allow(self.key(request)):
+            return None
+        return self.rejection
+
+    def _allocate(self, key: Hashable) -> int:
+        """Find a slot for a new key, evicting one if all are in use."""
+        if self._used < self.capacity:
+            slot = self._used
+            self._used += 1
+        else:
+            referenced = self._referenced
+            hand = self._hand
+            while referenced[hand]:
+                referenced[hand] = 0
+                hand = (hand + 1) % self.capacity
+            slot = hand
+            self._hand = (hand + 1) % self.capacity
+            del self._index[self._keys[slot]]
+            self._evicted += 1
+
+        self._keys[slot] = key
+        self._index[key] = slot
+        return slot
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of limiter counters.
+
+        Returns:
+            Dict with allowed, rejected, evicted and tracked (keys in use)
+        """
+        with self._lock:
+            return {
+                "allowed": self._allowed,
+                "rejected": self._rejected,
+                "evicted": self._evicted,
+                "tracked": len(self._index),
+            }
+
+
+def RateLimit(
+    rate: Optional[float] = None,
+    burst: Optional[int] = None,
+    *,
+    limiter: Optional[RateLimiter] = None,
+    **options,
+):
+    """Decorator to rate limit a single route handler.
+
+    Either pass the bucket parameters, or an existing RateLimiter to share
+    its buckets between routes. Requests over the limit get a 429 before
+    middleware or the handler run.
+
+    Example:
+        @POST('/login')
+        @RateLimit(rate=1, burst=5)
+        def login():
+            return 'Welcome'
+    """
+    if limiter is None:
+        if rate is None:
+            raise ValueError("RateLimit needs a rate or a limiter")
+        limiter = RateLimiter(rate, burst, **options)
+
+    def wrapper(func: RouteHandler):
+        func.__blank_rate_limit__ = limiter
+        _decorated(func)
+        return func
+    return wrapper
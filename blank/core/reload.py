@@ -0,0 +1,189 @@
+import importlib
+import signal
+import socket
+import sys
+import threading
+from typing import Callable, Optional
+
+from blank.core import routing
+from blank.core.app import App
+from blank.core.listeners import Address, close_listener, create_listener
+from blank.core.selector_server import SelectorServer
+
+__all__ = ["Reloader", "load_app"]
+
+
+def load_app(*modules: str) -> App:
+    """Build a fresh App from modules that use the module-level decorators.
+
+    Each module is imported (or re-imported if already loaded) while the
+    module-level GET/POST/... decorators register into a new App on this
+    thread, so the result reflects the code currently on disk. Routes
+    registered meanwhile by other threads still go to the default app.
+
+    Example:
+        app = load_app('examples.app')
+    """
+    app = App()
+    with routing.registering_into(app):
+        for name in modules:
+            module = sys.modules.get(name)
+            if module is None:
+                importlib.import_module(name)
+            else:
+                importlib.reload(module)
+    return app
+
+
+class _Generation:
+    """One SelectorServer serving one App on the shared listening socket."""
+
+    def __init__(self, number: int, server: SelectorServer):
+        self.number = number
+        self.server = server
+        self.thread = threading.Thread(
+            target=server.serve_forever,
+            args=(0.1,),
+            name=f"blank-generation-{number}",
+            daemon=True,
+        )
+        self.thread.start()
+
+    def retire(self, timeout: float) -> None:
+        self.server.drain(timeout)
+        self.thread.join()
+        self.server.server_close()
+        self.server.app.tasks.shutdown(timeout)
+        self.server.app.processes.shutdown(wait=False)
+
+
+class Reloader:
+    """Serves an app and swaps in a freshly built one without downtime.
+
+    The listening socket is created once and shared by every generation.
+    On reload (SIGHUP or reload()), a new App is built by ``factory`` and
+    starts accepting on the same socket; only then does the previous
+    generation stop accepting and drain its in-flight requests, for at
+    most ``drain_timeout`` seconds, and then for its background tasks
+    to finish. Pending connections simply wait in the
+    kernel backlog, so none are refused. If the factory raises, the
+    current generation keeps serving.
+
+    Example:
+        server = Reloader(('localhost', 7740), partial(load_app, 'examples.app'))
+        server.serve_forever()   # kill -HUP <pid> to reload
+    """
+
+    def __init__(
+        self,
+        server_address: Optional[Address] = None,
+        factory: Callable[[], App] = App,
+        *,
+        sock: Optional[socket.socket] = None,
+        drain_timeout: float = 30.0,
+        backlog: int = 1024,
+        socket_mode: Optional[int] = 0o660,
+        **server_options,
+    ):
+        """Bind the shared listening socket.
+
+        Args:
+            server_address: (host, port) to bind, or the path of a Unix
+                domain socket, unless sock is given
+            factory: Callable returning a fully registered App
+            sock: An already bound and listening socket to serve on
+            drain_timeout: Seconds an old generation may spend draining
+            backlog: Listen backlog when binding server_address
+            socket_mode: Permission bits of a Unix socket file
+            **server_options: Passed on to each SelectorServer
+        """
+        self._owns_socket = sock is None
+        if sock is None:
+            if server_address is None:
+                raise ValueError("Either server_address or sock is required")
+            sock = create_listener(server_address, backlog, socket_mode)
+        self.socket = sock
+        self.server_address = sock.getsockname()
+        self.factory = factory
+        self.drain_timeout = drain_timeout
+        self.server_options = server_options
+
+        self._lock = threading.Lock()
+        self._current: Optional[_Generation] = None
+        self._generations = 0
+        self._stopped = threading.Event()
+
+    @property
+    def server_port(self) -> int:
+        """Port the server is listening on (0 for a Unix socket)."""
+        return self.server_address[1] if isinstance(self.server_address, tuple) else 0
+
+    @property
+    def generation(self) -> int:
+        """Number of the generation currently serving (starting at 1)."""
+        return self._current.number if self._current else 0
+
+    @property
+    def app(self) -> Optional[App]:
+        """App of the generation currently serving."""
+        return self._current.server.app if self._current else None
+
+    def start(self) -> None:
+        """Start the first generation without blocking."""
+        with self._lock:
+            if self._current is None:
+                self._current = self._spawn(self.factory())
+
+    def serve_forever(self) -> None:
+        """Start serving and block until shutdown().
+
+        When called from the main thread, SIGHUP triggers a reload.
+        """
+        self.start()
+        if threading.current_thread() is threading.main_thread():
+            self.install_signal_handler()
+        self._stopped.wait()
+
+    def install_signal_handler(self, signum: int = getattr(signal, "SIGHUP", 1)) -> None:
+        """Reload on the given signal (SIGHUP by default).
+
+        Must be called from the main thread. The reload itself runs on a
+        background thread so the signal handler returns immediately.
+        """
+        def handler(signum, frame):
+            threading.Thread(target=self.reload, name="blank-reload", daemon=True).start()
+
+        signal.signal(signum, handler)
+
+    def reload(self) -> int:
+        """Swap in a new generation built by the factory.
+
+        Returns:
+            Number of the generation now serving
+        """
+        with self._lock:
+            if self._current is None or self._stopped.is_set():
+                raise RuntimeError("Reloader is not serving")
+
+            app = self.factory()
+            previous, self._current = self._current, self._spawn(app)
+
+        previous.retire(self.drain_timeout)
+        return self._current.number
+
+    def shutdown(self) -> None:
+        """Drain the current generation and close the listening socket."""
+        with self._lock:
+            current, self._current = self._current, None
+            self._stopped.set()
+        if current is not None:
+            current.retire(self.drain_timeout)
+        if self._owns_socket:
+            close_listener(self.socket)
+        else:
+            self.socket.close()
+
+    def _spawn(self, app: App) -> _Generation:
+        self._generations += 1
+        server = SelectorServer(app=app, sock=self.socket, **self.server_options)
+        return _Generation(self._generations, server)
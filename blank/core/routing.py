@@ -1,29 +1,64 @@
 import re
-from typing import Dict, Tuple, Callable, Optional, Any
+import threading
+from contextlib import contextmanager
+from typing import Dict, Tuple, Callable, Iterator, Optional, Any
 
 from blank.common.parsing import URLParser
-from blank.common.types import RouteDict
+from blank.common.types import Middleware, RouteDict
+from blank.core.app import App
 
-get_routes: RouteDict = {}
-post_routes: RouteDict = {}
+default_app = App()
+"""Application that the module-level decorators register into by default."""
 
+get_routes: RouteDict = default_app.routes["GET"]
+post_routes: RouteDict = default_app.routes["POST"]
+put_routes: RouteDict = default_app.routes["PUT"]
+patch_routes: RouteDict = default_app.routes["PATCH"]
+delete_routes: RouteDict = default_app.routes["DELETE"]
 
-def GET(path: str):
+_target = threading.local()
+
+
+@contextmanager
+def registering_into(app: App) -> Iterator[App]:
+    """Make the module-level decorators register into app on this thread.
+
+    Used while importing route modules on behalf of an app other than
+    the default app, e.g. when a snapshot loaded into it resolves a
+    handler.
+    """
+    previous = getattr(_target, "app", None)
+    _target.app = app
+    try:
+        yield app
+    finally:
+        _target.app = previous
+
+
+def _current_app() -> App:
+    """App the module-level decorators register into on this thread."""
+    app = getattr(_target, "app", None)
+    return default_app if app is None else app
+
+
+def GET(path: str, **options):
     """Decorator to register a GET route handler.
     
+    Options (``executor``, ``timeout``) are passed on to App.route().
+    
     Example:
         @GET('/users/{id}')
         def get_user(id):
             return f'User {id}'
+        
+        @GET('/report/{id}', executor='process', timeout=10)
+        def report(id):
+            return build_report(id)
     """
-    def wrapper(func: Callable):
-        pattern = URLParser.path_to_regex(path)
-        get_routes[path] = (func, pattern)
-        return func
-    return wrapper
+    return _current_app().get(path, **options)
 
 
-def POST(path: str):
+def POST(path: str, **options):
     """Decorator to register a POST route handler.
     
     Example:
@@ -31,11 +66,69 @@ def POST(path: str):
         def create_user():
             return 'User created'
     """
-    def wrapper(func: Callable):
-        pattern = URLParser.path_to_regex(path)
-        post_routes[path] = (func, pattern)
-        return func
-    return wrapper
+    return _current_app().post(path, **options)
+
+
+def PUT(path: str, **options):
+    """Decorator to register a PUT route handler.
+    
+    Example:
+        @PUT('/users/{id}')
+        def replace_user(id):
+            return f'User {id} replaced'
+    """
+    return _current_app().put(path, **options)
+
+
+def PATCH(path: str, **options):
+    """Decorator to register a PATCH route handler.
+    
+    Example:
+        @PATCH('/users/{id}')
+        def update_user(id):
+            return f'User {id} updated'
+    """
+    return _current_app().patch(path, **options)
+
+
+def DELETE(path: str, **options):
+    """Decorator to register a DELETE route handler.
+    
+    Example:
+        @DELETE('/users/{id}')
+        def delete_user(id):
+            return f'User {id} deleted'
+    """
+    return _current_app().delete(path, **options)
+
+
+def SSE(path: str):
+    """Decorator to register a Server-Sent Events route.
+    
+    The handler returns the Broadcaster the client subscribes to.
+    
+    Example:
+        updates = Broadcaster()
+        
+        @SSE('/updates')
+        def stream():
+            return updates
+    """
+    return _current_app().sse(path)
+
+
+def use(*middleware: Middleware) -> None:
+    """Register middleware that runs around every route of the default app.
+    
+    Example:
+        def request_id(request, call_next):
+            response = call_next(request)
+            response.headers['X-Request-Id'] = uuid.uuid4().hex
+            return response
+        
+        use(request_id)
+    """
+    _current_app().use(*middleware)
 
 
 def find_route(
@@ -51,8 +144,11 @@ def find_route(
     Returns:
         Tuple of (handler function, path parameters dict)
         Returns (None, {}) if no match found
+    
+    The routes are copied into a tuple before matching, so registering
+    routes from another thread cannot break the iteration.
     """
-    for handler, pattern in routes.values():
+    for handler, pattern in tuple(routes.values()):
         path_params = URLParser.extract_path_params(pattern, path)
         if path_params is not None:
             return handler, path_params
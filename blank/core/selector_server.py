@@ -0,0 +1,760 @@
+import heapq
+import itertools
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from blank.core.admission import AdmissionController
+from blank.core.app import App
+from blank.core.http import Headers, Response, StaticResponse
+from blank.core.listeners import Address, close_listener, create_listener
+from blank.core.sse import Broadcaster, EventStream
+
+__all__ = ["SelectorServer"]
+
+_REASONS = {status.value: status.phrase for status in HTTPStatus}
+
+_READING, _DISPATCHING, _WRITING, _STREAMING = range(4)
+
+
+def _error(status: HTTPStatus) -> StaticResponse:
+    text = f"{status.value} {status.phrase}"
+    return StaticResponse(text, status.value, status.phrase, {"Content-Type": "text/plain"})
+
+
+_BAD_REQUEST = _error(HTTPStatus.BAD_REQUEST)
+_REQUEST_TIMEOUT = _error(HTTPStatus.REQUEST_TIMEOUT)
+_TOO_LARGE = _error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+_HEADERS_TOO_LARGE = _error(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+_NOT_IMPLEMENTED = _error(HTTPStatus.NOT_IMPLEMENTED)
+_SERVER_ERROR = _error(HTTPStatus.INTERNAL_SERVER_ERROR)
+_SERVICE_UNAVAILABLE = _error(HTTPStatus.SERVICE_UNAVAILABLE)
+
+
+def _admitted(
+    app: App,
+    admission: AdmissionController,
+    started: float,
+    method: str,
+    target: str,
+    headers: Headers,
+    client: Optional[str],
+    body: bytes,
+) -> Response:
+    """Dispatch a request admitted on the loop thread, then release its slot."""
+    try:
+        return app._dispatch(method, target, headers, client, body)
+    finally:
+        admission.leave(started)
+
+
+class _Connection:
+    """Per-socket state owned by the event loop thread."""
+
+    __slots__ = (
+        "sock", "address", "inbuf", "outbuf", "state", "events", "deadline",
+        "started", "header_deadline", "keep_alive", "pending", "closed",
+        "background", "trace", "status", "stream", "queued", "buffered",
+    )
+
+    def __init__(self, sock: socket.socket, address):
+        self.sock = sock
+        self.address = address
+        self.inbuf = bytearray()
+        self.outbuf: Optional[memoryview] = None
+        self.state = _READING
+        self.events = 0
+        self.deadline = 0.0
+        self.started = 0.0
+        self.header_deadline = 0.0
+        self.keep_alive = False
+        self.pending: Optional[Tuple[str, str, Headers, int, str, int]] = None
+        self.closed = False
+        self.background = None
+        self.trace = None
+        self.status = 0
+        self.stream: Optional[Broadcaster] = None
+        self.queued: Optional[Deque[Optional[bytes]]] = None
+        self.buffered = 0
+
+
+class SelectorServer:
+    """HTTP/1.1 server driven by a single selector loop, with deadlines.
+
+    One thread multiplexes every connection, so slow or idle clients cost
+    a socket and a small state object rather than a worker. Each
+    connection is held to:
+
+    - ``header_timeout``: seconds from the first byte of a request until
+      its headers are complete
+    - ``read_timeout``: longest pause between reads (or write progress)
+      while a request is being received or a response is being sent
+    - ``idle_timeout``: seconds a keep-alive connection may sit between
+      requests
+    - ``request_timeout``: total budget from the first byte of a request
+      until its response is fully written
+
+    Deadlines live in a heap and are checked on every loop iteration.
+    Handlers run on a bounded thread pool (``workers``), or inline on the
+    loop thread with ``workers=0``. With ``app.admission`` set, requests
+    are admitted on the loop thread before they are handed to a worker,
+    so requests waiting for a worker count as in flight, and a request
+    finding no free slot gets the 503 at once (``max_queue_wait`` does
+    not apply, as the loop never waits).
+
+    SSE routes (see App.sse) stay on the loop after their response head:
+    the server subscribes to the route's Broadcaster and writes each
+    published event to every stream from the loop thread. A stream whose
+    unsent data exceeds the broadcaster's ``max_buffer``, or that makes
+    no write progress for ``read_timeout`` seconds, is dropped as a slow
+    consumer.
+
+    Besides (host, port), the server can listen on a Unix domain socket
+    path (cheaper than loopback TCP for a local proxy) or serve a socket
+    inherited from a supervisor (see listen_fds).
+
+    Example:
+        server = SelectorServer(('localhost', 7740), app, header_timeout=5)
+        server.serve_forever()
+
+        server = SelectorServer('/run/blank.sock', app, socket_mode=0o660)
+    """
+
+    def __init__(
+        self,
+        server_address: Optional[Address] = None,
+        app: Optional[App] = None,
+        *,
+        sock: Optional[socket.socket] = None,
+        workers: int = 8,
+        header_timeout: float = 10.0,
+        read_timeout: float = 10.0,
+        idle_timeout: float = 60.0,
+        request_timeout: float = 60.0,
+        max_connections: int = 10000,
+        max_header_bytes: int = 65536,
+        max_body_bytes: int = 1048576,
+        backlog: int = 1024,
+        socket_mode: Optional[int] = 0o660,
+    ):
+        """Bind (or adopt) a listening socket.
+
+        Args:
+            server_address: (host, port) to bind, or the path of a Unix
+                domain socket, unless sock is given
+            app: Application to dispatch to (defaults to the default app)
+            sock: An already bound and listening socket to serve on; it is
+                left open by server_close() so it can be handed over
+            workers: Handler threads; 0 runs handlers on the loop thread
+            header_timeout: Seconds allowed to receive request headers
+            read_timeout: Seconds allowed between reads or write progress
+            idle_timeout: Seconds a keep-alive connection may stay idle
+            request_timeout: Total seconds allowed per request
+            max_connections: Connections beyond this are closed on accept
+            max_header_bytes: Larger header blocks get a 431
+            max_body_bytes: Larger bodies get a 413
+            backlog: Listen backlog when binding server_address
+            socket_mode: Permission bits of a Unix socket file
+        """
+        if app is None:
+            from blank.core.routing import default_app
+            app = default_app
+        self.app = app
+
+        self._owns_socket = sock is None
+        if sock is None:
+            if server_address is None:
+                raise ValueError("Either server_address or sock is required")
+            sock = create_listener(server_address, backlog, socket_mode)
+        sock.setblocking(False)
+        self.socket = sock
+        self.server_address = sock.getsockname()
+
+        self.header_timeout = header_timeout
+        self.read_timeout = read_timeout
+        self.idle_timeout = idle_timeout
+        self.request_timeout = request_timeout
+        self.max_connections = max_connections
+        self.max_header_bytes = max_header_bytes
+        self.max_body_bytes = max_body_bytes
+
+        self._executor = ThreadPoolExecutor(workers, "blank-worker") if workers else None
+        self._selector = selectors.DefaultSelector()
+        self._connections: Dict[int, _Connection] = {}
+        self._timers: List[Tuple[float, int, _Connection]] = []
+        self._seq = itertools.count()
+        self._done: Deque[Tuple[_Connection, bool, Future]] = deque()
+        self._streams: Dict[Broadcaster, Set[_Connection]] = {}
+        self._broadcasts: Deque[Tuple[Broadcaster, Optional[bytes]]] = deque()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._shutdown_request = False
+        self._draining = False
+        self._drain_deadline: Optional[float] = None
+        self._stopped = threading.Event()
+        self._stopped.set()
+
+        self.stats = {
+            "accepted": 0,
+            "rejected": 0,
+            "requests": 0,
+            "bad_requests": 0,
+            "header_timeouts": 0,
+            "read_timeouts": 0,
+            "idle_timeouts": 0,
+            "request_timeouts": 0,
+            "slow_consumers": 0,
+        }
+
+    @property
+    def server_port(self) -> int:
+        """Port the server is listening on (0 for a Unix socket)."""
+        return self.server_address[1] if isinstance(self.server_address, tuple) else 0
+
+    @property
+    def connection_count(self) -> int:
+        """Number of open client connections."""
+        return len(self._connections)
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        """Run the event loop until shutdown() is called."""
+        self._stopped.clear()
+        self._shutdown_request = False
+        selector = self._selector
+        selector.register(self.socket, selectors.EVENT_READ, None)
+        selector.register(self._wake_r, selectors.EVENT_READ, self._wake_r)
+        try:
+            while not self._shutdown_request:
+                timeout = poll_interval
+                if self._timers:
+                    timeout = max(0.0, min(timeout, self._timers[0][0] - time.monotonic()))
+
+                for key, mask in selector.select(timeout):
+                    conn = key.data
+                    if conn is None:
+                        self._accept()
+                    elif conn is self._wake_r:
+                        self._drain_wakeups()
+                    elif mask & selectors.EVENT_READ:
+                        self._on_readable(conn)
+                    elif mask & selectors.EVENT_WRITE:
+                        self._on_writable(conn)
+
+                now = time.monotonic()
+                self._expire(now)
+                if self._drain_deadline is not None and self._drain(now):
+                    break
+        finally:
+            if not self._draining:
+                selector.unregister(self.socket)
+            selector.unregister(self._wake_r)
+            self._stopped.set()
+
+    def shutdown(self) -> None:
+        """Stop serve_forever() and wait for the loop to exit."""
+        self._shutdown_request = True
+        self._wake()
+        self._stopped.wait()
+
+    def drain(self, timeout: float) -> None:
+        """Stop accepting and let in-flight requests finish, then stop the loop.
+
+        Every connection still gets its current or next request served,
+        with ``Connection: close``, and is closed once that response is
+        written; closing an idle keep-alive connection outright would
+        race with a request the client may already be sending. SSE
+        streams are closed right away. Connections still open after
+        timeout seconds are dropped.
+        """
+        self._drain_deadline = time.monotonic() + timeout
+        self._wake()
+        self._stopped.wait()
+
+    def server_close(self) -> None:
+        """Close all connections, the worker pool and (if owned) the listening socket."""
+        for conn in list(self._connections.values()):
+            self._close(conn)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        if self._owns_socket:
+            close_listener(self.socket)
+        self._selector.close()
+        self._wake_r.close()
+        self._wake_w.close()
+
+    def _drain(self, now: float) -> bool:
+        """One draining step; returns True once the loop may stop."""
+        if not self._draining:
+            self._draining = True
+            self._selector.unregister(self.socket)
+
+            for conn in list(self._connections.values()):
+                if conn.state == _STREAMING:
+                    self._close(conn)
+
+        if self._connections and now < self._drain_deadline:
+            return False
+
+        for conn in list(self._connections.values()):
+            self._close(conn)
+        return True
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                sock, address = self.socket.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+
+            if len(self._connections) >= self.max_connections:
+                self.stats["rejected"] += 1
+                sock.close()
+                continue
+
+            self.stats["accepted"] += 1
+            sock.setblocking(False)
+            if sock.family != socket.AF_UNIX:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            conn = _Connection(sock, address)
+            self._connections[sock.fileno()] = conn
+            self._watch(conn, selectors.EVENT_READ)
+            self._arm(conn, time.monotonic() + self.idle_timeout)
+
+    def _watch(self, conn: _Connection, events: int) -> None:
+        """Set the selector interest of a connection (0 to stop watching)."""
+        if events == conn.events:
+            return
+        if not conn.events:
+            self._selector.register(conn.sock, events, conn)
+        elif not events:
+            self._selector.unregister(conn.sock)
+        else:
+            self._selector.modify(conn.sock, events, conn)
+        conn.events = events
+
+    def _arm(self, conn: _Connection, deadline: float) -> None:
+        conn.deadline = deadline
+        heapq.heappush(self._timers, (deadline, next(self._seq), conn))
+
+    def _expire(self, now: float) -> None:
+        timers = self._timers
+        while timers and timers[0][0] <= now:
+            deadline, _, conn = heapq.heappop(timers)
+            if conn.closed or deadline != conn.deadline:
+                continue
+
+            if conn.state == _STREAMING:
+                self._drop_slow(conn)
+            elif conn.state == _READING and not conn.inbuf and conn.pending is None:
+                self.stats["idle_timeouts"] += 1
+                self._close(conn)
+            elif conn.state == _READING:
+                if conn.pending is None and now >= conn.header_deadline:
+                    self.stats["header_timeouts"] += 1
+                elif now >= conn.started + self.request_timeout:
+                    self.stats["request_timeouts"] += 1
+                else:
+                    self.stats["read_timeouts"] += 1
+                self._reject(conn, _REQUEST_TIMEOUT)
+            else:
+                self.stats["request_timeouts"] += 1
+                self._close(conn)
+
+    def _on_readable(self, conn: _Connection) -> None:
+        try:
+            data = conn.sock.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self._close(conn)
+            return
+
+        if not data:
+            self._close(conn)
+            return
+        if conn.state == _STREAMING:
+            return
+
+        now = time.monotonic()
+        if not conn.inbuf and conn.pending is None:
+            conn.started = now
+            conn.header_deadline = now + self.header_timeout
+        conn.inbuf += data
+        self._process(conn, now)
+
+    def _process(self, conn: _Connection, now: float) -> None:
+        """Parse as much of the buffered request as possible and dispatch it."""
+        if conn.pending is None:
+            end = conn.inbuf.find(b"\r\n\r\n")
+            if end < 0:
+                if len(conn.inbuf) > self.max_header_bytes:
+                    self._reject(conn, _HEADERS_TOO_LARGE)
+                    return
+                deadline = min(
+                    now + self.read_timeout,
+                    conn.header_deadline,
+                    conn.started + self.request_timeout,
+                )
+                self._arm(conn, deadline)
+                return
+            if not self._parse_head(conn, end):
+                return
+
+        method, target, headers, need, version, length = conn.pending
+        if len(conn.inbuf) < need:
+            self._arm(conn, min(now + self.read_timeout, conn.started + self.request_timeout))
+            return
+
+        body = bytes(conn.inbuf[need - length:need]) if length else b""
+        del conn.inbuf[:need]
+        conn.pending = None
+        self._dispatch(conn, method, target, headers, version, body)
+
+    def _parse_head(self, conn: _Connection, end: int) -> bool:
+        """Parse the request line and headers ending at end into conn.pending."""
+        try:
+            lines = conn.inbuf[:end].decode("latin-1").split("\r\n")
+            method, target, version = lines[0].split(" ")
+            headers = Headers()
+            for line in lines[1:]:
+                name, sep, value = line.partition(":")
+                if not sep:
+                    raise ValueError(line)
+                headers[name.strip()] = value.strip()
+            length = int(headers.get("content-length", 0))
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            self.stats["bad_requests"] += 1
+            self._reject(conn, _BAD_REQUEST)
+            return False
+
+        if "transfer-encoding" in headers:
+            self._reject(conn, _NOT_IMPLEMENTED)
+            return False
+        if length > self.max_body_bytes:
+            self._reject(conn, _TOO_LARGE)
+            return False
+
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.1":
+            conn.keep_alive = connection != "close"
+        else:
+            conn.keep_alive = connection == "keep-alive"
+
+        conn.pending = (method, target, headers, end + 4 + length, version, length)
+        return True
+
+    def _dispatch(
+        self,
+        conn: _Connection,
+        method: str,
+        target: str,
+        headers: Headers,
+        version: str,
+        body: bytes = b""
+    ) -> None:
+        self.stats["requests"] += 1
+        client = conn.address[0] if isinstance(conn.address, tuple) else None
+        conn.state = _DISPATCHING
+        self._watch(conn, 0)
+        self._arm(conn, conn.started + self.request_timeout)
+
+        app = self.app
+        admission = app.admission
+        if admission is None:
+            call = partial(app._dispatch, method, target, headers, client, body)
+        else:
+            started = admission.enter(target, wait=False)
+            if started is None:
+                self._respond(conn, admission.rejection, method == "HEAD")
+                return
+            call = partial(
+                _admitted, app, admission, started, method, target, headers, client, body
+            )
+
+        if self._executor is None:
+            try:
+                response = call()
+            except Exception:
+                response = _SERVER_ERROR
+            self._respond(conn, response, method == "HEAD")
+            return
+
+        future = self._executor.submit(call)
+        future.add_done_callback(partial(self._completed, conn, method == "HEAD"))
+
+    def _completed(self, conn: _Connection, head: bool, future: Future) -> None:
+        """Worker-thread callback: hand the result back to the loop."""
+        self._done.append((conn, head, future))
+        self._wake()
+
+    def deliver(self, broadcaster: Broadcaster, payload: Optional[bytes]) -> None:
+        """Queue a broadcast for the loop thread (None ends the streams)."""
+        self._broadcasts.append((broadcaster, payload))
+        self._wake()
+
+    def _wake(self) -> None:
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass
+
+    def _drain_wakeups(self) -> None:
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+
+        done = self._done
+        while done:
+            conn, head, future = done.popleft()
+            if conn.closed:
+                continue
+            try:
+                response = future.result()
+            except Exception:
+                response = _SERVER_ERROR
+            self._respond(conn, response, head)
+
+        broadcasts = self._broadcasts
+        while broadcasts:
+            broadcaster, payload = broadcasts.popleft()
+            for conn in list(self._streams.get(broadcaster, ())):
+                self._push(conn, payload)
+
+    def _respond(self, conn: _Connection, response: Response, head: bool) -> None:
+        if self._draining:
+            conn.keep_alive = False
+        conn.background = response.background
+        if response.trace is not None:
+            conn.trace, conn.status = response.trace, response.status
+            conn.trace.begin("write")
+        if isinstance(response, EventStream) and not self._draining:
+            self._open_stream(conn, response)
+            return
+        if isinstance(response, StaticResponse):
+            conn.keep_alive = False
+            data = response.raw
+        else:
+            data = self._serialize(response, conn.keep_alive, head)
+        self._write(conn, memoryview(data))
+
+    def _open_stream(self, conn: _Connection, response: EventStream) -> None:
+        """Write the stream head and subscribe the connection to its broadcaster."""
+        broadcaster = response.broadcaster
+        if conn.trace is not None:
+            conn.trace.finish(conn.status)
+            conn.trace = None
+        if conn.background is not None:
+            self.app.tasks.submit(conn.background, block=False)
+            conn.background = None
+        if not broadcaster.subscribe(self):
+            conn.keep_alive = False
+            self._write(conn, memoryview(_SERVICE_UNAVAILABLE.raw))
+            return
+
+        lines = [f"HTTP/1.1 {response.status} {_REASONS.get(response.status, '')}"]
+        for name, value in response.headers.items():
+            lines.append(f"{name}: {value}")
+        lines.append("\r\n")
+        head = "\r\n".join(lines).encode("latin-1") + broadcaster.preamble
+
+        conn.state = _STREAMING
+        conn.keep_alive = False
+        conn.stream = broadcaster
+        conn.queued = deque()
+        conn.deadline = 0.0
+        self._streams.setdefault(broadcaster, set()).add(conn)
+        self._watch(conn, selectors.EVENT_READ)
+        self._push(conn, head)
+
+    def _push(self, conn: _Connection, payload: Optional[bytes]) -> None:
+        """Write (or queue) one chunk on a stream; None closes it once flushed."""
+        if conn.closed:
+            return
+        if conn.outbuf is not None:
+            if payload is not None:
+                conn.buffered += len(payload)
+                if conn.buffered > conn.stream.max_buffer:
+                    self._drop_slow(conn)
+                    return
+            conn.queued.append(payload)
+            return
+        if payload is None:
+            self._close(conn)
+            return
+
+        try:
+            sent = conn.sock.send(payload)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except OSError:
+            self._close(conn)
+            return
+
+        if sent < len(payload):
+            conn.outbuf = memoryview(payload)[sent:]
+            conn.buffered = len(conn.outbuf)
+            self._watch(conn, selectors.EVENT_READ | selectors.EVENT_WRITE)
+            self._arm(conn, time.monotonic() + self.read_timeout)
+
+    def _flush_stream(self, conn: _Connection) -> None:
+        """Loop-thread write readiness on a stream: send queued chunks."""
+        while conn.outbuf is not None:
+            data = conn.outbuf
+            try:
+                sent = conn.sock.send(data)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                self._close(conn)
+                return
+
+            conn.buffered -= sent
+            if sent < len(data):
+                conn.outbuf = data[sent:]
+                self._arm(conn, time.monotonic() + self.read_timeout)
+                return
+
+            conn.outbuf = None
+            while conn.queued:
+                payload = conn.queued.popleft()
+                if payload is None:
+                    self._close(conn)
+                    return
+                conn.outbuf = memoryview(payload)
+                break
+
+        conn.buffered = 0
+        conn.deadline = 0.0
+        self._watch(conn, selectors.EVENT_READ)
+
+    def _drop_slow(self, conn: _Connection) -> None:
+        """Disconnect a stream that cannot keep up with its broadcaster."""
+        self.stats["slow_consumers"] += 1
+        self._unsubscribe(conn, slow=True)
+        self._close(conn)
+
+    def _unsubscribe(self, conn: _Connection, slow: bool = False) -> None:
+        broadcaster, conn.stream = conn.stream, None
+        streams = self._streams.get(broadcaster)
+        if streams is not None:
+            streams.discard(conn)
+            if not streams:
+                del self._streams[broadcaster]
+        broadcaster.unsubscribe(self, slow)
+
+    @staticmethod
+    def _serialize(response: Response, keep_alive: bool, head: bool) -> bytes:
+        body = response.encode()
+        lines = [f"HTTP/1.1 {response.status} {_REASONS.get(response.status, '')}"]
+        for name, value in response.headers.items():
+            lines.append(f"{name}: {value}")
+        if not head:
+            lines.append(f"Content-Length: {len(body)}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        lines.append("\r\n")
+        return "\r\n".join(lines).encode("latin-1") + body
+
+    def _write(self, conn: _Connection, data: memoryview) -> None:
+        conn.state = _WRITING
+        try:
+            sent = conn.sock.send(data)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except OSError:
+            self._close(conn)
+            return
+
+        if sent < len(data):
+            conn.outbuf = data[sent:]
+            self._watch(conn, selectors.EVENT_WRITE)
+            now = time.monotonic()
+            self._arm(conn, min(now + self.read_timeout, conn.started + self.request_timeout))
+            return
+
+        self._finish(conn)
+
+    def _on_writable(self, conn: _Connection) -> None:
+        if conn.state == _STREAMING:
+            self._flush_stream(conn)
+            return
+        data = conn.outbuf
+        try:
+            sent = conn.sock.send(data)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self._close(conn)
+            return
+
+        if sent < len(data):
+            conn.outbuf = data[sent:]
+            now = time.monotonic()
+            self._arm(conn, min(now + self.read_timeout, conn.started + self.request_timeout))
+            return
+
+        conn.outbuf = None
+        self._finish(conn)
+
+    def _finish(self, conn: _Connection) -> None:
+        """Response fully written: close or go back to reading."""
+        if conn.trace is not None:
+            conn.trace.finish(conn.status)
+            conn.trace = None
+        if conn.background is not None:
+            self.app.tasks.submit(conn.background, block=False)
+            conn.background = None
+
+        if not conn.keep_alive:
+            self._close(conn)
+            return
+
+        conn.state = _READING
+        self._watch(conn, selectors.EVENT_READ)
+        now = time.monotonic()
+        if conn.inbuf:
+            conn.started = now
+            conn.header_deadline = now + self.header_timeout
+            self._process(conn, now)
+        else:
+            self._arm(conn, now + self.idle_timeout)
+
+    def _reject(self, conn: _Connection, response: StaticResponse) -> None:
+        """Best-effort error reply followed by closing the connection."""
+        try:
+            conn.sock.send(response.raw)
+        except OSError:
+            pass
+        self._close(conn)
+
+    def _close(self, conn: _Connection) -> None:
+        if conn.closed:
+            return
+        conn.closed = True
+        if conn.trace is not None:
+            conn.trace.root.set("error", "connection closed")
+            conn.trace.finish(conn.status)
+            conn.trace = None
+        if conn.stream is not None:
+            self._unsubscribe(conn)
+        if conn.background is not None:
+            self.app.tasks.submit(conn.background, block=False)
+            conn.background = None
+        self._watch(conn, 0)
+        self._connections.pop(conn.sock.fileno(), None)
+        try:
+            conn.sock.close()
+        except OSError:
+            pass
@@ -1,47 +1,179 @@
-from http.server import BaseHTTPRequestHandler, HTTPServer
+import random
+import socket
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+from typing import Optional
 
-from blank.common.parsing import URLParser
-from blank.core.routing import get_routes, post_routes, find_route
+from blank.core.http import Response, StaticResponse
+from blank.core.listeners import bind_unix, close_listener
+from blank.core.routing import default_app
+from blank.core.sse import EventStream, Subscription
 
 
-__all__ = ["Router", "HTTPServer"]
+__all__ = ["Router", "HTTPServer", "ThreadingHTTPServer", "UnixHTTPServer", "SocketHTTPServer"]
 
 
 class Router(BaseHTTPRequestHandler):
-    """HTTP request handler with routing support."""
+    """HTTP request handler with routing support.
+    
+    Dispatches to the server's ``app`` attribute if set, otherwise to the
+    default app that the module-level decorators register into:
+    
+        server = HTTPServer((host, port), Router)
+        server.app = my_app
+    """
+    
+    @property
+    def app(self):
+        """Application serving this request."""
+        return getattr(self.server, "app", default_app)
     
     def do_GET(self):
         """Handle GET requests."""
-        url = URLParser(self.path)
-        handler, path_params = find_route(get_routes, url.path)
-        
-        if handler:
-            all_params = {**url.query_params, **path_params}
-            response = handler(**all_params)
-            self.send_response(200)
-        else:
-            response = "404 Not Found"
-            self.send_response(404)
+        self._handle("GET")
 
-        self.end_headers()
-        self.wfile.write(response.encode())
+    def do_HEAD(self):
+        """Handle HEAD requests (answered from GET routes)."""
+        self._handle("HEAD", body=False)
 
     def do_POST(self):
         """Handle POST requests."""
-        url = URLParser(self.path)
-        handler, path_params = find_route(post_routes, url.path)
-        
-        if handler:
-            all_params = {**url.query_params, **path_params}
-            response = handler(**all_params)
-            self.send_response(200)
-        else:
-            response = "404 Not Found"
-            self.send_response(404)
+        self._handle("POST")
+
+    def do_PUT(self):
+        """Handle PUT requests."""
+        self._handle("PUT")
 
+    def do_PATCH(self):
+        """Handle PATCH requests."""
+        self._handle("PATCH")
+
+    def do_DELETE(self):
+        """Handle DELETE requests."""
+        self._handle("DELETE")
+
+    def do_OPTIONS(self):
+        """Handle OPTIONS requests."""
+        self._handle("OPTIONS")
+    
+    def _handle(self, method: str, body: bool = True):
+        """Dispatch the current request to the app and write the response."""
+        app = self.app
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = self.rfile.read(length) if length else b""
+        client = self.client_address[0] if isinstance(self.client_address, tuple) else None
+        response = app.dispatch(method, self.path, self.headers, client, payload)
+        if isinstance(response, EventStream):
+            self._stream(app, response)
+            return
+        trace = response.trace
+        if trace is not None:
+            trace.begin("write")
+        self._send(response, body)
+        if trace is not None:
+            trace.finish(response.status)
+        if response.background is not None:
+            app.tasks.submit(response.background)
+    
+    def _stream(self, app, response: EventStream):
+        """Relay an SSE stream until the client or the broadcaster goes away.
+        
+        This holds the handler thread for the life of the stream; use
+        SelectorServer to serve many subscribers.
+        """
+        self.close_connection = True
+        if response.trace is not None:
+            response.trace.finish(response.status)
+        if response.background is not None:
+            app.tasks.submit(response.background)
+        with Subscription(response.broadcaster) as events:
+            self.send_response(response.status)
+            for name, value in response.headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            try:
+                self.wfile.flush()
+                for chunk in events:
+                    self.wfile.write(chunk)
+                    self.wfile.flush()
+            except OSError:
+                pass
+    
+    def _send(self, response: Response, body: bool = True):
+        """Write a Response to the client."""
+        if isinstance(response, StaticResponse):
+            self.wfile.write(response.raw)
+            self.close_connection = True
+            return
+        self.send_response(response.status)
+        for name, value in response.headers.items():
+            self.send_header(name, value)
         self.end_headers()
-        self.wfile.write(response.encode())
+        if body:
+            self.wfile.write(response.encode())
     
+    def log_request(self, code="-", size="-"):
+        """Log the request line; only a sampled fraction of requests in production mode."""
+        app = self.app
+        if app.production and random.random() >= app.log_sample_rate:
+            return
+        super().log_request(code, size)
+
     def log_message(self, format, *args):
         """Override to customize logging."""
         print(f"[{self.log_date_time_string()}] {format % args}")
+
+
+class UnixHTTPServer(ThreadingHTTPServer):
+    """Threading HTTP server listening on a Unix domain socket.
+
+    Saves the TCP/IP stack on every request from a local proxy. The
+    socket file is created with the given permission bits (so only the
+    proxy's user or group may connect) and removed by server_close().
+    Requests arrive without a client address (``request.client`` is None).
+
+    Example:
+        server = UnixHTTPServer('/run/blank.sock', Router, mode=0o660)
+        server.serve_forever()
+    """
+
+    address_family = socket.AF_UNIX
+
+    def __init__(
+        self,
+        path: str,
+        RequestHandlerClass,
+        mode: Optional[int] = 0o660,
+        bind_and_activate: bool = True,
+    ):
+        self.mode = mode
+        super().__init__(path, RequestHandlerClass, bind_and_activate)
+
+    def server_bind(self):
+        """Bind the socket file, replacing a stale one."""
+        self.socket.close()
+        self.socket = bind_unix(self.server_address, self.mode, self.request_queue_size)
+        self.server_address = self.server_name = self.socket.getsockname()
+        self.server_port = 0
+
+    def server_close(self):
+        close_listener(self.socket)
+
+
+class SocketHTTPServer(ThreadingHTTPServer):
+    """Threading HTTP server on an already listening socket of any family.
+
+    For sockets inherited from a supervisor, e.g. systemd socket
+    activation:
+
+        server = SocketHTTPServer(listen_fds()[0], Router)
+        server.serve_forever()
+    """
+
+    def __init__(self, sock: socket.socket, RequestHandlerClass):
+        self.address_family = sock.family
+        super().__init__(sock.getsockname(), RequestHandlerClass, bind_and_activate=False)
+        self.socket.close()
+        self.socket = sock
+        address = sock.getsockname()
+        self.server_name = address[0] if isinstance(address, tuple) else address
+        self.server_port = address[1] if isinstance(address, tuple) else 0
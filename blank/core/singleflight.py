@@ -0,0 +1,181 @@
+import threading
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from blank.common.types import RouteHandler
+from blank.core.http import Request, Response
+from blank.core.middleware import _decorated
+
+__all__ = ["SingleFlight", "Coalesce", "coalesce_endpoint"]
+
+
+def params_key(request: Request) -> Hashable:
+    """Default coalescing key: the coerced parameters of the request.
+
+    Values are paired with their type, so ``?x=1`` and ``?x=true`` (which
+    compare equal as 1 and True) stay distinct; lists become tuples.
+    """
+    return tuple(
+        sorted(
+            (name, type(value).__name__, tuple(value) if isinstance(value, list) else value)
+            for name, value in request.params.items()
+        )
+    )
+
+
+def _copy(response: Response) -> Response:
+    """Copy a response so each request's middleware can modify its own.
+
+    Shared StaticResponses are copied too, into plain Responses, since
+    middleware may set headers on whatever the chain returns.
+    """
+    return Response(response.body, response.status, dict(response.headers))
+
+
+class _Call:
+    """One in-flight handler execution and the requests waiting on it."""
+
+    __slots__ = ("done", "response", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response: Optional[Response] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Shares one handler execution between identical concurrent requests.
+
+    The first request for a key (by default the route's coerced
+    parameters) runs the handler; requests with the same key arriving
+    while it runs wait for it and receive a copy of its response, or the
+    same exception (a 500). Waiters give up after ``timeout`` seconds
+    with a copy of ``timed_out``, a ``504 Gateway Timeout``; the running
+    execution is not affected. Nothing is cached: once the execution finishes, the
+    next request runs the handler again.
+
+    Example:
+        @GET('/products/{id}')
+        @Coalesce(timeout=5)
+        def product(id):
+            return fetch_from_upstream(id)
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        key: Callable[[Request], Hashable] = params_key,
+    ):
+        """Initialize the coalescer.
+
+        Args:
+            timeout: Seconds a coalesced request waits, or None for no limit
+            key: Callable mapping a request to its coalescing key
+        """
+        self.timeout = timeout
+        self.key = key
+        self.timed_out = Response("504 Gateway Timeout", 504, {"Content-Type": "text/plain"})
+
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._executions = 0
+        self._coalesced = 0
+        self._errors = 0
+        self._timeouts = 0
+
+    def call(self, endpoint: Callable[[Request], Response], request: Request) -> Response:
+        """Run endpoint(request), or join an identical execution already running."""
+        key = self.key(request)
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self._executions += 1
+                leader = True
+            else:
+                self._coalesced += 1
+                leader = False
+
+        if leader:
+            try:
+                response = endpoint(request)
+                call.response = _copy(response)
+                return response
+            except BaseException as e:
+                call.error = e
+                with self._lock:
+                    self._errors += 1
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if not call.done.wait(self.timeout):
+            with self._lock:
+                self._timeouts += 1
+            return _copy(self.timed_out)
+        if call.error is not None:
+            raise call.error
+
+        return _copy(call.response)
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of coalescing counters.
+
+        Returns:
+            Dict with executions (handler runs), coalesced (requests that
+            shared another's run), errors, timeouts and in_flight
+        """
+        with self._lock:
+            return {
+                "executions": self._executions,
+                "coalesced": self._coalesced,
+                "errors": self._errors,
+                "timeouts": self._timeouts,
+                "in_flight": len(self._calls),
+            }
+
+
+def _coalesced(
+    flight: SingleFlight,
+    endpoint: Callable[[Request], Response],
+    request: Request,
+) -> Response:
+    return flight.call(endpoint, request)
+
+
+def Coalesce(
+    timeout: Optional[float] = None,
+    *,
+    flight: Optional[SingleFlight] = None,
+    **options: Any,
+):
+    """Decorator to enable single-flight execution for a route handler.
+
+    Concurrent requests with the same coerced parameters share one
+    handler call. Middleware still run for every request; only the
+    handler is shared, so it should not depend on per-request state.
+
+    Example:
+        @GET('/report/{day}')
+        @Coalesce(timeout=10)
+        def report(day):
+            return build_report(day)
+    """
+    if flight is None:
+        flight = SingleFlight(timeout, **options)
+
+    def wrapper(func: RouteHandler):
+        func.__blank_single_flight__ = flight
+        _decorated(func)
+        return func
+    return wrapper
+
+
+def coalesce_endpoint(
+    flight: SingleFlight,
+    endpoint: Callable[[Request], Response],
+) -> Callable[[Request], Response]:
+    """Wrap an endpoint so identical concurrent requests share its execution."""
+    return partial(_coalesced, flight, endpoint)
@@ -0,0 +1,307 @@
+import argparse
+import hashlib
+import importlib
+import json
+import re
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from blank.common.types import RouteHandler
+from blank.core.batch import BatchHandler
+from blank.core.http import Request, Response
+from blank.core.offload import ProcessRoute
+from blank.core.sse import EventRoute
+
+__all__ = [
+    "LazyHandler",
+    "StaleSnapshotError",
+    "build_snapshot",
+    "save_snapshot",
+    "load_snapshot",
+]
+
+SNAPSHOT_VERSION = 1
+
+
+class StaleSnapshotError(Exception):
+    """Raised when a snapshot no longer matches the handler sources."""
+
+
+def _import_path(handler: RouteHandler) -> str:
+    """Import path of a handler, checked to lead back to the handler itself.
+
+    Bound methods, for instance, have a qualname that resolves to the
+    plain function, which cannot be called without its instance.
+    """
+    qualname = getattr(handler, "__qualname__", "")
+    resolved: Any = sys.modules.get(getattr(handler, "__module__", None) or "")
+    for name in qualname.split(".") if qualname and "<" not in qualname else ():
+        resolved = getattr(resolved, name, None)
+    if not qualname or resolved is not handler:
+        raise ValueError(
+            f"Handler {handler!r} is not importable by name; define it at module level"
+        )
+    return f"{handler.__module__}:{qualname}"
+
+
+def _digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class LazyHandler:
+    """Route entry that imports its handler on first use.
+
+    Calling it resolves the handler and calls it (e.g. through
+    find_route); the App compiles it into a chain that resolves and
+    compiles the real route on its first request. The module-level
+    decorators of the imported module register into ``app``, and the
+    routes are published there with a single index rebuild.
+    """
+
+    __slots__ = ("target", "kind", "timeout", "params", "app", "_entry", "_lock")
+
+    def __init__(
+        self,
+        target: str,
+        kind: str = "inline",
+        timeout: Optional[float] = None,
+        params: Optional[List[str]] = None,
+        app=None,
+    ):
+        """Initialize the entry.
+
+        Args:
+            target: Import path of the handler, 'module:qualname'
+            kind: 'inline', 'process' or 'sse'
+            timeout: Timeout of a 'process' route
+            params: Names of the path parameters
+            app: App the entry is registered in
+        """
+        self.target = target
+        self.kind = kind
+        self.timeout = timeout
+        self.params = params or []
+        self.app = app
+        self._entry: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def resolved(self) -> bool:
+        """Whether the handler has been imported yet."""
+        return self._entry is not None
+
+    def resolve(self) -> Any:
+        """Import the handler and return the route entry it stands for."""
+        entry = self._entry
+        if entry is None:
+            with self._lock:
+                if self._entry is None:
+                    module, _, qualname = self.target.partition(":")
+                    if self.app is None:
+                        handler: Any = importlib.import_module(module)
+                    else:
+                        from blank.core.routing import registering_into
+
+                        with self.app.registering(), registering_into(self.app):
+                            handler = importlib.import_module(module)
+                    for name in qualname.split("."):
+                        handler = getattr(handler, name)
+                    if self.kind == "process":
+                        handler = ProcessRoute(handler, self.timeout)
+                    elif self.kind == "sse":
+                        handler = EventRoute(handler)
+                    self._entry = handler
+                entry = self._entry
+        return entry
+
+    def __call__(self, **params: Any) -> Any:
+        return self.resolve()(**params)
+
+
+class _LazyChain:
+    """Chain for a LazyHandler, compiled into the real chain on first call."""
+
+    __slots__ = ("handler", "compile", "chain", "lock")
+
+    def __init__(self, handler: LazyHandler, compile: Callable[[Any], Callable]):
+        self.handler = handler
+        self.compile = compile
+        self.chain: Optional[Callable[[Request], Response]] = None
+        self.lock = threading.Lock()
+
+    def __call__(self, request: Request) -> Response:
+        chain = self.chain
+        if chain is None:
+            with self.lock:
+                if self.chain is None:
+                    self.chain = self.compile(self.handler.resolve())
+                chain = self.chain
+        return chain(request)
+
+
+def lazy_chain(
+    handler: LazyHandler,
+    compile: Callable[[Any], Callable[[Request], Response]],
+) -> Callable[[Request], Response]:
+    """Chain for a LazyHandler; compile() builds the real chain from the resolved entry."""
+    if handler.resolved:
+        return compile(handler.resolve())
+    return _LazyChain(handler, compile)
+
+
+def _record_source(sources: Dict[str, Dict[str, str]], name: str) -> None:
+    module = sys.modules[name]
+    filename = getattr(module, "__file__", None)
+    if filename and name not in sources:
+        sources[name] = {"file": filename, "sha256": _digest(filename)}
+
+
+def build_snapshot(app, modules: Sequence[str] = ()) -> Dict[str, Any]:
+    """Describe an app's routes so they can be restored without imports.
+
+    Records, per route, its method, path, compiled pattern, parameter
+    names, kind and the import path of its handler, plus a digest of
+    the source file of every handler module and of the given route
+    modules for the staleness check. Batch routes (see App.batch) are
+    recorded with their options and registered again on load. App
+    middleware and mounted sub-apps are not included; register those
+    at boot as usual.
+
+    Args:
+        app: App to describe
+        modules: Names of the (imported) modules the app was built from
+
+    Raises:
+        ValueError: If a handler is not importable by name (e.g. nested)
+    """
+    routes = []
+    sources: Dict[str, Dict[str, str]] = {}
+    for name in modules:
+        _record_source(sources, name)
+    for method, registry in app.routes.items():
+        for path, (entry, pattern) in registry.items():
+            if isinstance(entry, BatchHandler):
+                routes.append({
+                    "method": method,
+                    "path": path,
+                    "kind": "batch",
+                    "options": {
+                        "max_items": entry.max_items,
+                        "timeout": entry.timeout,
+                        "workers": entry.workers,
+                    },
+                })
+                continue
+            kind, timeout, handler = "inline", None, entry
+            if isinstance(entry, LazyHandler):
+                entry = entry.resolve()
+            if isinstance(entry, ProcessRoute):
+                kind, timeout, handler = "process", entry.timeout, entry.handler
+            elif isinstance(entry, EventRoute):
+                kind, handler = "sse", entry.handler
+            else:
+                handler = entry
+
+            target = _import_path(handler)
+            _record_source(sources, handler.__module__)
+
+            routes.append({
+                "method": method,
+                "path": path,
+                "pattern": pattern.pattern,
+                "params": list(pattern.groupindex),
+                "handler": target,
+                "kind": kind,
+                "timeout": timeout,
+            })
+    return {"version": SNAPSHOT_VERSION, "routes": routes, "sources": sources}
+
+
+def save_snapshot(app, path: str, modules: Sequence[str] = ()) -> None:
+    """Write build_snapshot(app, modules) to path as JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(build_snapshot(app, modules), f, separators=(",", ":"))
+
+
+def check_snapshot(snapshot: Dict[str, Any]) -> None:
+    """Reject a snapshot whose format or handler sources have changed.
+
+    Raises:
+        StaleSnapshotError: If the snapshot is outdated
+    """
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        raise StaleSnapshotError(f"Unsupported snapshot version {snapshot.get('version')!r}")
+    for module, source in snapshot["sources"].items():
+        try:
+            digest = _digest(source["file"])
+        except OSError as e:
+            raise StaleSnapshotError(f"Source of {module} is missing: {source['file']}") from e
+        if digest != source["sha256"]:
+            raise StaleSnapshotError(f"Source of {module} changed since the snapshot was built")
+
+
+def load_snapshot(path: str, app=None, check: bool = True):
+    """Register the routes of a snapshot without importing their handlers.
+
+    Handler modules are imported on the first request to one of their
+    routes. Importing a module runs its route decorators again, into
+    this app, which simply replaces the lazy entries with the real
+    handlers.
+
+    Args:
+        path: Snapshot written by save_snapshot()
+        app: App to register into (defaults to the default app)
+        check: Verify the handler sources first
+
+    Returns:
+        The app
+
+    Raises:
+        StaleSnapshotError: If check is true and the snapshot is outdated
+
+    Example:
+        try:
+            app = load_snapshot('routes.snapshot')
+        except StaleSnapshotError:
+            app = load_app('myservice.routes')
+    """
+    if app is None:
+        from blank.core.routing import default_app
+        app = default_app
+
+    with open(path, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    if check:
+        check_snapshot(snapshot)
+
+    with app.registering():
+        for route in snapshot["routes"]:
+            if route["kind"] == "batch":
+                app.batch(route["path"], **route["options"])
+                continue
+            handler = LazyHandler(
+                route["handler"], route["kind"], route["timeout"], route["params"], app
+            )
+            app.routes[route["method"]][route["path"]] = (handler, re.compile(route["pattern"]))
+    return app
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point: build a snapshot from route modules.
+
+    Usage:
+        python -m blank snapshot myservice.routes -o routes.snapshot
+    """
+    from blank.core.reload import load_app
+
+    parser = argparse.ArgumentParser(
+        prog="python -m blank snapshot", description="Build a route table snapshot."
+    )
+    parser.add_argument("modules", nargs="+", help="Modules registering routes")
+    parser.add_argument("-o", "--output", default="routes.snapshot", help="Snapshot file")
+    args = parser.parse_args(argv)
+
+    save_snapshot(load_app(*args.modules), args.output, args.modules)
+    print(f"Wrote {args.output}")
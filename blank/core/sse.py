@@ -0,0 +1,318 @@
+import json
+import queue
+import threading
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, Optional, Protocol
+
+from blank.common.types import RouteHandler
+from blank.core.http import Request, Response
+from blank.core.middleware import _wants_request
+
+__all__ = [
+    "Broadcaster",
+    "EventRoute",
+    "EventStream",
+    "Subscription",
+    "format_event",
+    "stream_endpoint",
+]
+
+HEARTBEAT = b":\n\n"
+
+
+def format_event(
+    data: Any,
+    event: Optional[str] = None,
+    id: Optional[str] = None,
+    retry: Optional[int] = None,
+) -> bytes:
+    """Serialize one Server-Sent Event.
+
+    Strings are sent as is (one ``data:`` line per line of text), other
+    values as JSON.
+
+    Example:
+        format_event({'cpu': 0.4}, event='load', id='17')
+        # b'event: load\\nid: 17\\ndata: {"cpu": 0.4}\\n\\n'
+    """
+    if isinstance(data, bytes):
+        data = data.decode()
+    elif not isinstance(data, str):
+        data = json.dumps(data, separators=(", ", ": "))
+
+    lines = []
+    if event is not None:
+        lines.append(f"event: {event}")
+    if id is not None:
+        lines.append(f"id: {id}")
+    if retry is not None:
+        lines.append(f"retry: {retry}")
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    lines.append("\n")
+    return "\n".join(lines).encode()
+
+
+class Hub(Protocol):
+    """Something holding subscribed connections, e.g. a server."""
+
+    def deliver(self, broadcaster: "Broadcaster", payload: Optional[bytes]) -> None:
+        """Write payload to every subscriber of broadcaster (None: stream ended)."""
+
+
+class Broadcaster:
+    """Fan-out of events to every subscribed SSE connection.
+
+    Each event is serialized once by publish(); the same bytes object is
+    handed to every hub (server) holding subscribers, which writes it to
+    each connection without copying. A comment line is sent every
+    ``heartbeat`` seconds while anyone is subscribed, keeping proxies
+    from timing out idle streams. A subscriber that falls more than
+    ``max_buffer`` bytes behind is disconnected instead of buffering
+    without bound; the browser reconnects on its own.
+
+    Example:
+        updates = Broadcaster(heartbeat=15)
+
+        @SSE('/updates')
+        def stream():
+            return updates
+
+        updates.publish({'cpu': 0.4}, event='load')
+    """
+
+    def __init__(
+        self,
+        heartbeat: Optional[float] = 15.0,
+        max_buffer: int = 262144,
+        retry: Optional[int] = None,
+    ):
+        """Initialize the broadcaster (the heartbeat starts with the first subscriber).
+
+        Args:
+            heartbeat: Seconds between keep-alive comments, or None for none
+            max_buffer: Unsent bytes allowed per subscriber before it is
+                disconnected as a slow consumer
+            retry: Reconnection delay in milliseconds sent to new subscribers
+        """
+        self.heartbeat = heartbeat
+        self.max_buffer = max_buffer
+        self.retry = retry
+        self.preamble = f"retry: {retry}\n\n".encode() if retry is not None else b""
+
+        self._lock = threading.Lock()
+        self._hubs: Dict[Hub, int] = {}
+        self._closed = False
+        self._stop = threading.Event()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._events = 0
+        self._subscribed = 0
+        self._slow = 0
+
+    def publish(
+        self,
+        data: Any,
+        event: Optional[str] = None,
+        id: Optional[str] = None,
+    ) -> None:
+        """Serialize an event once and send it to every subscriber."""
+        self._events += 1
+        self.send(format_event(data, event, id))
+
+    def send(self, payload: bytes) -> None:
+        """Send already serialized bytes to every subscriber."""
+        with self._lock:
+            hubs = list(self._hubs)
+        for hub in hubs:
+            hub.deliver(self, payload)
+
+    def subscribe(self, hub: Hub) -> bool:
+        """Record one new subscriber held by hub.
+
+        Returns:
+            False if the broadcaster is closed
+        """
+        with self._lock:
+            if self._closed:
+                return False
+            self._hubs[hub] = self._hubs.get(hub, 0) + 1
+            self._subscribed += 1
+            if self.heartbeat and self._heartbeat_thread is None:
+                self._heartbeat_thread = threading.Thread(
+                    target=self._beat, name="blank-sse-heartbeat", daemon=True
+                )
+                self._heartbeat_thread.start()
+        return True
+
+    def unsubscribe(self, hub: Hub, slow: bool = False) -> None:
+        """Record that one subscriber held by hub went away."""
+        with self._lock:
+            count = self._hubs.get(hub, 0) - 1
+            if count > 0:
+                self._hubs[hub] = count
+            else:
+                self._hubs.pop(hub, None)
+            if slow:
+                self._slow += 1
+
+    def close(self) -> None:
+        """End every stream and stop the heartbeat."""
+        with self._lock:
+            self._closed = True
+            hubs = list(self._hubs)
+        self._stop.set()
+        for hub in hubs:
+            hub.deliver(self, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of broadcaster counters.
+
+        Returns:
+            Dict with subscribers (current), subscribed (total), events
+            and slow (subscribers dropped for falling behind)
+        """
+        with self._lock:
+            return {
+                "subscribers": sum(self._hubs.values()),
+                "subscribed": self._subscribed,
+                "events": self._events,
+                "slow": self._slow,
+            }
+
+    def _beat(self) -> None:
+        while not self._stop.wait(self.heartbeat):
+            if self._hubs:
+                self.send(HEARTBEAT)
+
+
+class EventStream(Response):
+    """Response that turns the connection into an SSE stream of a Broadcaster."""
+
+    __slots__ = ("broadcaster",)
+
+    def __init__(self, broadcaster: Broadcaster, headers: Optional[Dict[str, str]] = None):
+        super().__init__(
+            "",
+            200,
+            headers if headers is not None else {
+                "Content-Type": "text/event-stream",
+                "Cache-Control": "no-cache",
+            },
+        )
+        self.broadcaster = broadcaster
+
+
+class Subscription:
+    """Blocking, queue-backed subscriber for thread-per-connection servers and tests.
+
+    Iterating yields the raw event bytes until the broadcaster closes or
+    the subscriber falls more than ``max_buffer`` bytes behind.
+
+    Example:
+        with Subscription(updates) as events:
+            for chunk in events:
+                wfile.write(chunk)
+    """
+
+    def __init__(self, broadcaster: Broadcaster):
+        self.broadcaster = broadcaster
+        self._queue: "queue.SimpleQueue[Optional[bytes]]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._buffered = 0
+        # Set before subscribing: the broadcaster may deliver right away.
+        self.closed = False
+        if not broadcaster.subscribe(self):
+            self.closed = True
+            self._queue.put(None)
+        elif broadcaster.preamble:
+            self.deliver(broadcaster, broadcaster.preamble)
+
+    def deliver(self, broadcaster: Broadcaster, payload: Optional[bytes]) -> None:
+        with self._lock:
+            if self.closed:
+                return
+            if payload is not None:
+                self._buffered += len(payload)
+                if self._buffered <= broadcaster.max_buffer:
+                    self._queue.put(payload)
+                    return
+                broadcaster.unsubscribe(self, slow=True)
+            self.closed = True
+        self._queue.put(None)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Next chunk of event bytes, or None once the stream has ended.
+
+        Raises:
+            queue.Empty: If nothing arrived within timeout seconds
+        """
+        payload = self._queue.get(timeout=timeout)
+        if payload is None:
+            self._queue.put(None)
+            return None
+        with self._lock:
+            self._buffered -= len(payload)
+        return payload
+
+    def close(self) -> None:
+        """Unsubscribe and end iteration."""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+        self.broadcaster.unsubscribe(self)
+        self._queue.put(None)
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            payload = self.get()
+            if payload is None:
+                return
+            yield payload
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class EventRoute:
+    """Registry entry for a handler registered as an SSE route.
+
+    Calling it calls the handler (e.g. through find_route); the App
+    compiles it into a chain answering with an EventStream. Other
+    attributes are read from the handler, so decorators such as
+    UseMiddleware work on the handler as usual.
+    """
+
+    __slots__ = ("handler",)
+
+    def __init__(self, handler: RouteHandler):
+        self.handler = handler
+
+    def __call__(self, **params: Any) -> Any:
+        return self.handler(**params)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.handler, name)
+
+
+def _call_stream_handler(handler: RouteHandler, wants_request: bool, request: Request) -> Response:
+    if wants_request:
+        result = handler(**{**request.params, "request": request})
+    else:
+        result = handler(**request.params)
+    if isinstance(result, Broadcaster):
+        return EventStream(result)
+    if isinstance(result, Response):
+        return result
+    raise TypeError(f"SSE handler must return a Broadcaster, got {type(result).__name__}")
+
+
+def stream_endpoint(handler: RouteHandler) -> Callable[[Request], Response]:
+    """Adapt an SSE handler into a request -> Response callable.
+
+    The handler returns the Broadcaster to subscribe to (or a Response,
+    e.g. a 404 for an unknown channel).
+    """
+    return partial(_call_stream_handler, handler, _wants_request(handler))
@@ -0,0 +1,175 @@
+import queue
+import threading
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+__all__ = ["Task", "TaskQueue"]
+
+Task = Tuple[Callable[..., Any], tuple, Dict[str, Any]]
+ErrorHook = Callable[[BaseException, Task], None]
+
+
+def _print_error(error: BaseException, task: Task) -> None:
+    """Default error hook: print the traceback, like socketserver does."""
+    print(f"Background task {task[0]!r} failed:")
+    traceback.print_exception(type(error), error, error.__traceback__)
+
+
+class TaskQueue:
+    """Bounded executor for work scheduled to run after the response.
+
+    Handlers schedule tasks with ``request.add_task(fn, *args, **kwargs)``;
+    the server submits them here once the response has been written.
+    Tasks run on ``workers`` threads started on first use, from a queue
+    of at most ``max_queue`` entries. When the queue is full, the
+    ``"drop"`` policy discards the batch (counting it), while ``"block"``
+    makes the submitting server thread wait for room. SelectorServer
+    submits from its event loop, which must never wait, so it always
+    drops.
+
+    Example:
+        app.tasks = TaskQueue(workers=4, max_queue=10000, policy='block',
+                              on_error=report_to_sentry)
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queue: int = 1024,
+        policy: str = "drop",
+        on_error: Optional[ErrorHook] = None,
+    ):
+        """Initialize the queue (no threads are started yet).
+
+        Args:
+            workers: Number of worker threads
+            max_queue: Maximum number of pending task batches
+            policy: 'drop' or 'block' when the queue is full
+            on_error: Called with (exception, task) when a task raises
+        """
+        if policy not in ("drop", "block"):
+            raise ValueError(f"Unknown policy {policy!r}, expected 'drop' or 'block'")
+
+        self.workers = workers
+        self.policy = policy
+        self.on_error = on_error if on_error is not None else _print_error
+        self._queue: "queue.Queue[Optional[Sequence[Task]]]" = queue.Queue(max_queue)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._dropped = 0
+
+    def submit(self, tasks: Sequence[Task], block: Optional[bool] = None) -> bool:
+        """Queue a batch of tasks from one request.
+
+        Args:
+            tasks: Tasks scheduled by the request
+            block: Wait for room in a full queue; None follows the policy
+
+        Returns:
+            True if queued, False if dropped (queue full or shut down)
+        """
+        if self._closed:
+            self._dropped += len(tasks)
+            return False
+        if not self._threads:
+            self._start()
+
+        try:
+            if block is None:
+                block = self.policy == "block"
+            self._queue.put(tasks, block=block)
+        except queue.Full:
+            with self._lock:
+                self._dropped += len(tasks)
+            return False
+
+        with self._lock:
+            self._submitted += len(tasks)
+        return True
+
+    def run(self, tasks: Sequence[Task]) -> None:
+        """Run a batch of tasks synchronously on the calling thread."""
+        for task in tasks:
+            fn, args, kwargs = task
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                with self._lock:
+                    self._failed += 1
+                try:
+                    self.on_error(e, task)
+                except Exception:
+                    # A failing hook must not kill the worker thread.
+                    print(f"Error hook {self.on_error!r} failed:")
+                    traceback.print_exc()
+            else:
+                with self._lock:
+                    self._completed += 1
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting tasks and wait for the queued ones to finish.
+
+        Waits at most ``timeout`` seconds in total; workers still busy
+        then finish the queue and stop on their own.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            threads = list(self._threads)
+        if not threads:
+            return
+
+        # One stop marker behind the queued tasks, passed on by each worker
+        # that takes it. If the queue is full, the workers add it themselves
+        # once they have emptied it.
+        self._stop_next()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of task counters.
+
+        Returns:
+            Dict with submitted, completed, failed, dropped and pending
+        """
+        with self._lock:
+            return {
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "dropped": self._dropped,
+                "pending": self._queue.qsize(),
+            }
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"blank-task-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self) -> None:
+        while True:
+            tasks = self._queue.get()
+            if tasks is None:
+                self._stop_next()
+                return
+            self.run(tasks)
+            if self._closed and self._queue.empty():
+                self._stop_next()
+
+    def _stop_next(self) -> None:
+        """Queue a stop marker for the next idle worker, if there is room."""
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
@@ -0,0 +1,120 @@
+import threading
+from time import perf_counter_ns
+from typing import List, Optional, Tuple
+
+from blank.core.http import Response, StaticResponse
+
+__all__ = ["ServerTiming", "server_timing"]
+
+PHASES = ("parse", "lookup", "binding", "handler")
+
+# Indexes into ServerTiming.marks; phase i runs from marks[i] to marks[i + 1]
+START, PARSED, MATCHED, BOUND, HANDLED = range(5)
+
+
+class _State(threading.local):
+    def __init__(self):
+        self.pool: List[ServerTiming] = []
+        self.current: Optional[ServerTiming] = None
+
+
+_state = _State()
+
+
+def _quote(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+class ServerTiming:
+    """Phase timestamps of one request, rendered as a Server-Timing header.
+
+    Instances are pooled per thread and reused, and the timestamps go
+    into a fixed list of slots, so timing a request allocates nothing
+    beyond the header string itself (and any metrics handlers add).
+    """
+
+    __slots__ = ("marks", "metrics", "previous")
+
+    def __init__(self):
+        self.marks = [0, 0, 0, 0, 0]
+        self.metrics: Optional[List[Tuple[str, Optional[float], Optional[str]]]] = None
+        self.previous: Optional[ServerTiming] = None
+
+    @classmethod
+    def start(cls) -> "ServerTiming":
+        """Take a timer from this thread's pool and make it the current one."""
+        pool = _state.pool
+        timing = pool.pop() if pool else cls()
+        timing.previous = _state.current
+        _state.current = timing
+        timing.marks[START] = perf_counter_ns()
+        return timing
+
+    def mark(self, index: int) -> None:
+        """Record the end of a phase (PARSED, MATCHED, BOUND or HANDLED)."""
+        self.marks[index] = perf_counter_ns()
+
+    def header(self, phases: int) -> str:
+        """Server-Timing value for the first ``phases`` phases plus handler metrics."""
+        marks = self.marks
+        parts = [
+            f"{PHASES[i]};dur={(marks[i + 1] - marks[i]) / 1e6:.3f}" for i in range(phases)
+        ]
+        for name, duration, description in self.metrics or ():
+            part = name
+            if duration is not None:
+                part += f";dur={duration:.3f}"
+            if description is not None:
+                part += f";desc={_quote(description)}"
+            parts.append(part)
+        return ", ".join(parts)
+
+    def finish(self, response: Response, phases: int) -> Response:
+        """Attach the header, restore the previous timer and return this one to the pool.
+
+        A shared StaticResponse is copied before the header is added.
+        """
+        if isinstance(response, StaticResponse):
+            response = Response(response.body, response.status, dict(response.headers))
+        response.headers["Server-Timing"] = self.header(phases)
+        self.release()
+        return response
+
+    def release(self) -> None:
+        """Restore the previous timer and return this one to the pool, once."""
+        if _state.current is not self:
+            return
+        _state.current = self.previous
+        self.previous = None
+        self.metrics = None
+        _state.pool.append(self)
+
+
+def server_timing(
+    name: str,
+    duration: Optional[float] = None,
+    description: Optional[str] = None,
+) -> None:
+    """Add a metric to the Server-Timing header of the current request.
+
+    Does nothing unless ``app.server_timing`` is enabled.
+
+    Args:
+        name: Metric name, e.g. 'db'
+        duration: Milliseconds
+        description: Human-readable description
+
+    Example:
+        @GET('/users/{id}')
+        def get_user(id):
+            started = time.perf_counter()
+            user = db.load(id)
+            server_timing('db', (time.perf_counter() - started) * 1000, 'load user')
+            return user.name
+    """
+    timing = _state.current
+    if timing is None:
+        return
+    if timing.metrics is None:
+        timing.metrics = []
+    timing.metrics.append((name, duration, description))
@@ -0,0 +1,405 @@
+import json
+import queue
+import random
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Protocol, Tuple
+
+__all__ = [
+    "Span",
+    "Trace",
+    "Tracer",
+    "JSONLinesExporter",
+    "MemoryExporter",
+    "span",
+    "traceparent",
+]
+
+_local = threading.local()
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """Parse a W3C traceparent header.
+
+    Returns:
+        Tuple of (trace id, parent span id, sampled), or None if the
+        header is missing or malformed
+    """
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) < 4 or len(parts[0]) != 2 or parts[0] == "ff":
+        return None
+    trace_id, parent_id, flags = parts[1], parts[2], parts[3]
+    if len(trace_id) != 32 or len(parent_id) != 16 or len(flags) != 2:
+        return None
+    try:
+        if int(trace_id, 16) == 0 or int(parent_id, 16) == 0:
+            return None
+        sampled = bool(int(flags, 16) & 1)
+    except ValueError:
+        return None
+    return trace_id, parent_id, sampled
+
+
+class Span:
+    """A timed operation within a trace.
+
+    Used as a context manager, a span becomes the parent of spans opened
+    inside it on the same thread.
+
+    Example:
+        with span('db.query', table='users') as s:
+            rows = db.fetch(...)
+            s.set('rows', len(rows))
+    """
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "start", "end", "attributes", "_prev")
+
+    def __init__(
+        self,
+        trace: "Trace",
+        name: str,
+        parent_id: Optional[str],
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.trace = trace
+        self.span_id = _new_id(64)
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.time_ns()
+        self.end = 0
+        self.attributes = attributes if attributes is not None else {}
+        self._prev: Optional[Span] = None
+        trace.spans.append(self)
+
+    @property
+    def traceparent(self) -> str:
+        """W3C traceparent header value naming this span as the parent."""
+        return f"00-{self.trace.trace_id}-{self.span_id}-01"
+
+    def set(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    def finish(self) -> None:
+        """Record the end time (only the first call counts)."""
+        if not self.end:
+            self.end = time.time_ns()
+
+    def child(self, name: str, **attributes: Any) -> "Span":
+        """Start a span whose parent is this one."""
+        return Span(self.trace, name, self.span_id, attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Exported form of the span."""
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start,
+            "duration_ns": self.end - self.start,
+            "attributes": self.attributes,
+        }
+
+    def __enter__(self) -> "Span":
+        self._prev = getattr(_local, "span", None)
+        _local.span = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is not None:
+            self.attributes["error"] = repr(exc)
+        self.finish()
+        _local.span = self._prev
+
+
+class _NoopSpan:
+    """Stand-in returned by span() outside a sampled request."""
+
+    __slots__ = ()
+    traceparent = None
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def finish(self) -> None:
+        pass
+
+    def child(self, name: str, **attributes: Any) -> "_NoopSpan":
+        return self
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str, **attributes: Any):
+    """Open a child span of the current span, for use in handlers.
+
+    Outside a sampled request this returns a shared no-op span, so
+    instrumented code costs one thread-local lookup when not traced.
+
+    Example:
+        @GET('/users/{id}')
+        def get_user(id):
+            with span('db.load_user', id=id):
+                user = db.load(id)
+            return user.name
+    """
+    current = getattr(_local, "span", None)
+    if current is None:
+        return _NOOP
+    return current.child(name, **attributes)
+
+
+def traceparent() -> Optional[str]:
+    """traceparent header for outgoing calls made from the current span.
+
+    Returns:
+        Header value, or None outside a sampled request
+    """
+    current = getattr(_local, "span", None)
+    return current.traceparent if current is not None else None
+
+
+class Trace:
+    """Spans of one sampled request, rooted at a 'request' span."""
+
+    __slots__ = ("tracer", "trace_id", "spans", "root", "phase")
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        trace_id: str,
+        parent_id: Optional[str],
+        method: str,
+        target: str,
+    ):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.spans: List[Span] = []
+        self.root = Span(self, "request", parent_id, {"method": method, "target": target})
+        self.phase: Optional[Span] = None
+
+    def begin(self, name: str) -> Span:
+        """End the current phase and start the next one directly under the root."""
+        if self.phase is not None:
+            self.phase.finish()
+        self.phase = Span(self, name, self.root.span_id)
+        return self.phase
+
+    def finish(self, status: Optional[int] = None) -> None:
+        """End the last phase and the root span, and hand the spans to the exporter."""
+        if self.phase is not None:
+            self.phase.finish()
+        if status is not None:
+            self.root.attributes["status"] = status
+        self.root.finish()
+        self.tracer._export(self)
+
+
+class Exporter(Protocol):
+    def export(self, spans: List[Dict[str, Any]]) -> None:
+        """Write a batch of finished spans."""
+
+
+class MemoryExporter:
+    """In-process collector of exported spans, e.g. for tests.
+
+    Example:
+        exporter = MemoryExporter()
+        app.tracer = Tracer(sample_rate=1.0, exporter=exporter)
+        ...
+        app.tracer.flush()
+        names = [s['name'] for s in exporter.spans]
+    """
+
+    def __init__(self):
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self.spans.extend(spans)
+
+    def traces(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Exported spans grouped by trace id."""
+        with self._lock:
+            grouped: Dict[str, List[Dict[str, Any]]] = {}
+            for item in self.spans:
+                grouped.setdefault(item["trace_id"], []).append(item)
+            return grouped
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+class JSONLinesExporter:
+    """Appends each span as one JSON object per line to a file."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: List[Dict[str, Any]]) -> None:
+        lines = "".join(json.dumps(item, default=str) + "\n" for item in spans)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+class Tracer:
+    """Head-sampled request tracing with batched, asynchronous export.
+
+    The sampling decision is made once when a request arrives: requests
+    carrying a W3C ``traceparent`` header follow its sampled flag (and
+    join its trace); others are sampled with probability ``sample_rate``.
+    Sampled requests record spans for the parse, match, handler and
+    write phases, plus any opened by the handler with span(). Unsampled
+    requests allocate nothing.
+
+    Finished traces are queued and written by a background thread in
+    batches of up to ``batch_size`` spans, at least every
+    ``flush_interval`` seconds.
+
+    Example:
+        app.tracer = Tracer(sample_rate=0.01, exporter=JSONLinesExporter('spans.jsonl'))
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.01,
+        exporter: Optional[Exporter] = None,
+        batch_size: int = 512,
+        flush_interval: float = 1.0,
+        max_queue: int = 10000,
+    ):
+        """Initialize the tracer (the export thread starts with the first trace).
+
+        Args:
+            sample_rate: Fraction of requests without traceparent to sample
+            exporter: Receives batches of span dicts (defaults to a MemoryExporter)
+            batch_size: Maximum spans per export call
+            flush_interval: Seconds a finished span may wait for export
+            max_queue: Finished traces kept waiting; more are dropped
+        """
+        self.sample_rate = sample_rate
+        self.exporter = exporter if exporter is not None else MemoryExporter()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._random = random.random
+        self._sampled = 0
+        self._dropped = 0
+
+    def start(
+        self,
+        method: str,
+        target: str,
+        headers: Optional[Mapping[str, str]],
+    ) -> Optional[Trace]:
+        """Make the sampling decision for a request.
+
+        Returns:
+            A Trace if the request is sampled, else None
+        """
+        parent = parse_traceparent(headers.get("traceparent")) if headers else None
+        if parent is not None:
+            if not parent[2]:
+                return None
+            trace_id, parent_id = parent[0], parent[1]
+        elif self._random() < self.sample_rate:
+            trace_id, parent_id = _new_id(128), None
+        else:
+            return None
+        self._sampled += 1
+        return Trace(self, trace_id, parent_id, method, target)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until every trace finished so far has been exported."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Export what is queued and stop the export thread."""
+        self.flush(timeout)
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of tracer counters.
+
+        Returns:
+            Dict with sampled (traces started), dropped (traces lost to a
+            full queue, or batches to a failing exporter) and queued
+        """
+        return {
+            "sampled": self._sampled,
+            "dropped": self._dropped,
+            "queued": self._queue.qsize(),
+        }
+
+    def _export(self, trace: Trace) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self._dropped += 1
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="blank-tracer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        batch: List[Dict[str, Any]] = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False
+
+            if isinstance(item, Trace):
+                batch.extend(s.to_dict() for s in item.spans)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(batch) < self.batch_size:
+                    continue
+
+            while batch:
+                chunk, batch = batch[: self.batch_size], batch[self.batch_size:]
+                try:
+                    self.exporter.export(chunk)
+                except Exception:
+                    self._dropped += 1
+            deadline = None
+
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is None:
+                return
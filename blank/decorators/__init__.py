@@ -1,6 +1,16 @@
-from blank.core.routing import GET, POST
+from blank.core.routing import GET, POST, PUT, PATCH, DELETE, SSE
+from blank.core.middleware import UseMiddleware
+from blank.core.ratelimit import RateLimit
+from blank.core.singleflight import Coalesce
 
 __all__ = [
     "GET",
     "POST",
+    "PUT",
+    "PATCH",
+    "DELETE",
+    "SSE",
+    "UseMiddleware",
+    "RateLimit",
+    "Coalesce",
 ]
\ No newline at end of file
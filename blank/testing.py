@@ -1,8 +1,20 @@
+import http.client
+import multiprocessing
+import socket
+import sys
+import threading
+import traceback
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from json import dumps
+from time import perf_counter, perf_counter_ns
+from typing import Optional, Dict, Any, List, Sequence, Tuple, Union
 
-from blank.common.parsing import URLParser
-from blank.core.routing import get_routes, post_routes, find_route
+from blank.core.app import App
+from blank.core.http import Response
+from blank.core.routing import default_app
+from blank.core.sse import EventStream, Subscription
 
 
 @dataclass
@@ -29,6 +41,17 @@ class TestResponse:
         return json.loads(self.text)
 
 
+def _complete(app: App, response: Response, sync_tasks: bool) -> None:
+    """Finish the response's trace and run or queue its background tasks."""
+    if response.trace is not None:
+        response.trace.finish(response.status)
+    if response.background is not None:
+        if sync_tasks:
+            app.tasks.run(response.background)
+        else:
+            app.tasks.submit(response.background)
+
+
 class Client:
     """HTTP client for testing routes without a real server.
     
@@ -40,9 +63,25 @@ class Client:
         assert response.status_code == 200
     """
     
-    def __init__(self):
-        """Initialize the test client."""
-        pass
+    def __init__(
+        self,
+        app: Optional[App] = None,
+        remote_addr: Optional[str] = "127.0.0.1",
+        sync_tasks: bool = True
+    ):
+        """Initialize the test client.
+        
+        Args:
+            app: Application to send requests to (defaults to the app the
+                module-level decorators register into)
+            remote_addr: Client address the requests appear to come from
+                (None, like requests over a Unix socket)
+            sync_tasks: Run background tasks synchronously before returning
+                the response (deterministic), instead of on app.tasks
+        """
+        self.app = app if app is not None else default_app
+        self.remote_addr = remote_addr
+        self.sync_tasks = sync_tasks
     
     def get(self, path: str, headers: Optional[Dict[str, str]] = None) -> TestResponse:
         """Make a GET request.
@@ -56,23 +95,136 @@ class Client:
         """
         return self._request("GET", path, headers)
     
-    def post(self, path: str, headers: Optional[Dict[str, str]] = None) -> TestResponse:
+    def post(
+        self,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        body: Union[str, bytes, None] = None,
+        json: Any = None
+    ) -> TestResponse:
         """Make a POST request.
         
         Args:
             path: URL path with optional query string
             headers: Optional request headers
+            body: Optional raw request body
+            json: Optional value sent as a JSON body (instead of body)
+            
+        Returns:
+            TestResponse with status_code, text, and headers
+        """
+        return self._request("POST", path, headers, body, json)
+    
+    def put(
+        self,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        body: Union[str, bytes, None] = None,
+        json: Any = None
+    ) -> TestResponse:
+        """Make a PUT request.
+        
+        Args:
+            path: URL path with optional query string
+            headers: Optional request headers
+            body: Optional raw request body
+            json: Optional value sent as a JSON body (instead of body)
+            
+        Returns:
+            TestResponse with status_code, text, and headers
+        """
+        return self._request("PUT", path, headers, body, json)
+    
+    def patch(
+        self,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        body: Union[str, bytes, None] = None,
+        json: Any = None
+    ) -> TestResponse:
+        """Make a PATCH request.
+        
+        Args:
+            path: URL path with optional query string
+            headers: Optional request headers
+            body: Optional raw request body
+            json: Optional value sent as a JSON body (instead of body)
             
         Returns:
             TestResponse with status_code, text, and headers
         """
-        return self._request("POST", path, headers)
+        return self._request("PATCH", path, headers, body, json)
+    
+    def delete(
+        self,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        body: Union[str, bytes, None] = None,
+        json: Any = None
+    ) -> TestResponse:
+        """Make a DELETE request.
+        
+        Args:
+            path: URL path with optional query string
+            headers: Optional request headers
+            body: Optional raw request body
+            json: Optional value sent as a JSON body (instead of body)
+            
+        Returns:
+            TestResponse with status_code, text, and headers
+        """
+        return self._request("DELETE", path, headers, body, json)
+    
+    def head(self, path: str, headers: Optional[Dict[str, str]] = None) -> TestResponse:
+        """Make a HEAD request.
+        
+        Args:
+            path: URL path with optional query string
+            headers: Optional request headers
+            
+        Returns:
+            TestResponse with status_code and headers, and an empty text
+        """
+        return self._request("HEAD", path, headers)
+    
+    def options(self, path: str, headers: Optional[Dict[str, str]] = None) -> TestResponse:
+        """Make an OPTIONS request.
+        
+        Args:
+            path: URL path with optional query string
+            headers: Optional request headers
+            
+        Returns:
+            TestResponse with status_code and headers (including Allow)
+        """
+        return self._request("OPTIONS", path, headers)
+    
+    def stream(self, path: str, headers: Optional[Dict[str, str]] = None) -> Subscription:
+        """Subscribe to an SSE route.
+        
+        Args:
+            path: URL path with optional query string
+            headers: Optional request headers
+            
+        Returns:
+            Subscription yielding the raw event bytes; close it when done
+            
+        Raises:
+            AssertionError: If the route did not answer with an event stream
+        """
+        response = self.app.dispatch("GET", path, headers, self.remote_addr)
+        assert isinstance(response, EventStream), (
+            f"GET {path} returned {response.status}, not an event stream"
+        )
+        return Subscription(response.broadcaster)
     
     def _request(
         self,
         method: str,
         path: str,
-        headers: Optional[Dict[str, str]] = None
+        headers: Optional[Dict[str, str]] = None,
+        body: Union[str, bytes, None] = None,
+        json: Any = None
     ) -> TestResponse:
         """Internal method to process a request.
         
@@ -80,49 +232,324 @@ class Client:
             method: HTTP method (GET, POST, etc.)
             path: URL path with optional query string
             headers: Optional request headers
+            body: Optional raw request body
+            json: Optional value sent as a JSON body
             
         Returns:
             TestResponse with status_code, text, and headers
         """
-        if method == "GET":
-            routes = get_routes
-        elif method == "POST":
-            routes = post_routes
-        else:
-            return TestResponse(
-                status_code=405,
-                text="Method Not Allowed",
-                headers={"Content-Type": "text/plain"}
-            )
+        if json is not None:
+            body = dumps(json)
+            headers = {"Content-Type": "application/json", **(headers or {})}
+        if isinstance(body, str):
+            body = body.encode()
+        response = self.app.dispatch(method, path, headers, self.remote_addr, body or b"")
+        _complete(self.app, response, self.sync_tasks)
+        return TestResponse(
+            status_code=response.status,
+            text=response.text,
+            headers=dict(response.headers)
+        )
+
+
+RequestSpec = Union[str, Tuple[Any, ...]]
+"""A target (sent as GET), or a tuple (method, target[, headers[, body]])."""
+
+_Prepared = Tuple[str, str, Optional[Dict[str, str]], bytes]
+_Outcome = Tuple[List[int], List[str], List[int], Optional[List[TestResponse]]]
+
+# State inherited by forked Runner processes, so requests are not pickled.
+_forked: Optional[Tuple[App, List[_Prepared], Optional[str], bool, bool]] = None
+
+
+class RunResult:
+    """Results of Runner.run(), as parallel lists in request order.
+    
+    Attributes:
+        statuses: Status code of each request; 0 if dispatch raised
+        bodies: Body of each request; the traceback if dispatch raised
+        latencies: Dispatch time of each request in nanoseconds
+        responses: TestResponse of each request, or None unless requested
+        elapsed: Wall-clock seconds of the whole run
+    """
+    
+    __slots__ = ("statuses", "bodies", "latencies", "responses", "elapsed")
+    
+    def __init__(
+        self,
+        statuses: List[int],
+        bodies: List[str],
+        latencies: List[int],
+        responses: Optional[List[TestResponse]],
+        elapsed: float
+    ):
+        self.statuses = statuses
+        self.bodies = bodies
+        self.latencies = latencies
+        self.responses = responses
+        self.elapsed = elapsed
+    
+    def __len__(self) -> int:
+        return len(self.statuses)
+    
+    def __getitem__(self, index: int) -> Tuple[int, str]:
+        """(status, body) of one request."""
+        return self.statuses[index], self.bodies[index]
+    
+    def failures(self) -> List[Tuple[int, int, str]]:
+        """(index, status, body) of requests that raised or answered 5xx."""
+        return [
+            (i, status, self.bodies[i])
+            for i, status in enumerate(self.statuses)
+            if status == 0 or status >= 500
+        ]
+    
+    def status_counts(self) -> Counter:
+        """Number of requests per status code."""
+        return Counter(self.statuses)
+    
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate throughput and latency.
+        
+        Returns:
+            Dict with requests, failures, elapsed (seconds), rps, and
+            mean_ms, p50_ms, p90_ms, p99_ms and max_ms dispatch latency
+        """
+        count = len(self.latencies)
+        ordered = sorted(self.latencies)
+        
+        def percentile(q: float) -> float:
+            return ordered[min(count - 1, int(q * count))] / 1e6 if count else 0.0
+        
+        return {
+            "requests": count,
+            "failures": len(self.failures()),
+            "elapsed": self.elapsed,
+            "rps": count / self.elapsed if self.elapsed else 0.0,
+            "mean_ms": sum(ordered) / count / 1e6 if count else 0.0,
+            "p50_ms": percentile(0.5),
+            "p90_ms": percentile(0.9),
+            "p99_ms": percentile(0.99),
+            "max_ms": ordered[-1] / 1e6 if count else 0.0,
+        }
+
+
+class Runner:
+    """Runs many requests concurrently through an app's dispatch core.
+    
+    Requests are spread over ``workers`` threads, or forked processes,
+    which start together behind a barrier. Results come back as plain
+    lists (see RunResult); TestResponse objects are only built when
+    asked for.
+    
+    Threads share the app, so handlers keeping unsynchronized state
+    show up as failures (e.g. 'dictionary changed size during
+    iteration') or as wrong final state. Setting ``switch_interval``
+    (e.g. 1e-6) makes the interpreter switch threads far more often
+    during the run, so such races show up much more reliably.
+    Processes share nothing: use them to measure throughput of
+    CPU-bound handlers, not to look for races.
+    
+    Example:
+        runner = Runner(app, workers=8, switch_interval=1e-6)
+        result = runner.run([f'/users/{i}' for i in range(10000)])
+        assert result.failures() == []
+        print(result.summary())
+    """
+    
+    def __init__(
+        self,
+        app: Optional[App] = None,
+        workers: int = 4,
+        executor: str = "thread",
+        remote_addr: Optional[str] = "127.0.0.1",
+        sync_tasks: bool = True,
+        switch_interval: Optional[float] = None
+    ):
+        """Initialize the runner.
         
-        url = URLParser(path)
-        handler, path_params = find_route(routes, url.path)
+        Args:
+            app: Application to send requests to (defaults to the app the
+                module-level decorators register into)
+            workers: Number of threads or processes
+            executor: 'thread', or 'process' (needs the fork start method)
+            remote_addr: Client address the requests appear to come from
+            sync_tasks: Run background tasks synchronously in the worker,
+                instead of on app.tasks
+            switch_interval: Thread switch interval (seconds) during the
+                run, or None to leave it unchanged
         
-        if handler:
-            all_params = {**url.query_params, **path_params}
+        Raises:
+            ValueError: If the executor is unknown or unavailable
+        """
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor {executor!r}, expected 'thread' or 'process'")
+        if executor == "process" and "fork" not in multiprocessing.get_all_start_methods():
+            raise ValueError("The 'process' executor needs the fork start method")
+        self.app = app if app is not None else default_app
+        self.workers = workers
+        self.executor = executor
+        self.remote_addr = remote_addr
+        self.sync_tasks = sync_tasks
+        self.switch_interval = switch_interval
+    
+    def run(self, requests: Sequence[RequestSpec], responses: bool = False) -> RunResult:
+        """Dispatch all requests and collect their results.
+        
+        Args:
+            requests: Targets like '/users/42' (sent as GET), or tuples
+                (method, target[, headers[, body]]); a body may be str,
+                bytes, or any other value to send as JSON
+            responses: Also build a TestResponse per request (with headers)
             
-            try:
-                response_text = handler(**all_params)
-                return TestResponse(
-                    status_code=200,
-                    text=str(response_text),
-                    headers={"Content-Type": "text/plain"}
-                )
-            except TypeError as e:
-                return TestResponse(
-                    status_code=500,
-                    text=f"Internal Server Error: {e}",
-                    headers={"Content-Type": "text/plain"}
-                )
-            except Exception as e:
-                return TestResponse(
-                    status_code=500,
-                    text=f"Internal Server Error: {e}",
-                    headers={"Content-Type": "text/plain"}
-                )
+        Returns:
+            RunResult in the order of requests
+        """
+        prepared = [_prepare(spec) for spec in requests]
+        chunks = [range(i, len(prepared), self.workers) for i in range(self.workers)]
+        if self.executor == "thread":
+            outcomes, elapsed = self._run_threads(prepared, chunks, responses)
         else:
-            return TestResponse(
-                status_code=404,
-                text="404 Not Found",
-                headers={"Content-Type": "text/plain"}
+            outcomes, elapsed = self._run_processes(prepared, chunks, responses)
+        
+        count = len(prepared)
+        statuses, bodies, latencies = [0] * count, [""] * count, [0] * count
+        built: Optional[List[Any]] = [None] * count if responses else None
+        for indexes, (chunk_statuses, chunk_bodies, chunk_latencies, chunk_built) in zip(
+            chunks, outcomes, strict=True
+        ):
+            for position, i in enumerate(indexes):
+                statuses[i] = chunk_statuses[position]
+                bodies[i] = chunk_bodies[position]
+                latencies[i] = chunk_latencies[position]
+                if built is not None:
+                    built[i] = chunk_built[position]
+        return RunResult(statuses, bodies, latencies, built, elapsed)
+    
+    def _run_threads(
+        self,
+        prepared: List[_Prepared],
+        chunks: List[range],
+        responses: bool
+    ) -> Tuple[List[_Outcome], float]:
+        """Run each chunk on its own thread, all released at once."""
+        outcomes: List[Any] = [None] * len(chunks)
+        started: List[float] = []
+        barrier = threading.Barrier(len(chunks), action=lambda: started.append(perf_counter()))
+        
+        def work(n: int) -> None:
+            barrier.wait()
+            outcomes[n] = _run_chunk(
+                self.app, prepared, chunks[n], self.remote_addr, self.sync_tasks, responses
             )
+        
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(len(chunks))]
+        interval = sys.getswitchinterval()
+        if self.switch_interval is not None:
+            sys.setswitchinterval(self.switch_interval)
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        return outcomes, perf_counter() - started[0]
+    
+    def _run_processes(
+        self,
+        prepared: List[_Prepared],
+        chunks: List[range],
+        responses: bool
+    ) -> Tuple[List[_Outcome], float]:
+        """Run each chunk in a forked process that inherits the app and requests."""
+        global _forked
+        _forked = (self.app, prepared, self.remote_addr, self.sync_tasks, responses)
+        try:
+            context = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(len(chunks), mp_context=context) as pool:
+                # Fork every worker before the clock starts.
+                list(pool.map(_noop, range(len(chunks))))
+                started = perf_counter()
+                outcomes = list(pool.map(_run_forked_chunk, chunks))
+                return outcomes, perf_counter() - started
+        finally:
+            _forked = None
+
+
+def _prepare(spec: RequestSpec) -> _Prepared:
+    """Normalize a request spec to (method, target, headers, body bytes)."""
+    if isinstance(spec, str):
+        return "GET", spec, None, b""
+    method, target, headers, body = (*spec, None, None)[:4]
+    if body is not None and not isinstance(body, (str, bytes)):
+        body = dumps(body)
+        headers = {"Content-Type": "application/json", **(headers or {})}
+    if isinstance(body, str):
+        body = body.encode()
+    return method, target, headers, body or b""
+
+
+def _run_chunk(
+    app: App,
+    prepared: List[_Prepared],
+    indexes: range,
+    remote_addr: Optional[str],
+    sync_tasks: bool,
+    responses: bool
+) -> _Outcome:
+    """Dispatch the requests at indexes, in order."""
+    dispatch = app.dispatch
+    statuses: List[int] = []
+    bodies: List[str] = []
+    latencies: List[int] = []
+    built: Optional[List[TestResponse]] = [] if responses else None
+    for i in indexes:
+        method, target, headers, body = prepared[i]
+        started = perf_counter_ns()
+        try:
+            response = dispatch(method, target, headers, remote_addr, body)
+            _complete(app, response, sync_tasks)
+        except Exception as e:
+            latencies.append(perf_counter_ns() - started)
+            statuses.append(0)
+            bodies.append("".join(traceback.format_exception(type(e), e, e.__traceback__)))
+            if built is not None:
+                built.append(TestResponse(0, bodies[-1], {}))
+            continue
+        latencies.append(perf_counter_ns() - started)
+        statuses.append(response.status)
+        bodies.append(response.text)
+        if built is not None:
+            built.append(TestResponse(response.status, response.text, dict(response.headers)))
+    return statuses, bodies, latencies, built
+
+
+def _run_forked_chunk(indexes: range) -> _Outcome:
+    app, prepared, remote_addr, sync_tasks, responses = _forked
+    return _run_chunk(app, prepared, indexes, remote_addr, sync_tasks, responses)
+
+
+def _noop(_: int) -> None:
+    pass
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """http.client connection to a server listening on a Unix domain socket.
+    
+    Example:
+        conn = UnixHTTPConnection('/run/blank.sock')
+        conn.request('GET', '/users/42')
+        assert conn.getresponse().status == 200
+    """
+    
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+    
+    def connect(self):
+        """Connect to the socket file instead of a TCP address."""
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
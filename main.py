@@ -1,14 +1,16 @@
-import examples.app  # noqa: F401
+import os
+from functools import partial
 
-from blank import HTTPServer, Router
+from blank import Reloader, load_app
 
 
 def main():
     host = "localhost"
     port = 7740
     
-    server = HTTPServer((host, port), Router)
+    server = Reloader((host, port), partial(load_app, "examples.app"))
     print(f"Server running at http://{host}:{port}")
+    print(f"Reload with: kill -HUP {os.getpid()}")
     
     try:
         server.serve_forever()
@@ -18,4 +20,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
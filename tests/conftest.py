@@ -1,24 +1,26 @@
+import threading
+
 import pytest
 
-from blank.core.routing import get_routes, post_routes
+from blank.core.app import App
+from blank.core.selector_server import SelectorServer
+from blank.core.routing import default_app
 from blank.testing import Client
 
 
 @pytest.fixture(autouse=True)
 def clear_routes():
-    """Clear all registered routes before each test.
+    """Clear all registered routes and middleware before each test.
     
     This fixture runs automatically before every test to ensure
     route isolation - routes registered in one test don't leak
-    into other tests.
+    into other tests. Tests using their own App need no cleanup.
     """
-    get_routes.clear()
-    post_routes.clear()
+    default_app.reset()
     
     yield
     
-    get_routes.clear()
-    post_routes.clear()
+    default_app.reset()
 
 
 @pytest.fixture
@@ -31,3 +33,27 @@ def client():
             assert response.status_code == 200
     """
     return Client()
+
+
+@pytest.fixture
+def app():
+    """Provide a fresh, independent App instance."""
+    return App()
+
+
+@pytest.fixture
+def serve():
+    """Start SelectorServers on ephemeral ports; shut them down afterwards."""
+    servers = []
+
+    def start(app, **options):
+        server = SelectorServer(("127.0.0.1", 0), app, **options)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,210 @@
+import threading
+import time
+
+from blank import AdmissionController
+
+
+def hold(app, path="/slow"):
+    """Register a route that blocks until the returned event is set."""
+    release = threading.Event()
+    entered = threading.Event()
+
+    @app.get(path)
+    def slow():
+        entered.set()
+        release.wait(5)
+        return "done"
+
+    return release, entered
+
+
+def in_background(app, path):
+    """Dispatch a GET in a thread; returns (thread, results list)."""
+    results = []
+    thread = threading.Thread(target=lambda: results.append(app.dispatch("GET", path)))
+    thread.start()
+    return thread, results
+
+
+class TestShedding:
+    """Tests for in-flight limits and 503 responses."""
+
+    def test_admits_below_limit(self, app):
+        """Requests under the limit should run normally."""
+        @app.get("/fast")
+        def fast():
+            return "fast"
+
+        app.admission = AdmissionController(max_in_flight=1)
+
+        assert app.dispatch("GET", "/fast").text == "fast"
+        assert app.dispatch("GET", "/fast").text == "fast"
+        assert app.admission.stats()["admitted"] == 2
+        assert app.admission.stats()["in_flight"] == 0
+
+    def test_sheds_over_limit(self, app):
+        """A request over the limit should get a 503 with Retry-After."""
+        release, entered = hold(app)
+        app.admission = AdmissionController(max_in_flight=1, retry_after=3)
+
+        thread, results = in_background(app, "/slow")
+        entered.wait(5)
+
+        response = app.dispatch("GET", "/slow")
+        release.set()
+        thread.join()
+
+        assert response.status == 503
+        assert response.headers["Retry-After"] == "3"
+        assert results[0].text == "done"
+        assert app.admission.stats()["shed"] == 1
+
+    def test_shed_before_routing(self, app):
+        """Shed requests should never reach routing or handlers."""
+        release, entered = hold(app)
+        app.admission = AdmissionController(max_in_flight=1)
+
+        thread, _ = in_background(app, "/slow")
+        entered.wait(5)
+
+        response = app.dispatch("GET", "/does-not-exist")
+        release.set()
+        thread.join()
+
+        assert response.status == 503
+
+    def test_rejection_is_precomputed(self, app):
+        """The 503 should be a single shared precomputed response."""
+        release, entered = hold(app)
+        app.admission = AdmissionController(max_in_flight=1)
+
+        thread, _ = in_background(app, "/slow")
+        entered.wait(5)
+
+        first = app.dispatch("GET", "/slow")
+        second = app.dispatch("GET", "/slow")
+        release.set()
+        thread.join()
+
+        assert first is second is app.admission.rejection
+        assert first.raw.startswith(b"HTTP/1.1 503 Service Unavailable\r\n")
+
+    def test_exempt_route_never_shed(self, app):
+        """Exempt paths should be served even when the limit is reached."""
+        release, entered = hold(app)
+
+        @app.get("/health")
+        def health():
+            return "ok"
+
+        app.admission = AdmissionController(max_in_flight=1, exempt=["/health"])
+
+        thread, _ = in_background(app, "/slow")
+        entered.wait(5)
+
+        response = app.dispatch("GET", "/health/")
+        release.set()
+        thread.join()
+
+        assert response.text == "ok"
+        assert app.admission.stats()["exempt"] == 1
+
+    def test_handler_error_releases_slot(self, app):
+        """A failing handler should not leak its slot."""
+        @app.get("/boom")
+        def boom():
+            raise RuntimeError("boom")
+
+        app.admission = AdmissionController(max_in_flight=1)
+
+        assert app.dispatch("GET", "/boom").status == 500
+        assert app.admission.stats()["in_flight"] == 0
+
+
+class TestQueueing:
+    """Tests for bounded queue wait."""
+
+    def test_waits_for_free_slot(self, app):
+        """A request should be admitted if a slot frees up within the wait."""
+        release, entered = hold(app)
+        app.admission = AdmissionController(max_in_flight=1, max_queue_wait=5)
+
+        thread, results = in_background(app, "/slow")
+        entered.wait(5)
+
+        waiter, waited = in_background(app, "/slow")
+        time.sleep(0.05)
+        assert app.admission.stats()["queued"] == 1
+        release.set()
+
+        thread.join()
+        waiter.join()
+        assert results[0].text == "done"
+        assert waited[0].text == "done"
+
+    def test_sheds_after_wait_expires(self, app):
+        """A request should be shed once its queue wait is exceeded."""
+        release, entered = hold(app)
+        app.admission = AdmissionController(max_in_flight=1, max_queue_wait=0.05)
+
+        thread, _ = in_background(app, "/slow")
+        entered.wait(5)
+
+        response = app.dispatch("GET", "/slow")
+        release.set()
+        thread.join()
+
+        assert response.status == 503
+
+    def test_queue_length_is_capped(self, app):
+        """Requests beyond max_queued should be shed immediately."""
+        release, entered = hold(app)
+        app.admission = AdmissionController(max_in_flight=1, max_queue_wait=5, max_queued=0)
+
+        thread, _ = in_background(app, "/slow")
+        entered.wait(5)
+
+        started = time.monotonic()
+        response = app.dispatch("GET", "/slow")
+        release.set()
+        thread.join()
+
+        assert response.status == 503
+        assert time.monotonic() - started < 1
+
+
+class TestAdaptiveLimit:
+    """Tests for latency-driven limit adjustment."""
+
+    def test_shrinks_when_slow(self):
+        """Latency above target should lower the limit."""
+        controller = AdmissionController(
+            max_in_flight=10, target_latency=0.001, adjust_every=1
+        )
+
+        controller.leave(controller.enter("/x") - 1.0)
+
+        assert controller.limit == 9
+
+    def test_grows_back_when_fast(self):
+        """Latency under target should raise the limit up to the maximum."""
+        controller = AdmissionController(
+            max_in_flight=10, target_latency=1.0, adjust_every=1
+        )
+        controller.limit = 5
+
+        for _ in range(10):
+            controller.leave(controller.enter("/x"))
+
+        assert controller.limit == 10
+
+    def test_never_below_min_limit(self):
+        """The limit should not drop below min_limit."""
+        controller = AdmissionController(
+            max_in_flight=2, target_latency=0.001, adjust_every=1, min_limit=2
+        )
+
+        for _ in range(5):
+            controller.leave(controller.enter("/x") - 1.0)
+
+        assert controller.limit == 2
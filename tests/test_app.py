@@ -0,0 +1,319 @@
+import re
+import sys
+import threading
+
+import pytest
+
+from blank import App, GET, find_route, get_routes
+from blank.testing import Client
+
+
+class TestAppRoutes:
+    """Tests for per-app route tables."""
+
+    def test_registers_on_own_table(self, app):
+        """app.get should not touch the module-level route tables."""
+        @app.get("/users")
+        def get_users():
+            return "users"
+
+        assert "/users" in app.routes["GET"]
+        assert "/users" not in get_routes
+
+    def test_independent_apps_coexist(self):
+        """Two apps can register the same path with different handlers."""
+        first, second = App(), App()
+
+        @first.get("/name")
+        def first_name():
+            return "first"
+
+        @second.get("/name")
+        def second_name():
+            return "second"
+
+        assert first.dispatch("GET", "/name").text == "first"
+        assert second.dispatch("GET", "/name").text == "second"
+
+    def test_client_uses_given_app(self, app):
+        """Client(app) should dispatch to that app only."""
+        @app.post("/users")
+        def create_user():
+            return "created"
+
+        @GET("/users")
+        def get_users():
+            return "global"
+
+        client = Client(app)
+        assert client.post("/users").text == "created"
+        assert client.get("/users").status_code == 405
+
+    def test_static_route_before_dynamic(self, app):
+        """Static paths should win over parameterized ones."""
+        @app.get("/{path}")
+        def catch_all(path):
+            return f"path {path}"
+
+        @app.get("/about")
+        def about():
+            return "about"
+
+        assert app.dispatch("GET", "/about").text == "about"
+        assert app.dispatch("GET", "/contact").text == "path contact"
+
+    def test_allow_covers_overlapping_routes(self, app):
+        """405 and OPTIONS should list the methods of every route matching the path."""
+        app.get("/users/{id}")(lambda id: f"User {id}")
+        app.post("/users/me")(lambda: "updated")
+        app.delete("/{kind}/{id}")(lambda kind, id: "deleted")
+
+        assert app.dispatch("GET", "/users/me").text == "User me"
+        expected = "GET, HEAD, POST, DELETE, OPTIONS"
+        assert app.dispatch("OPTIONS", "/users/me").headers["Allow"] == expected
+        response = app.dispatch("PUT", "/users/me")
+        assert (response.status, response.headers["Allow"]) == (405, expected)
+        assert app.dispatch("PUT", "/users/7").headers["Allow"] == "GET, HEAD, DELETE, OPTIONS"
+
+    def test_registration_after_dispatch_recompiles(self, app):
+        """Routes added after the first request should be served."""
+        app.dispatch("GET", "/late")
+
+        @app.get("/late")
+        def late():
+            return "late"
+
+        assert app.dispatch("GET", "/late").text == "late"
+
+    def test_clearing_routes_recompiles(self, app):
+        """Mutating the route dict directly should drop compiled tables."""
+        @app.get("/gone")
+        def gone():
+            return "gone"
+
+        assert app.dispatch("GET", "/gone").status == 200
+        app.routes["GET"].clear()
+        assert app.dispatch("GET", "/gone").status == 404
+
+
+class TestRegistering:
+    """Tests for batching registrations on a serving app."""
+
+    def test_rebuilds_once_per_block(self, app, monkeypatch):
+        """Registrations inside the block should compile a single new index."""
+        app.dispatch("GET", "/")
+        builds = []
+        build = app._build_table
+        monkeypatch.setattr(app, "_build_table", lambda: builds.append(1) or build())
+
+        with app.registering():
+            for r in range(30):
+                app.get(f"/r{r}/{{id}}")(lambda id, r=r: f"{r}/{id}")
+            assert app.dispatch("GET", "/r0/1").status == 404
+
+        assert len(builds) == 1
+        assert app.dispatch("GET", "/r29/1").text == "29/1"
+
+    def test_nested_blocks(self, app):
+        """Only the outermost block should publish the changes."""
+        app.dispatch("GET", "/")
+
+        with app.registering():
+            with app.registering():
+                app.get("/inner")(lambda: "inner")
+            assert app.dispatch("GET", "/inner").status == 404
+
+        assert app.dispatch("GET", "/inner").text == "inner"
+
+    def test_covers_sub_apps(self, app):
+        """Changes to mounted sub-apps should wait for the parent's block."""
+        api = App()
+        app.mount("/api", api)
+        app.dispatch("GET", "/api/ping")
+
+        with app.registering():
+            api.get("/ping")(lambda: "pong")
+            assert app.dispatch("GET", "/api/ping").status == 404
+
+        assert app.dispatch("GET", "/api/ping").text == "pong"
+
+    def test_publishes_on_error(self, app):
+        """Changes made before an exception should still be published."""
+        app.dispatch("GET", "/")
+
+        with pytest.raises(RuntimeError):
+            with app.registering():
+                app.get("/partial")(lambda: "partial")
+                raise RuntimeError("import failed")
+
+        assert app.dispatch("GET", "/partial").text == "partial"
+
+
+class TestMount:
+    """Tests for prefix-mounted sub-applications."""
+
+    def test_dispatches_with_prefix_stripped(self, app):
+        """Sub-app routes should be reachable under the prefix."""
+        api = App()
+
+        @api.get("/users/{id}")
+        def get_user(id):
+            return f"User {id}"
+
+        app.mount("/api", api)
+
+        assert app.dispatch("GET", "/api/users/42").text == "User 42"
+        assert app.dispatch("GET", "/users/42").status == 404
+
+    def test_prefix_root(self, app):
+        """The bare prefix should map to the sub-app root."""
+        api = App()
+
+        @api.get("/")
+        def index():
+            return "api index"
+
+        app.mount("/api", api)
+
+        assert app.dispatch("GET", "/api").text == "api index"
+        assert app.dispatch("GET", "/api/").text == "api index"
+
+    def test_nested_mounts(self, app):
+        """Deeper prefixes are built by nesting mounts."""
+        api, v1 = App(), App()
+
+        @v1.get("/ping")
+        def ping():
+            return "pong"
+
+        api.mount("/v1", v1)
+        app.mount("/api", api)
+
+        assert app.dispatch("GET", "/api/v1/ping").text == "pong"
+
+    def test_sub_app_table_stays_small(self, app):
+        """Parent and sub-app should compile separate tables."""
+        api = App()
+
+        @app.get("/home")
+        def home():
+            return "home"
+
+        @api.get("/home")
+        def api_home():
+            return "api home"
+
+        app.mount("/api", api)
+
+        assert app.dispatch("GET", "/home").text == "home"
+        assert app.dispatch("GET", "/api/home").text == "api home"
+        assert list(api._table.static) == ["/home"]
+
+    def test_parent_middleware_wraps_sub_app(self, app):
+        """Parent middleware should run around sub-app routes."""
+        api = App()
+        calls = []
+
+        @api.get("/ping")
+        def ping():
+            return "pong"
+
+        def outer(request, call_next):
+            calls.append("outer")
+            return call_next(request)
+
+        def inner(request, call_next):
+            calls.append("inner")
+            return call_next(request)
+
+        app.mount("/api", api)
+        api.use(inner)
+        app.use(outer)
+
+        app.dispatch("GET", "/api/ping")
+        assert calls == ["outer", "inner"]
+
+    def test_rejects_multi_segment_prefix(self, app):
+        """Prefixes must be a single path segment."""
+        with pytest.raises(ValueError):
+            app.mount("/api/v1", App())
+
+    def test_rejects_remount(self, app):
+        """An app can only be mounted once."""
+        api = App()
+        app.mount("/api", api)
+        with pytest.raises(ValueError):
+            App().mount("/other", api)
+
+
+@pytest.fixture
+def busy_switching():
+    """Switch threads as often as possible, to make races likely."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+@pytest.mark.usefixtures("busy_switching")
+class TestConcurrentRegistration:
+    """Tests for registering routes while requests are being dispatched."""
+
+    def test_register_while_dispatching(self, app):
+        """Readers should never fail, lose a route or see routes out of order."""
+        app.get("/base")(lambda: "base")
+        app.dispatch("GET", "/base")
+        count = 100
+        registered = threading.Event()
+        errors = []
+
+        def read():
+            try:
+                while not registered.is_set():
+                    assert app.dispatch("GET", "/base").status == 200
+                    seen = [
+                        app.dispatch("GET", f"/r{i}/x").status
+                        for i in reversed(range(0, count, 10))
+                    ]
+                    # Newest route first: once one is found, every older one must be too.
+                    assert seen == sorted(seen, reverse=True)
+            except Exception as e:
+                errors.append(e)
+
+        readers = [threading.Thread(target=read) for _ in range(8)]
+        for reader in readers:
+            reader.start()
+        for i in range(count):
+            app.get(f"/r{i}/{{name}}")(lambda name, i=i: f"{i} {name}")
+            app.get(f"/static{i}")(lambda i=i: str(i))
+        registered.set()
+        for reader in readers:
+            reader.join()
+
+        assert errors == []
+        assert app.dispatch("GET", f"/r{count - 1}/x").text == f"{count - 1} x"
+        assert all(app.dispatch("GET", f"/static{i}").status == 200 for i in range(count))
+
+    def test_find_route_while_registering(self, app):
+        """find_route should not fail while the dict it scans grows."""
+        routes = app.routes["GET"]
+        app.get("/users/{id}")(lambda id: id)
+        done = threading.Event()
+        errors = []
+
+        def read():
+            try:
+                while not done.is_set():
+                    assert find_route(routes, "/users/1")[1] == {"id": 1}
+            except Exception as e:
+                errors.append(e)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for i in range(2000):
+            routes[f"/p{i}"] = (lambda: "p", re.compile(f"^/p{i}$"))
+        done.set()
+        for reader in readers:
+            reader.join()
+        assert errors == []
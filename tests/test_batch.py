@@ -0,0 +1,239 @@
+import http.client
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from blank import Broadcaster, RateLimiter, Response, Router, SelectorServer
+from blank.testing import Client
+
+
+@pytest.fixture
+def batch_app(app):
+    """App with a few routes and a sequential batch endpoint."""
+    @app.get("/users/{id}")
+    def user(id):
+        return f"User {id}"
+
+    @app.post("/echo")
+    def echo(request):
+        language = request.headers.get("Accept-Language", "")
+        return Response(request.body.decode(), headers={"X-Lang": language})
+
+    @app.get("/fail")
+    def fail():
+        raise RuntimeError("boom")
+
+    app.batch("/batch", max_items=5, timeout=1.0)
+    return app
+
+
+class TestRequestBody:
+    """Tests for request bodies reaching handlers."""
+
+    def test_body_and_json(self, app):
+        """Handlers should see the raw body and its parsed JSON."""
+        @app.post("/items")
+        def create(request):
+            return f"{request.body!r} {request.json()['name']}"
+
+        response = Client(app).post("/items", json={"name": "ada"})
+        assert response.text == "b'{\"name\": \"ada\"}' ada"
+
+    def test_router_reads_content_length(self, app):
+        """Router should read the body announced by Content-Length."""
+        app.post("/len")(lambda request: str(len(request.body)))
+        app.get("/hello")(lambda: "hello")
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Router)
+        server.app = app
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            conn = http.client.HTTPConnection(*server.server_address)
+            conn.request("POST", "/len", body=b"x" * 300)
+            assert conn.getresponse().read() == b"300"
+            conn.request("GET", "/hello")
+            assert conn.getresponse().read() == b"hello"
+            conn.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestBatch:
+    """Tests for running sub-requests through a batch endpoint."""
+
+    def test_results_in_order(self, batch_app):
+        """Each entry should get its own status and body, in order."""
+        response = Client(batch_app).post("/batch", json=[
+            {"path": "/users/1"},
+            {"method": "GET", "path": "/users/2"},
+            {"path": "/missing"},
+            {"method": "POST", "path": "/echo", "body": "hi"},
+        ])
+
+        assert response.status_code == 200
+        assert response.headers["Content-Type"] == "application/json"
+        results = response.json()
+        assert [r["status"] for r in results] == [200, 200, 404, 200]
+        assert results[0]["body"] == "User 1"
+        assert results[3]["body"] == "hi"
+
+    def test_headers_are_merged(self, batch_app):
+        """Entries should inherit the batch headers and may override them."""
+        response = Client(batch_app).post(
+            "/batch",
+            headers={"Accept-Language": "en"},
+            json=[
+                {"method": "POST", "path": "/echo"},
+                {"method": "POST", "path": "/echo", "headers": {"Accept-Language": "fr"}},
+            ],
+        )
+        assert [r["headers"]["X-Lang"] for r in response.json()] == ["en", "fr"]
+
+    def test_handler_error_is_per_item(self, batch_app):
+        """A failing entry should not fail the batch."""
+        results = Client(batch_app).post(
+            "/batch", json=[{"path": "/fail"}, {"path": "/users/3"}]
+        ).json()
+        assert [r["status"] for r in results] == [500, 200]
+
+    def test_invalid_body(self, batch_app):
+        """A body that is not a JSON list should be answered 400."""
+        client = Client(batch_app)
+        assert client.post("/batch", body="not json").status_code == 400
+        assert client.post("/batch", json={"path": "/users/1"}).status_code == 400
+
+    def test_invalid_entries(self, batch_app):
+        """Malformed and nested entries should be answered 400 individually."""
+        results = Client(batch_app).post("/batch", json=[
+            {"method": "GET"},
+            "users",
+            {"path": "users/1"},
+            {"method": "POST", "path": "/batch"},
+            {"path": "//[oops"},
+        ]).json()
+        assert [r["status"] for r in results] == [400, 400, 400, 400, 400]
+
+    def test_invalid_headers_and_body(self, batch_app):
+        """Headers that are not an object or a body that is not a string fail only their entry."""
+        results = Client(batch_app).post("/batch", json=[
+            {"method": "POST", "path": "/echo", "body": {"name": "x"}},
+            {"method": "POST", "path": "/echo", "headers": ["Accept-Language", "de"]},
+            {"method": "POST", "path": "/echo", "body": "ok", "headers": None},
+        ]).json()
+        assert [r["status"] for r in results] == [400, 400, 200]
+        assert results[0]["body"] == "Body must be a string"
+        assert results[1]["body"] == "Headers must be an object"
+        assert results[2]["body"] == "ok"
+
+    def test_too_many_items(self, batch_app):
+        """Batches above max_items should be answered 413."""
+        response = Client(batch_app).post("/batch", json=[{"path": "/users/1"}] * 6)
+        assert response.status_code == 413
+
+    def test_event_streams_are_rejected(self, app):
+        """SSE routes cannot be part of a batch."""
+        updates = Broadcaster(heartbeat=None)
+        app.sse("/events")(lambda: updates)
+        app.batch()
+
+        results = Client(app).post("/batch", json=[{"path": "/events"}]).json()
+        assert results[0]["status"] == 400
+        assert updates.stats()["subscribed"] == 0
+
+    def test_sub_requests_count_against_rate_limit(self, batch_app):
+        """Every entry should take a token, after the batch request itself."""
+        batch_app.rate_limiter = RateLimiter(rate=0.001, burst=2)
+        results = Client(batch_app).post(
+            "/batch", json=[{"path": "/users/1"}, {"path": "/users/2"}]
+        ).json()
+        assert [r["status"] for r in results] == [200, 429]
+
+    def test_background_tasks_run(self, app):
+        """Tasks scheduled by entries should run after the batch response."""
+        calls = []
+
+        @app.post("/signup")
+        def signup(request):
+            request.add_task(calls.append, "welcome")
+            return "ok"
+
+        app.batch()
+        Client(app).post("/batch", json=[{"method": "POST", "path": "/signup"}] * 2)
+        assert calls == ["welcome", "welcome"]
+
+    def test_stats(self, batch_app):
+        """stats() should count batches and items."""
+        handler = batch_app.batch("/b")
+        Client(batch_app).post("/b", json=[{"path": "/users/1"}, {"path": "/users/2"}])
+        assert handler.stats() == {"batches": 1, "items": 2, "timeouts": 0}
+
+
+class TestBatchLimits:
+    """Tests for the batch time limit and parallel execution."""
+
+    def test_sequential_timeout(self, app):
+        """Entries not started before the deadline should be answered 504."""
+        app.get("/slow")(lambda: time.sleep(0.15) or "done")
+        handler = app.batch(timeout=0.1)
+
+        results = Client(app).post("/batch", json=[{"path": "/slow"}] * 3).json()
+        assert [r["status"] for r in results] == [200, 504, 504]
+        assert handler.stats()["timeouts"] == 2
+
+    def test_parallel(self, app):
+        """With workers, entries should run concurrently."""
+        barrier = threading.Barrier(3, timeout=2)
+
+        @app.get("/wait/{n}")
+        def wait(n):
+            barrier.wait()
+            return str(n)
+
+        handler = app.batch(workers=3)
+        try:
+            results = Client(app).post(
+                "/batch", json=[{"path": f"/wait/{n}"} for n in range(3)]
+            ).json()
+        finally:
+            handler.shutdown()
+        assert [r["body"] for r in results] == ["0", "1", "2"]
+
+    def test_parallel_timeout(self, app):
+        """Parallel entries still running at the deadline should be answered 504."""
+        release = threading.Event()
+        app.get("/fast")(lambda: "fast")
+        app.get("/stuck")(lambda: release.wait(2) and "late")
+        handler = app.batch(timeout=0.1, workers=2)
+
+        started = time.monotonic()
+        try:
+            results = Client(app).post(
+                "/batch", json=[{"path": "/fast"}, {"path": "/stuck"}]
+            ).json()
+        finally:
+            release.set()
+            handler.shutdown()
+        assert time.monotonic() - started < 1
+        assert [r["status"] for r in results] == [200, 504]
+
+    def test_over_selector_server(self, batch_app):
+        """The batch endpoint should work over a real connection."""
+        server = SelectorServer(("127.0.0.1", 0), app=batch_app)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        try:
+            conn = http.client.HTTPConnection(*server.server_address)
+            body = json.dumps([{"path": "/users/7"}, {"path": "/nope"}])
+            conn.request("POST", "/batch", body=body, headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            results = json.loads(response.read())
+            conn.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert response.status == 200
+        assert [r["status"] for r in results] == [200, 404]
+        assert results[0]["body"] == "User 7"
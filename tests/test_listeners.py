@@ -0,0 +1,193 @@
+import http.client
+import os
+import socket
+import stat
+import threading
+
+import pytest
+
+from blank import (
+    App,
+    Router,
+    SelectorServer,
+    SocketHTTPServer,
+    UnixHTTPServer,
+    bind_unix,
+    listen_fds,
+)
+from blank.core import listeners
+from blank.core.listeners import from_fd
+from blank.testing import Client, UnixHTTPConnection
+
+
+@pytest.fixture
+def uds_app():
+    """App reporting the client address it sees."""
+    app = App()
+    app.get("/client")(lambda request: repr(request.client))
+    return app
+
+
+@pytest.fixture
+def sock_path(tmp_path):
+    """Short socket path (Unix socket paths are limited to ~100 bytes)."""
+    return str(tmp_path / "s.sock")
+
+
+def fetch(conn, path="/client"):
+    conn.request("GET", path)
+    response = conn.getresponse()
+    return response.status, response.read()
+
+
+class TestBindUnix:
+    """Tests for creating Unix domain listening sockets."""
+
+    def test_mode(self, sock_path):
+        """The socket file should get the requested permissions."""
+        sock = bind_unix(sock_path, mode=0o600)
+        try:
+            info = os.stat(sock_path)
+            assert stat.S_ISSOCK(info.st_mode)
+            assert stat.S_IMODE(info.st_mode) == 0o600
+        finally:
+            listeners.close_listener(sock)
+        assert not os.path.exists(sock_path)
+
+    def test_replaces_stale_socket(self, sock_path):
+        """A socket file left behind by a dead process should be replaced."""
+        stale = bind_unix(sock_path)
+        stale.close()
+        assert os.path.exists(sock_path)
+
+        sock = bind_unix(sock_path)
+        listeners.close_listener(sock)
+
+    def test_refuses_other_files(self, sock_path):
+        """An existing regular file should not be deleted."""
+        with open(sock_path, "w") as f:
+            f.write("data")
+        with pytest.raises(FileExistsError):
+            bind_unix(sock_path)
+        assert os.path.exists(sock_path)
+
+
+class TestSelectorServerUnix:
+    """Tests for SelectorServer on Unix domain sockets."""
+
+    def test_serves_on_path(self, uds_app, sock_path):
+        """Binding a path should serve over a Unix socket without a client address."""
+        server = SelectorServer(sock_path, uds_app)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        try:
+            assert server.server_address == sock_path
+            assert server.server_port == 0
+            conn = UnixHTTPConnection(sock_path, timeout=5)
+            assert fetch(conn) == (200, b"None")
+            assert fetch(conn) == (200, b"None")
+            conn.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert not os.path.exists(sock_path)
+
+    def test_adopted_socket_is_kept(self, uds_app, sock_path):
+        """A socket passed in should be left open (and its file in place)."""
+        sock = bind_unix(sock_path)
+        server = SelectorServer(app=uds_app, sock=sock)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        try:
+            assert fetch(UnixHTTPConnection(sock_path, timeout=5))[0] == 200
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert os.path.exists(sock_path)
+        listeners.close_listener(sock)
+
+
+class TestRouterUnix:
+    """Tests for Router on Unix domain sockets and inherited sockets."""
+
+    def test_unix_http_server(self, uds_app, sock_path):
+        """Router should serve over UnixHTTPServer."""
+        server = UnixHTTPServer(sock_path, Router, mode=0o600)
+        server.app = uds_app
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            assert stat.S_IMODE(os.stat(sock_path).st_mode) == 0o600
+            conn = UnixHTTPConnection(sock_path, timeout=5)
+            assert fetch(conn) == (200, b"None")
+            conn.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert not os.path.exists(sock_path)
+
+    def test_socket_http_server(self, uds_app):
+        """Router should serve on an inherited TCP socket."""
+        listener = socket.create_server(("127.0.0.1", 0))
+        sock = from_fd(os.dup(listener.fileno()))
+        listener.close()
+
+        server = SocketHTTPServer(sock, Router)
+        server.app = uds_app
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            conn = http.client.HTTPConnection(*sock.getsockname(), timeout=5)
+            assert fetch(conn) == (200, b"'127.0.0.1'")
+            conn.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class TestInheritedSockets:
+    """Tests for adopting sockets passed by a supervisor."""
+
+    def test_listen_fds(self, uds_app, sock_path, monkeypatch):
+        """LISTEN_FDS sockets should be adopted and the variables removed."""
+        listener = bind_unix(sock_path)
+        fd = os.dup(listener.fileno())
+        listener.close()
+        monkeypatch.setattr(listeners, "LISTEN_FDS_START", fd)
+        monkeypatch.setenv("LISTEN_PID", str(os.getpid()))
+        monkeypatch.setenv("LISTEN_FDS", "1")
+
+        sockets = listen_fds()
+        assert [s.fileno() for s in sockets] == [fd]
+        assert "LISTEN_FDS" not in os.environ and "LISTEN_PID" not in os.environ
+
+        server = SelectorServer(app=uds_app, sock=sockets[0])
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        try:
+            assert fetch(UnixHTTPConnection(sock_path, timeout=5)) == (200, b"None")
+        finally:
+            server.shutdown()
+            server.server_close()
+            listeners.close_listener(sockets[0])
+
+    def test_other_process(self, monkeypatch):
+        """Sockets meant for another process should be ignored."""
+        monkeypatch.setenv("LISTEN_PID", str(os.getpid() + 1))
+        monkeypatch.setenv("LISTEN_FDS", "1")
+        assert listen_fds() == []
+        assert "LISTEN_FDS" not in os.environ
+
+    def test_not_listening(self):
+        """A descriptor that is not a listening socket should be refused."""
+        left, right = socket.socketpair()
+        try:
+            with pytest.raises(ValueError):
+                from_fd(left.fileno())
+            assert left.fileno() != -1
+        finally:
+            left.close()
+            right.close()
+
+
+class TestClientWithoutAddress:
+    """Tests for the test client mimicking Unix socket requests."""
+
+    def test_no_remote_addr(self, uds_app):
+        """remote_addr=None should reach handlers as a missing client address."""
+        assert Client(uds_app, remote_addr=None).get("/client").text == "None"
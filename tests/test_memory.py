@@ -0,0 +1,203 @@
+import http.client
+import io
+import os
+import signal
+import threading
+import time
+import tracemalloc
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from blank import App, MemoryProfiler, Router
+from blank.testing import Client
+
+
+@pytest.fixture
+def profiled():
+    """App with a memory profiler measuring every request."""
+    app = App()
+    app.memory = MemoryProfiler(sample_rate=1.0, checkpoint_every=1, window=3, min_growth=10000)
+    yield app
+    app.memory.stop()
+
+
+class TestAllocations:
+    """Tests for per-route allocation accounting."""
+
+    def test_counts_by_route_pattern(self, profiled):
+        """Requests should be grouped by method and path pattern."""
+        profiled.get("/users/{id}")(lambda id: f"User {id}")
+        client = Client(profiled)
+        for i in range(3):
+            client.get(f"/users/{i}")
+
+        (route,) = profiled.memory.report()["routes"]
+        assert route["route"] == "GET /users/{id}"
+        assert route["calls"] == route["sampled"] == 3
+
+    def test_mounted_routes_keep_their_prefix(self, profiled):
+        """The same pattern under two mounts should be counted as two routes."""
+        for prefix in ("/v1", "/v2"):
+            api = App()
+            api.get("/users/{id}")(lambda id: f"User {id}")
+            profiled.mount(prefix, api)
+        client = Client(profiled)
+        client.get("/v1/users/1")
+        client.get("/v2/users/2")
+        client.get("/v2/users/3")
+
+        routes = {item["route"]: item["calls"] for item in profiled.memory.report()["routes"]}
+        assert routes == {"GET /v1/users/{id}": 1, "GET /v2/users/{id}": 2}
+
+    def test_attributes_lines(self, profiled):
+        """Allocations kept by a handler should be charged to its source line."""
+        kept = []
+
+        @profiled.get("/alloc")
+        def alloc():
+            kept.append(bytearray(200000))
+            return "ok"
+
+        Client(profiled).get("/alloc")
+
+        report = profiled.memory.report()
+        route = report["routes"][0]
+        assert route["allocated_bytes"] >= 200000
+        assert route["top_lines"][0]["line"].startswith(__file__)
+        assert report["lines"][0]["bytes"] >= 200000
+
+    def test_top_routes_sorted(self, profiled):
+        """Routes should be listed by allocated bytes, largest first."""
+        kept = []
+        profiled.get("/small")(lambda: kept.append(bytearray(1000)) or "ok")
+        profiled.get("/large")(lambda: kept.append(bytearray(100000)) or "ok")
+        client = Client(profiled)
+        client.get("/small")
+        client.get("/large")
+
+        routes = [item["route"] for item in profiled.memory.report()["routes"]]
+        assert routes == ["GET /large", "GET /small"]
+
+    def test_unsampled_requests_are_only_counted(self):
+        """With sample_rate 0 no snapshots should be taken."""
+        app = App()
+        app.memory = MemoryProfiler(sample_rate=0.0)
+        try:
+            app.get("/x")(lambda: "x")
+            Client(app).get("/x")
+            route = app.memory.report()["routes"][0]
+            assert (route["calls"], route["sampled"], route["allocated_bytes"]) == (1, 0, 0)
+        finally:
+            app.memory.stop()
+
+    def test_sampled_handlers_run_concurrently(self, profiled):
+        """Measuring a request should not hold other sampled requests back."""
+        barrier = threading.Barrier(2, timeout=2)
+
+        @profiled.get("/meet")
+        def meet():
+            barrier.wait()
+            return "met"
+
+        client = Client(profiled)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(client.get("/meet").status_code))
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert results == [200, 200]
+        assert profiled.memory.report()["routes"][0]["sampled"] == 2
+
+    def test_router(self, profiled):
+        """Requests served by Router should be profiled too."""
+        profiled.get("/hello")(lambda: "hello")
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Router)
+        server.app = profiled
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            conn = http.client.HTTPConnection(*server.server_address)
+            conn.request("GET", "/hello")
+            assert conn.getresponse().read() == b"hello"
+            conn.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert profiled.memory.report()["routes"][0]["calls"] == 1
+
+
+class TestGrowth:
+    """Tests for detecting routes whose retained memory keeps growing."""
+
+    def test_detects_leak(self, profiled):
+        """A route keeping data on every call should be reported; a clean one not."""
+        leak = []
+        profiled.get("/leak")(lambda: leak.append(bytearray(20000)) or "ok")
+        profiled.get("/clean")(lambda: len(bytearray(20000)) and "ok")
+        client = Client(profiled)
+        for _ in range(6):
+            client.get("/leak")
+            client.get("/clean")
+
+        growing = profiled.memory.growing()
+        assert list(growing) == ["GET /leak"]
+        assert growing["GET /leak"] >= 20000
+
+    def test_needs_full_window(self, profiled):
+        """Growth should not be reported before window checkpoints exist."""
+        leak = []
+        profiled.get("/leak")(lambda: leak.append(bytearray(20000)) or "ok")
+        Client(profiled).get("/leak")
+        assert profiled.memory.growing() == {}
+
+
+class TestReporting:
+    """Tests for getting reports on demand."""
+
+    def test_endpoint(self, profiled):
+        """The endpoint should answer with the report as JSON."""
+        profiled.get("/hello")(lambda: "hello")
+        profiled.get("/_memory")(profiled.memory.endpoint)
+        client = Client(profiled)
+        client.get("/hello")
+
+        report = client.get("/_memory?limit=5").json()
+        assert "GET /hello" in [item["route"] for item in report["routes"]]
+        assert report["traced"]["current"] > 0
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="needs SIGUSR1")
+    def test_signal(self, profiled):
+        """The signal handler should write the text report."""
+        profiled.get("/hello")(lambda: "hello")
+        Client(profiled).get("/hello")
+        stream = io.StringIO()
+        previous = signal.getsignal(signal.SIGUSR1)
+        try:
+            profiled.memory.install_signal_handler(stream=stream)
+            os.kill(os.getpid(), signal.SIGUSR1)
+            deadline = time.monotonic() + 5
+            while "GET /hello" not in stream.getvalue() and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            signal.signal(signal.SIGUSR1, previous)
+        assert "top routes" in stream.getvalue()
+        assert "GET /hello" in stream.getvalue()
+
+    def test_stop(self):
+        """stop() should end tracing only if the profiler started it."""
+        profiler = MemoryProfiler()
+        assert tracemalloc.is_tracing()
+        profiler.stop()
+        assert not tracemalloc.is_tracing()
+
+    def test_reset(self, profiled):
+        """reset() should forget all routes."""
+        profiled.get("/hello")(lambda: "hello")
+        Client(profiled).get("/hello")
+        profiled.memory.reset()
+        assert profiled.memory.report()["routes"] == []
@@ -0,0 +1,215 @@
+from blank import GET, POST, Response, default_app, use
+from blank.core.middleware import compose, endpoint
+from blank.decorators import UseMiddleware
+
+
+def tag(name, calls):
+    """Build a middleware that records entry/exit order in calls."""
+    def mw(request, call_next):
+        calls.append(f"{name}:in")
+        response = call_next(request)
+        calls.append(f"{name}:out")
+        return response
+    return mw
+
+
+class TestGlobalMiddleware:
+    """Tests for use()."""
+
+    def test_registers_middleware(self):
+        """use() should append to the global middleware stack."""
+        def mw(request, call_next):
+            return call_next(request)
+
+        use(mw)
+        assert default_app.middleware == [mw]
+
+    def test_runs_around_handler(self, client):
+        """Middleware should run before and after the handler."""
+        calls = []
+
+        @GET("/hello")
+        def hello():
+            calls.append("handler")
+            return "Hello"
+
+        use(tag("outer", calls), tag("inner", calls))
+
+        response = client.get("/hello")
+        assert response.text == "Hello"
+        assert calls == ["outer:in", "inner:in", "handler", "inner:out", "outer:out"]
+
+    def test_can_modify_response_headers(self, client):
+        """Middleware should be able to add response headers."""
+        @GET("/hello")
+        def hello():
+            return "Hello"
+
+        def cors(request, call_next):
+            response = call_next(request)
+            response.headers["Access-Control-Allow-Origin"] = "*"
+            return response
+
+        use(cors)
+
+        response = client.get("/hello")
+        assert response.headers["Access-Control-Allow-Origin"] == "*"
+
+    def test_can_short_circuit(self, client):
+        """Middleware returning without call_next should skip the handler."""
+        @POST("/admin")
+        def admin():
+            raise AssertionError("handler should not run")
+
+        def deny(request, call_next):
+            return Response("Unauthorized", status=401)
+
+        use(deny)
+
+        response = client.post("/admin")
+        assert response.status_code == 401
+        assert response.text == "Unauthorized"
+
+    def test_sees_request(self, client):
+        """Middleware should see method, path, params and headers."""
+        seen = {}
+
+        @GET("/users/{id}")
+        def get_user(id):
+            return f"User {id}"
+
+        def inspect(request, call_next):
+            seen.update(
+                method=request.method,
+                path=request.path,
+                params=dict(request.params),
+                token=request.headers.get("X-Token"),
+            )
+            return call_next(request)
+
+        use(inspect)
+
+        client.get("/users/42?active=true", headers={"X-Token": "abc"})
+        assert seen == {
+            "method": "GET",
+            "path": "/users/42",
+            "params": {"id": 42, "active": True},
+            "token": "abc",
+        }
+
+    def test_use_after_first_request_recompiles(self, client):
+        """Middleware registered later should apply to already-compiled routes."""
+        calls = []
+
+        @GET("/hello")
+        def hello():
+            return "Hello"
+
+        client.get("/hello")
+        use(tag("late", calls))
+        client.get("/hello")
+
+        assert calls == ["late:in", "late:out"]
+
+
+class TestRouteMiddleware:
+    """Tests for @UseMiddleware."""
+
+    def test_runs_only_for_decorated_route(self, client):
+        """Route middleware should not affect other routes."""
+        calls = []
+
+        @GET("/a")
+        @UseMiddleware(tag("a", calls))
+        def a():
+            return "a"
+
+        @GET("/b")
+        def b():
+            return "b"
+
+        client.get("/b")
+        assert calls == []
+        client.get("/a")
+        assert calls == ["a:in", "a:out"]
+
+    def test_runs_inside_global_middleware(self, client):
+        """Global middleware should wrap route middleware."""
+        calls = []
+
+        @GET("/a")
+        @UseMiddleware(tag("route", calls))
+        def a():
+            return "a"
+
+        use(tag("global", calls))
+
+        client.get("/a")
+        assert calls == ["global:in", "route:in", "route:out", "global:out"]
+
+    def test_decorator_order_independent(self, client):
+        """@UseMiddleware should work above the route decorator too."""
+        calls = []
+
+        @UseMiddleware(tag("route", calls))
+        @GET("/a")
+        def a():
+            return "a"
+
+        client.get("/a")
+        assert calls == ["route:in", "route:out"]
+
+    def test_above_route_on_serving_app(self, app):
+        """A route added above the decorator on a serving app should get its middleware."""
+        def deny(request, call_next):
+            return Response("Forbidden", status=403)
+
+        app.dispatch("GET", "/")
+
+        @UseMiddleware(deny)
+        @app.get("/admin")
+        def admin():
+            return "secret"
+
+        response = app.dispatch("GET", "/admin")
+        assert (response.status, response.text) == (403, "Forbidden")
+
+
+class TestCompiledChain:
+    """Tests for chain composition."""
+
+    def test_chain_is_built_once(self, app):
+        """Routes should be composed at compile time, not per request."""
+        def mw(request, call_next):
+            return call_next(request)
+
+        @app.get("/a")
+        def a():
+            return "a"
+
+        app.use(mw)
+        table = app._compile()
+        chain, _, _ = table.match("/a", "GET")
+
+        assert chain.func is mw
+        app.dispatch("GET", "/a")
+        app.dispatch("GET", "/a")
+        assert app._table is table
+
+    def test_bare_handler_has_no_layers(self):
+        """Without middleware the chain is the bare endpoint."""
+        def handler():
+            return "ok"
+
+        bare = endpoint(handler)
+        assert compose(bare, ()) is bare
+
+    def test_handler_may_return_response(self, client):
+        """Handlers returning a Response should keep its status and headers."""
+        @POST("/users")
+        def create_user():
+            return Response("Created", status=201, headers={"Location": "/users/1"})
+
+        response = client.post("/users")
+        assert response.status_code == 201
+        assert response.headers["Location"] == "/users/1"
@@ -0,0 +1,178 @@
+import os
+import threading
+import time
+
+import pytest
+
+from blank import App, ProcessPool, Response
+from blank.testing import Client
+
+
+def fib(n):
+    n = int(n)
+    return str(n if n < 2 else int(fib(n - 1)) + int(fib(n - 2)))
+
+
+def pid():
+    return str(os.getpid())
+
+
+def created(name):
+    return Response(name, status=201, headers={"Location": f"/items/{name}"})
+
+
+def sleepy(seconds):
+    time.sleep(float(seconds))
+    return "done"
+
+
+def broken():
+    raise ValueError("bad input")
+
+
+@pytest.fixture
+def pool_app():
+    """App with a single-worker process pool, shut down after the test."""
+    app = App()
+    app.processes = ProcessPool(workers=1, max_pending=2)
+    yield app
+    app.processes.shutdown()
+
+
+class TestProcessRoutes:
+    """Tests for routes registered with executor='process'."""
+
+    def test_runs_in_worker_process(self, pool_app):
+        """The handler should run outside the serving process."""
+        pool_app.get("/pid", executor="process")(pid)
+        pool_app.get("/inline-pid")(pid)
+        client = Client(pool_app)
+
+        assert client.get("/pid").text != str(os.getpid())
+        assert client.get("/inline-pid").text == str(os.getpid())
+
+    def test_params_and_result(self, pool_app):
+        """Path and query parameters should reach the worker."""
+        pool_app.get("/fib/{n}", executor="process")(fib)
+
+        assert Client(pool_app).get("/fib/15").text == "610"
+
+    def test_pool_is_reused(self, pool_app):
+        """Consecutive calls should be served by the same worker."""
+        pool_app.get("/pid", executor="process")(pid)
+        client = Client(pool_app)
+
+        assert len({client.get("/pid").text for _ in range(3)}) == 1
+        assert pool_app.processes.stats()["completed"] == 3
+
+    def test_response_round_trip(self, pool_app):
+        """Status and headers of a returned Response should be kept."""
+        pool_app.post("/items/{name}", executor="process")(created)
+
+        response = Client(pool_app).post("/items/box")
+
+        assert response.status_code == 201
+        assert response.headers["Location"] == "/items/box"
+
+    def test_handler_error_is_500(self, pool_app):
+        """Exceptions in the worker should become a 500."""
+        pool_app.get("/broken", executor="process")(broken)
+
+        response = Client(pool_app).get("/broken")
+
+        assert response.status_code == 500
+        assert "bad input" in response.text
+        assert pool_app.processes.stats()["failed"] == 1
+
+    def test_middleware_runs_inline(self, pool_app):
+        """App middleware should still wrap offloaded handlers."""
+        def tag(request, call_next):
+            response = call_next(request)
+            response.headers["X-Served-By"] = str(os.getpid())
+            return response
+
+        pool_app.use(tag)
+        pool_app.get("/pid", executor="process")(pid)
+
+        response = Client(pool_app).get("/pid")
+        assert response.headers["X-Served-By"] == str(os.getpid())
+        assert response.text != str(os.getpid())
+
+
+class TestLimits:
+    """Tests for per-route timeouts and the concurrency cap."""
+
+    def test_timeout_is_504(self, pool_app):
+        """A call exceeding its route timeout should get a 504."""
+        pool_app.get("/sleep/{seconds}", executor="process", timeout=0.2)(sleepy)
+        pool_app.get("/pid", executor="process")(pid)
+        client = Client(pool_app)
+        client.get("/pid")
+
+        response = client.get("/sleep/1")
+
+        assert response.status_code == 504
+        assert pool_app.processes.stats()["timeouts"] == 1
+
+    def test_limit_responses_not_shared(self, pool_app):
+        """Middleware changes to a 504 should not reach the pool's template or later calls."""
+        pool_app.get("/sleep/{seconds}", executor="process", timeout=0.2)(sleepy)
+        counter = iter(range(100))
+
+        def tag(request, call_next):
+            response = call_next(request)
+            response.headers[f"X-Req-{next(counter)}"] = "yes"
+            return response
+
+        pool_app.use(tag)
+        client = Client(pool_app)
+
+        first, second = client.get("/sleep/1"), client.get("/sleep/1")
+
+        assert "X-Req-0" in first.headers and "X-Req-0" not in second.headers
+        assert not any(name.startswith("X-Req-") for name in pool_app.processes.timed_out.headers)
+
+    def test_saturated_pool_is_503(self, pool_app):
+        """Calls beyond max_pending should be rejected immediately."""
+        pool_app.get("/sleep/{seconds}", executor="process")(sleepy)
+        client = Client(pool_app)
+        client.get("/sleep/0")
+
+        threads = [
+            threading.Thread(target=client.get, args=("/sleep/0.5",)) for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+
+        response = client.get("/sleep/0")
+        for thread in threads:
+            thread.join()
+
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
+        assert pool_app.processes.stats()["rejected"] == 1
+
+
+class TestRegistration:
+    """Tests for the executor registration option."""
+
+    def test_unknown_executor(self, app):
+        """Unknown executors should be rejected at registration."""
+        with pytest.raises(ValueError):
+            app.get("/x", executor="gpu")
+
+    def test_request_handlers_rejected(self, app):
+        """Handlers taking the request cannot run in a process."""
+        def handler(request):
+            return "x"
+
+        with pytest.raises(ValueError):
+            app.get("/x", executor="process")(handler)
+
+    def test_pool_created_lazily(self, app):
+        """Inline routes should never start worker processes."""
+        app.get("/fib/{n}")(fib)
+
+        assert Client(app).get("/fib/10").text == "55"
+        assert app.processes._executor is None
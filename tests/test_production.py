@@ -0,0 +1,158 @@
+import http.client
+import re
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from blank import App, Router, Tracer
+from blank.common.parsing import URLParser
+from blank.core.http import StaticResponse
+from blank.testing import Client
+
+
+@pytest.fixture
+def production():
+    """App in production mode."""
+    return App(production=True)
+
+
+def serve(app, requests):
+    """Send each GET request through Router on a fresh connection."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Router)
+    server.app = app
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        for path in requests:
+            conn = http.client.HTTPConnection(*server.server_address)
+            conn.request("GET", path)
+            conn.getresponse().read()
+            conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class TestMode:
+    """Tests for selecting production mode."""
+
+    def test_debug_by_default(self, monkeypatch):
+        """Without the flag or BLANK_ENV the app should run in debug mode."""
+        monkeypatch.delenv("BLANK_ENV", raising=False)
+        assert App().production is False
+
+    def test_environment(self, monkeypatch):
+        """BLANK_ENV=production should select production mode."""
+        monkeypatch.setenv("BLANK_ENV", "Production")
+        assert App().production is True
+        assert App(production=False).production is False
+
+    def test_reset(self, monkeypatch, production):
+        """reset() should go back to the mode BLANK_ENV selects."""
+        monkeypatch.delenv("BLANK_ENV", raising=False)
+        production.reset()
+        assert production.production is False
+
+
+class TestErrors:
+    """Tests for 500 responses."""
+
+    def test_debug_body(self, app):
+        """Debug mode should show the exception in the body."""
+        @app.get("/fail")
+        def fail():
+            raise RuntimeError("secret detail")
+
+        response = Client(app).get("/fail")
+        assert response.status_code == 500
+        assert response.text == "Internal Server Error: secret detail"
+
+    def test_static_body(self, production, capsys):
+        """Production should answer with a fixed body and print the traceback."""
+        production.log_sample_rate = 1.0
+
+        @production.get("/fail")
+        def fail():
+            raise RuntimeError("secret detail")
+
+        response = production.dispatch("GET", "/fail")
+
+        assert isinstance(response, StaticResponse)
+        assert response.status == 500
+        assert "secret" not in response.body
+        assert production.dispatch("GET", "/fail") is response
+        err = capsys.readouterr().err
+        assert "Traceback" in err and "RuntimeError: secret detail" in err
+
+    def test_traced(self, production, capsys):
+        """The traced dispatch path should use the same static body."""
+        production.log_sample_rate = 1.0
+        production.tracer = Tracer()
+        production.get("/fail")(lambda: 1 / 0)
+
+        response = Client(production).get("/fail")
+        assert response.status_code == 500
+        assert "division" not in response.text
+        assert "ZeroDivisionError" in capsys.readouterr().err
+
+    def test_tracebacks_sampled(self, production, capsys):
+        """Only a log_sample_rate fraction of failures should print a traceback."""
+        production.log_sample_rate = 0.0
+        production.get("/fail")(lambda: 1 / 0)
+
+        for _ in range(3):
+            assert production.dispatch("GET", "/fail").status == 500
+        assert capsys.readouterr().err == ""
+
+
+class TestLogging:
+    """Tests for Router request logging."""
+
+    def test_debug_logs_every_request(self, app, capsys):
+        """Debug mode should log each request."""
+        app.get("/hello")(lambda: "hello")
+        serve(app, ["/hello"] * 3)
+        assert len(re.findall(r"GET /hello", capsys.readouterr().out)) == 3
+
+    def test_production_samples(self, production, capsys):
+        """Production should log only the sampled fraction of requests."""
+        production.get("/hello")(lambda: "hello")
+        production.log_sample_rate = 0.0
+        serve(production, ["/hello"] * 3)
+        assert capsys.readouterr().out == ""
+
+        production.log_sample_rate = 1.0
+        serve(production, ["/hello"])
+        assert "GET /hello" in capsys.readouterr().out
+
+    def test_errors_not_sampled(self, production, capsys):
+        """Error messages should still be logged in production."""
+        production.log_sample_rate = 0.0
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Router)
+        server.app = production
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            conn = http.client.HTTPConnection(*server.server_address)
+            conn.request("BREW", "/pot")
+            assert conn.getresponse().status == 501
+            conn.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert "Unsupported method" in capsys.readouterr().out
+
+
+class TestNormalization:
+    """Tests for matching already-normalized paths."""
+
+    def test_match_path_params(self):
+        """match_path_params should match without normalizing again."""
+        pattern = URLParser.path_to_regex("/users/{id}")
+        assert URLParser.match_path_params(pattern, "/users/42") == {"id": 42}
+        assert URLParser.match_path_params(pattern, "/users/42/") is None
+        assert URLParser.extract_path_params(pattern, "/users/42/") == {"id": 42}
+
+    def test_trailing_slash_still_matches(self, production):
+        """Dispatch should still accept a trailing slash on dynamic routes."""
+        production.get("/users/{id}")(lambda id: f"User {id}")
+        assert Client(production).get("/users/7/").text == "User 7"
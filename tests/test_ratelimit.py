@@ -0,0 +1,212 @@
+import sys
+
+import pytest
+
+from blank import GET, RateLimiter
+from blank.decorators import RateLimit
+from blank.testing import Client
+
+
+class TestTokenBucket:
+    """Tests for RateLimiter bucket arithmetic."""
+
+    def test_allows_burst_then_rejects(self):
+        """A fresh bucket should allow exactly burst requests at once."""
+        limiter = RateLimiter(rate=1, burst=3)
+
+        results = [limiter.allow("a", now=100.0) for _ in range(4)]
+
+        assert results == [True, True, True, False]
+
+    def test_refills_over_time(self):
+        """Tokens should come back at the configured rate."""
+        limiter = RateLimiter(rate=2, burst=1)
+
+        assert limiter.allow("a", now=100.0)
+        assert not limiter.allow("a", now=100.1)
+        assert limiter.allow("a", now=100.6)
+
+    def test_refill_capped_at_burst(self):
+        """A long idle period should not bank more than burst tokens."""
+        limiter = RateLimiter(rate=1, burst=2)
+        limiter.allow("a", now=0.0)
+
+        results = [limiter.allow("a", now=1000.0) for _ in range(3)]
+
+        assert results == [True, True, False]
+
+    def test_keys_are_independent(self):
+        """Each key should have its own bucket."""
+        limiter = RateLimiter(rate=1, burst=1)
+
+        assert limiter.allow("a", now=0.0)
+        assert limiter.allow("b", now=0.0)
+        assert not limiter.allow("a", now=0.0)
+
+    def test_counts_rejections(self):
+        """stats() should count allowed and rejected requests."""
+        limiter = RateLimiter(rate=1, burst=1)
+        limiter.allow("a", now=0.0)
+        limiter.allow("a", now=0.0)
+
+        assert limiter.stats() == {"allowed": 1, "rejected": 1, "evicted": 0, "tracked": 1}
+
+
+class TestEviction:
+    """Tests for bounded per-client state."""
+
+    def test_tracked_keys_bounded(self):
+        """Distinct keys beyond capacity should evict old buckets."""
+        limiter = RateLimiter(rate=1, burst=1, capacity=100)
+
+        for i in range(10000):
+            limiter.allow(f"10.0.{i // 256}.{i % 256}", now=0.0)
+
+        stats = limiter.stats()
+        assert stats["tracked"] == 100
+        assert stats["evicted"] == 9900
+
+    def test_recently_used_key_survives(self):
+        """A key referenced since the last sweep should not be evicted first."""
+        limiter = RateLimiter(rate=1, burst=5, capacity=3)
+        for key in ("a", "b", "c"):
+            limiter.allow(key, now=0.0)
+
+        limiter.allow("d", now=0.0)
+        limiter.allow("b", now=0.0)
+        limiter.allow("e", now=0.0)
+
+        assert "b" in limiter._index
+
+    def test_memory_does_not_grow_with_clients(self):
+        """Array-backed state should stay fixed after capacity is reached."""
+        limiter = RateLimiter(rate=1, capacity=1000)
+        for i in range(1000):
+            limiter.allow(i, now=0.0)
+        size = sys.getsizeof(limiter._tokens) + sys.getsizeof(limiter._index)
+
+        for i in range(1000, 50000):
+            limiter.allow(i, now=0.0)
+
+        assert sys.getsizeof(limiter._tokens) + sys.getsizeof(limiter._index) <= size * 2
+
+
+class TestRouteRateLimit:
+    """Tests for @RateLimit on routes."""
+
+    def test_returns_429_before_handler(self, client):
+        """Requests over the limit should get 429 without running the handler."""
+        calls = []
+
+        @GET("/login")
+        @RateLimit(rate=0.001, burst=2)
+        def login():
+            calls.append(1)
+            return "ok"
+
+        statuses = [client.get("/login").status_code for _ in range(3)]
+
+        assert statuses == [200, 200, 429]
+        assert len(calls) == 2
+
+    def test_429_has_retry_after(self, client):
+        """The 429 should carry a Retry-After header."""
+        @GET("/login")
+        @RateLimit(rate=0.5, burst=1)
+        def login():
+            return "ok"
+
+        client.get("/login")
+        response = client.get("/login")
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "2"
+
+    def test_above_route_on_serving_app(self, app):
+        """A limit applied above the route decorator on a serving app should apply."""
+        app.dispatch("GET", "/")
+
+        @RateLimit(rate=0.001, burst=1)
+        @app.get("/login")
+        def login():
+            return "ok"
+
+        statuses = [app.dispatch("GET", "/login").status for _ in range(2)]
+
+        assert statuses == [200, 429]
+
+    def test_per_client(self, app):
+        """Different client addresses should have separate buckets."""
+        @app.get("/login")
+        @RateLimit(rate=0.001, burst=1)
+        def login():
+            return "ok"
+
+        first, second = Client(app, "10.0.0.1"), Client(app, "10.0.0.2")
+
+        assert first.get("/login").status_code == 200
+        assert second.get("/login").status_code == 200
+        assert first.get("/login").status_code == 429
+
+    def test_other_routes_unaffected(self, client):
+        """A rate limited route should not limit other routes."""
+        @GET("/limited")
+        @RateLimit(rate=0.001, burst=1)
+        def limited():
+            return "ok"
+
+        @GET("/free")
+        def free():
+            return "ok"
+
+        client.get("/limited")
+        assert client.get("/limited").status_code == 429
+        assert client.get("/free").status_code == 200
+
+    def test_shared_limiter(self, client):
+        """Routes sharing a limiter should draw from the same buckets."""
+        limiter = RateLimiter(rate=0.001, burst=1)
+
+        @GET("/a")
+        @RateLimit(limiter=limiter)
+        def a():
+            return "a"
+
+        @GET("/b")
+        @RateLimit(limiter=limiter)
+        def b():
+            return "b"
+
+        assert client.get("/a").status_code == 200
+        assert client.get("/b").status_code == 429
+        assert limiter.stats()["rejected"] == 1
+
+    def test_custom_key(self, client):
+        """A key function should pick the bucket from the request."""
+        @GET("/api")
+        @RateLimit(rate=0.001, burst=1, key=lambda request: request.headers.get("X-Api-Key"))
+        def api():
+            return "ok"
+
+        assert client.get("/api", headers={"X-Api-Key": "a"}).status_code == 200
+        assert client.get("/api", headers={"X-Api-Key": "b"}).status_code == 200
+        assert client.get("/api", headers={"X-Api-Key": "a"}).status_code == 429
+
+    def test_requires_rate_or_limiter(self):
+        """RateLimit without parameters should be rejected."""
+        with pytest.raises(ValueError):
+            RateLimit()
+
+
+class TestAppRateLimit:
+    """Tests for an app-wide rate limiter."""
+
+    def test_limits_before_routing(self, app):
+        """The app limiter should apply to every request, even unknown paths."""
+        app.rate_limiter = RateLimiter(rate=0.001, burst=2)
+        client = Client(app)
+
+        assert client.get("/missing").status_code == 404
+        assert client.get("/missing").status_code == 404
+        assert client.get("/missing").status_code == 429
+        assert app.rate_limiter.stats()["rejected"] == 1
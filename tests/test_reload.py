@@ -0,0 +1,242 @@
+import http.client
+import os
+import signal
+import sys
+import threading
+import time
+
+import pytest
+
+from blank import App, Reloader, get_routes, load_app
+
+
+def versioned_app(version):
+    """Factory for apps answering with their version."""
+    def factory():
+        app = App()
+
+        @app.get("/version")
+        def get_version():
+            return str(version["value"])
+
+        @app.get("/slow")
+        def slow():
+            time.sleep(0.3)
+            return f"slow {version['value']}"
+
+        return app
+    return factory
+
+
+def fetch(server, path):
+    """One request on a fresh connection."""
+    conn = http.client.HTTPConnection(*server.server_address, timeout=5)
+    try:
+        conn.request("GET", path)
+        response = conn.getresponse()
+        return response.status, response.read().decode()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def reloader():
+    """Start a Reloader serving versioned apps; shut it down afterwards."""
+    version = {"value": 1}
+    server = Reloader(("127.0.0.1", 0), versioned_app(version), drain_timeout=5)
+    server.start()
+    server.version = version
+    yield server
+    server.shutdown()
+
+
+class TestReload:
+    """Tests for swapping generations."""
+
+    def test_serves_first_generation(self, reloader):
+        """The first generation should serve the factory's app."""
+        assert fetch(reloader, "/version") == (200, "1")
+        assert reloader.generation == 1
+
+    def test_reload_swaps_app(self, reloader):
+        """After reload() the new app should answer."""
+        reloader.version["value"] = 2
+        assert reloader.reload() == 2
+        assert fetch(reloader, "/version") == (200, "2")
+
+    def test_in_flight_request_drains(self, reloader):
+        """A request running during reload should finish on the old app."""
+        results = []
+        thread = threading.Thread(target=lambda: results.append(fetch(reloader, "/slow")))
+        thread.start()
+        time.sleep(0.1)
+
+        reloader.version["value"] = 2
+        reloader.reload()
+        thread.join()
+
+        assert len(results) == 1
+        assert results[0][0] == 200
+
+    def test_failed_factory_keeps_serving(self, reloader):
+        """If building the new app fails, the old generation stays."""
+        reloader.factory = lambda: 1 / 0
+
+        with pytest.raises(ZeroDivisionError):
+            reloader.reload()
+
+        assert fetch(reloader, "/version") == (200, "1")
+        assert reloader.generation == 1
+
+    def test_zero_failed_requests_under_load(self, reloader):
+        """Hammering the server across several reloads should never fail."""
+        stop = threading.Event()
+        failures = []
+        statuses = []
+
+        def hammer():
+            while not stop.is_set():
+                try:
+                    statuses.append(fetch(reloader, "/version")[0])
+                except Exception as e:
+                    failures.append(e)
+
+        threads = [threading.Thread(target=hammer) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+
+        for version in range(2, 6):
+            time.sleep(0.1)
+            reloader.version["value"] = version
+            reloader.reload()
+        time.sleep(0.1)
+
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        assert failures == []
+        assert set(statuses) == {200}
+        assert len(statuses) > 50
+        assert fetch(reloader, "/version") == (200, "5")
+
+    def test_zero_failed_keep_alive_requests_under_load(self, reloader):
+        """Clients reusing connections should never see a reset across reloads."""
+        stop = threading.Event()
+        failures = []
+        statuses = []
+
+        def hammer():
+            conn = None
+            while not stop.is_set():
+                if conn is None:
+                    conn = http.client.HTTPConnection(*reloader.server_address, timeout=5)
+                try:
+                    conn.request("GET", "/version")
+                    response = conn.getresponse()
+                    response.read()
+                    statuses.append(response.status)
+                    reuse = not response.will_close
+                except Exception as e:
+                    failures.append(e)
+                    reuse = False
+                if not reuse:
+                    conn.close()
+                    conn = None
+            if conn is not None:
+                conn.close()
+
+        threads = [threading.Thread(target=hammer) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+
+        for version in range(2, 6):
+            time.sleep(0.1)
+            reloader.version["value"] = version
+            reloader.reload()
+        time.sleep(0.1)
+
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        assert failures == []
+        assert set(statuses) == {200}
+        assert len(statuses) > 50
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="needs SIGHUP")
+    def test_sighup_triggers_reload(self, reloader):
+        """SIGHUP should start a reload."""
+        previous = signal.getsignal(signal.SIGHUP)
+        reloader.install_signal_handler()
+        try:
+            reloader.version["value"] = 2
+            os.kill(os.getpid(), signal.SIGHUP)
+
+            deadline = time.monotonic() + 5
+            while reloader.generation < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            signal.signal(signal.SIGHUP, previous)
+
+        assert reloader.generation == 2
+        assert fetch(reloader, "/version") == (200, "2")
+
+
+class TestLoadApp:
+    """Tests for building apps from decorated modules."""
+
+    def test_registers_into_fresh_app(self, tmp_path, monkeypatch):
+        """Module-level decorators should register into the new app only."""
+        (tmp_path / "reload_fixture.py").write_text(
+            "from blank import GET\n"
+            "\n"
+            "@GET('/fixture')\n"
+            "def fixture():\n"
+            "    return 'v1'\n"
+        )
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.delitem(sys.modules, "reload_fixture", raising=False)
+
+        app = load_app("reload_fixture")
+
+        assert app.dispatch("GET", "/fixture").text == "v1"
+        assert "/fixture" not in get_routes
+
+    def test_picks_up_changed_code(self, tmp_path, monkeypatch):
+        """Loading again should re-import the module from disk."""
+        module = tmp_path / "reload_fixture.py"
+        source = "from blank import GET\n\n@GET('/fixture')\ndef fixture():\n    return '{}'\n"
+        module.write_text(source.format("v1"))
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.delitem(sys.modules, "reload_fixture", raising=False)
+
+        first = load_app("reload_fixture")
+        module.write_text(source.format("v2-changed"))
+        second = load_app("reload_fixture")
+
+        assert first.dispatch("GET", "/fixture").text == "v1"
+        assert second.dispatch("GET", "/fixture").text == "v2-changed"
+
+    def test_other_threads_keep_default_app(self, tmp_path, monkeypatch):
+        """Routes registered by other threads during a load should go to the default app."""
+        (tmp_path / "reload_fixture.py").write_text(
+            "import threading\n"
+            "from blank import GET\n"
+            "\n"
+            "@GET('/fixture')\n"
+            "def fixture():\n"
+            "    return 'v1'\n"
+            "\n"
+            "other = threading.Thread(target=lambda: GET('/elsewhere')(fixture))\n"
+            "other.start()\n"
+            "other.join()\n"
+        )
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.delitem(sys.modules, "reload_fixture", raising=False)
+
+        app = load_app("reload_fixture")
+
+        assert app.dispatch("GET", "/fixture").text == "v1"
+        assert app.dispatch("GET", "/elsewhere").status == 404
+        assert "/elsewhere" in get_routes
@@ -1,5 +1,12 @@
-from blank import GET, POST
-from blank.core.routing import get_routes, post_routes, find_route
+from blank import GET, POST, PUT, PATCH, DELETE
+from blank.core.routing import (
+    get_routes,
+    post_routes,
+    put_routes,
+    patch_routes,
+    delete_routes,
+    find_route,
+)
 
 
 class TestGETDecorator:
@@ -93,6 +100,29 @@ class TestPOSTDecorator:
         assert post_handler() == "post"
 
 
+class TestOtherMethodDecorators:
+    """Tests for @PUT, @PATCH and @DELETE decorators."""
+    
+    def test_registers_routes(self):
+        """Each decorator should register in its own route dict."""
+        @PUT("/users/{id}")
+        def put_user(id):
+            return "put"
+        
+        @PATCH("/users/{id}")
+        def patch_user(id):
+            return "patch"
+        
+        @DELETE("/users/{id}")
+        def delete_user(id):
+            return "delete"
+        
+        assert put_routes["/users/{id}"][0] is put_user
+        assert patch_routes["/users/{id}"][0] is patch_user
+        assert delete_routes["/users/{id}"][0] is delete_user
+        assert "/users/{id}" not in get_routes
+
+
 class TestFindRoute:
     """Tests for find_route function."""
     
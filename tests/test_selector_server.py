@@ -0,0 +1,283 @@
+import http.client
+import socket
+import threading
+import time
+
+import pytest
+
+from blank import AdmissionController, App
+
+
+def connect(server):
+    """Open a raw client socket to the server."""
+    return socket.create_connection(server.server_address, timeout=5)
+
+
+def read_all(sock):
+    """Read until the server closes the connection."""
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+@pytest.fixture
+def hello_app():
+    """App with a couple of simple routes."""
+    app = App()
+
+    @app.get("/hello/{name}")
+    def hello(name):
+        return f"Hello, {name}"
+
+    @app.get("/sleep")
+    def sleep(seconds):
+        time.sleep(seconds)
+        return "awake"
+
+    return app
+
+
+class TestServing:
+    """Tests for normal request handling."""
+
+    @pytest.mark.parametrize("workers", [0, 4])
+    def test_get(self, serve, hello_app, workers):
+        """GET should be dispatched to the app."""
+        server = serve(hello_app, workers=workers)
+        conn = http.client.HTTPConnection(*server.server_address)
+        conn.request("GET", "/hello/Ada")
+        response = conn.getresponse()
+
+        assert response.status == 200
+        assert response.read() == b"Hello, Ada"
+
+    def test_keep_alive(self, serve, hello_app):
+        """Several requests should share one connection."""
+        server = serve(hello_app)
+        conn = http.client.HTTPConnection(*server.server_address)
+
+        for name in ("a", "b", "c"):
+            conn.request("GET", f"/hello/{name}")
+            assert conn.getresponse().read() == f"Hello, {name}".encode()
+
+        assert server.stats["accepted"] == 1
+        assert server.stats["requests"] == 3
+
+    def test_pipelined_requests(self, serve, hello_app):
+        """Requests sent back to back should be answered in order."""
+        server = serve(hello_app)
+        sock = connect(server)
+        sock.sendall(
+            b"GET /hello/a HTTP/1.1\r\nHost: x\r\n\r\n"
+            b"GET /hello/b HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n"
+        )
+        data = read_all(sock)
+
+        assert data.index(b"Hello, a") < data.index(b"Hello, b")
+
+    def test_head_has_no_body(self, serve, hello_app):
+        """HEAD responses should not carry a body."""
+        server = serve(hello_app)
+        conn = http.client.HTTPConnection(*server.server_address)
+        conn.request("HEAD", "/hello/Ada")
+        response = conn.getresponse()
+
+        assert response.status == 200
+        assert response.read() == b""
+
+    def test_reads_body(self, serve, hello_app):
+        """A request body should be consumed before the next request."""
+        @hello_app.post("/upload")
+        def upload():
+            return "stored"
+
+        server = serve(hello_app)
+        conn = http.client.HTTPConnection(*server.server_address)
+        conn.request("POST", "/upload", body=b"x" * 100000)
+        assert conn.getresponse().read() == b"stored"
+        conn.request("GET", "/hello/again")
+        assert conn.getresponse().read() == b"Hello, again"
+
+    def test_bad_request(self, serve, hello_app):
+        """A malformed request line should get a 400."""
+        server = serve(hello_app)
+        sock = connect(server)
+        sock.sendall(b"NONSENSE\r\n\r\n")
+
+        assert read_all(sock).startswith(b"HTTP/1.1 400")
+
+    def test_negative_content_length(self, serve, hello_app):
+        """A negative Content-Length should get a 400, not desynchronize the connection."""
+        server = serve(hello_app)
+        sock = connect(server)
+        sock.sendall(
+            b"POST /hello/a HTTP/1.1\r\nContent-Length: -10\r\n\r\n"
+            b"GET /hello/b HTTP/1.1\r\n\r\n"
+        )
+
+        assert read_all(sock).startswith(b"HTTP/1.1 400")
+        assert server.stats["bad_requests"] == 1
+
+    def test_body_too_large(self, serve, hello_app):
+        """Bodies over max_body_bytes should get a 413."""
+        server = serve(hello_app, max_body_bytes=10)
+        sock = connect(server)
+        sock.sendall(b"POST /upload HTTP/1.1\r\nContent-Length: 11\r\n\r\n")
+
+        assert read_all(sock).startswith(b"HTTP/1.1 413")
+
+    def test_connection_cap(self, serve, hello_app):
+        """Connections over max_connections should be closed on accept."""
+        server = serve(hello_app, max_connections=1)
+        first = connect(server)
+        first.sendall(b"GET /hello/a HTTP/1.1\r\n")
+        time.sleep(0.1)
+
+        second = connect(server)
+        assert read_all(second) == b""
+        assert server.stats["rejected"] == 1
+
+
+class TestAdmission:
+    """Tests for admission control in front of the worker pool."""
+
+    def test_sheds_before_queueing_for_workers(self, serve, hello_app):
+        """Requests beyond max_in_flight should get a 503 instead of waiting for a worker."""
+        hello_app.admission = AdmissionController(max_in_flight=4)
+        server = serve(hello_app, workers=2)
+        results = []
+
+        def request():
+            started = time.monotonic()
+            conn = http.client.HTTPConnection(*server.server_address, timeout=10)
+            conn.request("GET", "/sleep?seconds=0.2")
+            status = conn.getresponse().status
+            conn.close()
+            results.append((status, time.monotonic() - started))
+
+        threads = [threading.Thread(target=request) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        statuses = [status for status, _ in results]
+        assert statuses.count(200) <= 8
+        assert statuses.count(503) >= 12
+        assert max(elapsed for _, elapsed in results) < 1.0
+        assert hello_app.admission.stats()["in_flight"] == 0
+
+    def test_rejection_is_immediate_inline(self, serve, hello_app):
+        """With workers=0 the loop should answer 503 without blocking on max_queue_wait."""
+        hello_app.admission = AdmissionController(max_in_flight=0, max_queue_wait=5)
+        server = serve(hello_app, workers=0)
+        conn = http.client.HTTPConnection(*server.server_address, timeout=2)
+        conn.request("GET", "/hello/Ada")
+
+        assert conn.getresponse().status == 503
+
+
+class TestDeadlines:
+    """Tests for per-connection deadlines."""
+
+    def test_header_timeout(self, serve, hello_app):
+        """Headers trickling in too slowly should get a 408."""
+        server = serve(hello_app, header_timeout=0.2, read_timeout=5)
+        sock = connect(server)
+
+        started = time.monotonic()
+        sock.sendall(b"GET /hello/a HTTP/1.1\r\n")
+        for _ in range(3):
+            time.sleep(0.1)
+            try:
+                sock.sendall(b"X-Slow: 1\r\n")
+            except OSError:
+                break
+
+        assert read_all(sock).startswith(b"HTTP/1.1 408")
+        assert time.monotonic() - started < 2
+        assert server.stats["header_timeouts"] == 1
+
+    def test_read_timeout(self, serve, hello_app):
+        """A stalled body upload should be cut off."""
+        server = serve(hello_app, read_timeout=0.2)
+        sock = connect(server)
+        sock.sendall(b"POST /upload HTTP/1.1\r\nContent-Length: 100\r\n\r\nabc")
+
+        assert read_all(sock).startswith(b"HTTP/1.1 408")
+        assert server.stats["read_timeouts"] == 1
+
+    def test_idle_timeout(self, serve, hello_app):
+        """Idle keep-alive connections should be closed."""
+        server = serve(hello_app, idle_timeout=0.2)
+        sock = connect(server)
+
+        assert read_all(sock) == b""
+        assert server.stats["idle_timeouts"] == 1
+
+    def test_request_timeout(self, serve, hello_app):
+        """Requests over their total budget should be dropped."""
+        server = serve(hello_app, request_timeout=0.2)
+        sock = connect(server)
+        sock.sendall(b"GET /sleep?seconds=0.5 HTTP/1.1\r\n\r\n")
+
+        assert read_all(sock) == b""
+        assert server.stats["request_timeouts"] == 1
+
+
+class TestSlowClients:
+    """Well-behaved clients should not suffer from a crowd of slow ones."""
+
+    def measure(self, server, requests=200):
+        """Requests per second for one keep-alive client."""
+        conn = http.client.HTTPConnection(*server.server_address, timeout=5)
+        started = time.perf_counter()
+        for i in range(requests):
+            conn.request("GET", f"/hello/{i}")
+            assert conn.getresponse().read() == f"Hello, {i}".encode()
+        conn.close()
+        return requests / (time.perf_counter() - started)
+
+    def test_throughput_stable_under_slowloris(self, serve, hello_app):
+        """1000 trickling connections should neither block nor starve others."""
+        server = serve(hello_app, header_timeout=30, read_timeout=30)
+        baseline = self.measure(server)
+
+        slow = []
+        for _ in range(1000):
+            sock = connect(server)
+            sock.sendall(b"GET /hello/slow HTTP/1.1\r\nX-Slow: ")
+            slow.append(sock)
+
+        deadline = time.monotonic() + 5
+        while server.connection_count < 1000 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        held = server.connection_count
+        under_attack = self.measure(server)
+
+        for sock in slow:
+            sock.close()
+
+        assert held == 1000
+        assert under_attack > baseline * 0.3
+
+    def test_slow_clients_are_reaped(self, serve, hello_app):
+        """Slow clients should be disconnected once their deadline passes."""
+        server = serve(hello_app, header_timeout=0.3)
+
+        slow = [connect(server) for _ in range(200)]
+        for sock in slow:
+            sock.sendall(b"GET / HTTP/1.1\r\n")
+
+        deadline = time.monotonic() + 5
+        while server.stats["header_timeouts"] < 200 and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        assert server.stats["header_timeouts"] == 200
+        assert server.connection_count == 0
+        for sock in slow:
+            sock.close()
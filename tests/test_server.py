@@ -1,4 +1,4 @@
-from blank import GET, POST
+from blank import GET, POST, PUT, PATCH, DELETE, Response
 
 
 class TestGETRequests:
@@ -192,7 +192,8 @@ class TestErrorHandling:
             return "GET only"
         
         response = client.post("/only-get")
-        assert response.status_code == 404
+        assert response.status_code == 405
+        assert response.headers["Allow"] == "GET, HEAD, OPTIONS"
 
 
 class TestPathParamPrecedence:
@@ -206,3 +207,154 @@ class TestPathParamPrecedence:
         
         response = client.get("/users/42?id=999")
         assert response.text == "id=42"
+
+
+class TestOtherMethods:
+    """Tests for PUT, PATCH and DELETE request handling."""
+    
+    def test_put(self, client):
+        """PUT request should reach the PUT handler."""
+        @PUT("/users/{id}")
+        def replace_user(id):
+            return f"User {id} replaced"
+        
+        response = client.put("/users/42")
+        assert response.status_code == 200
+        assert response.text == "User 42 replaced"
+    
+    def test_patch(self, client):
+        """PATCH request should reach the PATCH handler."""
+        @PATCH("/users/{id}")
+        def update_user(id, name=None):
+            return f"User {id} renamed to {name}"
+        
+        response = client.patch("/users/42?name=Ada")
+        assert response.text == "User 42 renamed to Ada"
+    
+    def test_delete(self, client):
+        """DELETE request should reach the DELETE handler."""
+        @DELETE("/users/{id}")
+        def delete_user(id):
+            return f"User {id} deleted"
+        
+        response = client.delete("/users/42")
+        assert response.text == "User 42 deleted"
+    
+    def test_methods_share_path(self, client):
+        """Each method on the same path should reach its own handler."""
+        @GET("/items/{id}")
+        def get_item(id):
+            return "get"
+        
+        @DELETE("/items/{id}")
+        def delete_item(id):
+            return "delete"
+        
+        assert client.get("/items/1").text == "get"
+        assert client.delete("/items/1").text == "delete"
+    
+    def test_registration_order_per_method(self, client):
+        """Each method should try its patterns in its own registration order."""
+        @GET("/{y}/b")
+        def get_b(y):
+            return "get y/b"
+        
+        @POST("/a/{x}")
+        def post_a(x):
+            return "post a/x"
+        
+        @POST("/{y}/b")
+        def post_b(y):
+            return "post y/b"
+        
+        assert client.post("/a/b").text == "post a/x"
+        assert client.get("/a/b").text == "get y/b"
+        assert client.head("/a/b").status_code == 200
+        assert client.options("/a/b").headers["Allow"] == "GET, HEAD, POST, OPTIONS"
+
+
+class TestHEADRequests:
+    """Tests for automatic HEAD handling."""
+    
+    def test_head_uses_get_route(self, client):
+        """HEAD should return GET status and headers without a body."""
+        @GET("/users/{id}")
+        def get_user(id):
+            return Response(f"User {id}", headers={"X-User": str(id)})
+        
+        response = client.head("/users/42")
+        assert response.status_code == 200
+        assert response.headers["X-User"] == "42"
+        assert response.text == ""
+    
+    def test_head_404(self, client):
+        """HEAD to unknown route should return 404."""
+        assert client.head("/unknown").status_code == 404
+    
+    def test_explicit_head_route_wins(self, client, app):
+        """An explicitly registered HEAD route should override the GET fallback."""
+        calls = []
+        
+        @app.get("/ping")
+        def ping():
+            calls.append("get")
+            return "pong"
+        
+        @app.route("HEAD", "/ping")
+        def ping_head():
+            calls.append("head")
+            return ""
+        
+        app.dispatch("HEAD", "/ping")
+        assert calls == ["head"]
+
+
+class TestOPTIONSRequests:
+    """Tests for automatic OPTIONS handling."""
+    
+    def test_options_lists_allowed_methods(self, client):
+        """OPTIONS should answer with the Allow header for the path."""
+        @GET("/users/{id}")
+        def get_user(id):
+            return "get"
+        
+        @PUT("/users/{id}")
+        def put_user(id):
+            return "put"
+        
+        response = client.options("/users/42")
+        assert response.status_code == 204
+        assert response.headers["Allow"] == "GET, HEAD, PUT, OPTIONS"
+    
+    def test_options_404(self, client):
+        """OPTIONS to unknown route should return 404."""
+        assert client.options("/unknown").status_code == 404
+
+
+class TestMethodNotAllowed:
+    """Tests for 405 responses."""
+    
+    def test_405_lists_allowed_methods(self, client):
+        """405 should carry the Allow header of the matched path."""
+        @POST("/users")
+        def create_user():
+            return "created"
+        
+        response = client.delete("/users")
+        assert response.status_code == 405
+        assert response.text == "405 Method Not Allowed"
+        assert response.headers["Allow"] == "POST, OPTIONS"
+    
+    def test_falls_through_to_route_with_method(self, client):
+        """A later pattern handling the method should win over a 405."""
+        @GET("/users/{id}")
+        def get_user(id):
+            return "get"
+        
+        @DELETE("/{collection}/{id}")
+        def delete_any(collection, id):
+            return f"deleted {collection} {id}"
+        
+        response = client.delete("/users/42")
+        assert response.status_code == 200
+        assert response.text == "deleted users 42"
@@ -0,0 +1,195 @@
+import threading
+import time
+
+from blank import GET, App, SingleFlight
+from blank.decorators import Coalesce
+from blank.testing import Client
+
+
+def fire(client, paths):
+    """Send the given GET requests concurrently; return responses in order."""
+    results = [None] * len(paths)
+
+    def run(i, path):
+        results[i] = client.get(path)
+
+    threads = [threading.Thread(target=run, args=(i, p)) for i, p in enumerate(paths)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+class TestCoalescing:
+    """Tests for sharing one execution between identical requests."""
+
+    def test_identical_requests_share_execution(self, client):
+        """Concurrent identical requests should run the handler once."""
+        calls = []
+        flight = SingleFlight()
+
+        @GET("/products/{id}")
+        @Coalesce(flight=flight)
+        def product(id):
+            calls.append(id)
+            time.sleep(0.2)
+            return f"Product {id}"
+
+        responses = fire(client, ["/products/7"] * 10)
+
+        assert [r.text for r in responses] == ["Product 7"] * 10
+        assert calls == [7]
+        assert flight.stats()["executions"] == 1
+        assert flight.stats()["coalesced"] == 9
+
+    def test_different_params_run_separately(self, client):
+        """Requests with different coerced params should not be shared."""
+        calls = []
+
+        @GET("/search")
+        @Coalesce()
+        def search(q):
+            calls.append(q)
+            time.sleep(0.1)
+            return str(q)
+
+        responses = fire(client, ["/search?q=1", "/search?q=true", "/search?q=a"])
+
+        assert [r.text for r in responses] == ["1", "True", "a"]
+        assert sorted(map(str, calls)) == ["1", "True", "a"]
+
+    def test_equivalent_params_share(self, client):
+        """Params that coerce to the same values should be coalesced."""
+        calls = []
+
+        @GET("/items/{id}")
+        @Coalesce()
+        def item(id):
+            calls.append(id)
+            time.sleep(0.2)
+            return str(id)
+
+        fire(client, ["/items/42", "/items/042", "/items/42/"])
+
+        assert calls == [42]
+
+    def test_sequential_requests_not_cached(self, client):
+        """Once an execution finishes, the next request should run again."""
+        calls = []
+
+        @GET("/now")
+        @Coalesce()
+        def now():
+            calls.append(1)
+            return "now"
+
+        client.get("/now")
+        client.get("/now")
+        assert len(calls) == 2
+
+    def test_middleware_runs_per_request(self, app):
+        """Each coalesced request should get its own response object."""
+        counter = iter(range(100))
+
+        def tag(request, call_next):
+            response = call_next(request)
+            response.headers["X-Request"] = str(next(counter))
+            return response
+
+        app.use(tag)
+
+        @app.get("/slow")
+        @Coalesce()
+        def slow():
+            time.sleep(0.2)
+            return "done"
+
+        responses = fire(Client(app), ["/slow"] * 5)
+
+        assert sorted(r.headers["X-Request"] for r in responses) == list("01234")
+
+
+class TestFailures:
+    """Tests for timeouts and error propagation."""
+
+    def test_error_propagates_to_all(self, client):
+        """Every waiter should see the handler's failure."""
+        flight = SingleFlight()
+
+        @GET("/flaky")
+        @Coalesce(flight=flight)
+        def flaky():
+            time.sleep(0.2)
+            raise RuntimeError("upstream down")
+
+        responses = fire(client, ["/flaky"] * 4)
+
+        assert [r.status_code for r in responses] == [500] * 4
+        assert all("upstream down" in r.text for r in responses)
+        assert flight.stats()["errors"] == 1
+
+    def test_waiters_time_out(self, client):
+        """Coalesced requests should give up after the timeout."""
+        flight = SingleFlight(timeout=0.1)
+
+        @GET("/stuck")
+        @Coalesce(flight=flight)
+        def stuck():
+            time.sleep(0.5)
+            return "finally"
+
+        responses = fire(client, ["/stuck"] * 3)
+
+        assert sorted(r.status_code for r in responses) == [200, 504, 504]
+        assert flight.stats()["timeouts"] == 2
+        assert flight.stats()["in_flight"] == 0
+
+    def test_timeouts_not_shared(self, app):
+        """Middleware changes to one waiter's 504 should not reach the others."""
+        counter = iter(range(100))
+
+        def tag(request, call_next):
+            response = call_next(request)
+            response.headers[f"X-Req-{next(counter)}"] = "yes"
+            return response
+
+        app.use(tag)
+        flight = SingleFlight(timeout=0.05)
+
+        @app.get("/stuck")
+        @Coalesce(flight=flight)
+        def stuck():
+            time.sleep(0.3)
+            return "finally"
+
+        responses = fire(Client(app), ["/stuck"] * 3)
+
+        timeouts = [r for r in responses if r.status_code == 504]
+        assert len(timeouts) == 2
+        assert all(sum(name.startswith("X-Req-") for name in r.headers) == 1 for r in timeouts)
+        assert not any(name.startswith("X-Req-") for name in flight.timed_out.headers)
+
+    def test_custom_key(self):
+        """A custom key should control which requests are shared."""
+        app = App()
+        calls = []
+
+        @app.get("/user")
+        @Coalesce(key=lambda request: request.headers.get("X-User"))
+        def user(request):
+            calls.append(request.headers.get("X-User"))
+            time.sleep(0.2)
+            return "ok"
+
+        client = Client(app)
+        threads = [
+            threading.Thread(target=client.get, args=("/user", {"X-User": name}))
+            for name in ("a", "a", "b")
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert sorted(calls) == ["a", "b"]
@@ -0,0 +1,256 @@
+import sys
+import textwrap
+
+import pytest
+
+from blank import (
+    App,
+    MemoryProfiler,
+    StaleSnapshotError,
+    default_app,
+    load_app,
+    load_snapshot,
+    save_snapshot,
+)
+from blank.core.snapshot import LazyHandler, build_snapshot, main
+from blank.testing import Client
+
+ROUTES = textwrap.dedent('''
+    from blank import GET, POST, SSE, Broadcaster, Response
+    from blank.decorators import UseMiddleware
+
+    updates = Broadcaster(heartbeat=None)
+
+
+    def shout(request, call_next):
+        response = call_next(request)
+        response.headers["X-Shout"] = "yes"
+        return response
+
+
+    @GET("/")
+    def index():
+        return "index"
+
+
+    @GET("/users/{id}")
+    @UseMiddleware(shout)
+    def get_user(id):
+        return f"User {id} ({type(id).__name__})"
+
+
+    @POST("/users")
+    def create_user():
+        return Response("created", status=201)
+
+
+    @SSE("/updates")
+    def stream():
+        return updates
+''')
+
+
+@pytest.fixture
+def routes_module(tmp_path, monkeypatch):
+    """Write a route module to an importable temporary directory."""
+    module = tmp_path / "snapshot_fixture.py"
+    module.write_text(ROUTES)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "snapshot_fixture", raising=False)
+    yield module
+    sys.modules.pop("snapshot_fixture", None)
+
+
+@pytest.fixture
+def snapshot(routes_module, tmp_path):
+    """Build a snapshot of the fixture module, then forget the module."""
+    path = tmp_path / "routes.snapshot"
+    save_snapshot(load_app("snapshot_fixture"), str(path))
+    del sys.modules["snapshot_fixture"]
+    return path
+
+
+class TestBuild:
+    """Tests for building snapshots."""
+
+    def test_records_routes(self, routes_module):
+        """Each route should be described by import path and pattern metadata."""
+        data = build_snapshot(load_app("snapshot_fixture"))
+
+        routes = {(r["method"], r["path"]): r for r in data["routes"]}
+        user = routes[("GET", "/users/{id}")]
+        assert user["handler"] == "snapshot_fixture:get_user"
+        assert user["params"] == ["id"]
+        assert user["pattern"] == "^/users/(?P<id>[^/]+)$"
+        assert routes[("GET", "/updates")]["kind"] == "sse"
+        assert routes[("POST", "/users")]["kind"] == "inline"
+        assert data["sources"]["snapshot_fixture"]["file"] == str(routes_module)
+
+    def test_rejects_nested_handlers(self, app):
+        """Handlers that cannot be imported by name cannot be snapshotted."""
+        @app.get("/x")
+        def nested():
+            return "x"
+
+        with pytest.raises(ValueError):
+            build_snapshot(app)
+
+    def test_rejects_bound_methods(self, app):
+        """A bound method's qualname names the plain function, so it cannot be snapshotted."""
+        app.memory = MemoryProfiler()
+        app.get("/_debug/memory")(app.memory.endpoint)
+
+        with pytest.raises(ValueError):
+            build_snapshot(app)
+
+    def test_command_line(self, routes_module, tmp_path, capsys):
+        """The build step should be runnable as a command."""
+        output = tmp_path / "cli.snapshot"
+
+        main(["snapshot_fixture", "-o", str(output)])
+
+        assert output.exists()
+        assert "Wrote" in capsys.readouterr().out
+
+
+class TestLoad:
+    """Tests for booting from a snapshot."""
+
+    def test_handlers_imported_lazily(self, snapshot):
+        """Loading should not import handler modules; the first hit should."""
+        app = load_snapshot(str(snapshot), App())
+        client = Client(app)
+
+        assert "snapshot_fixture" not in sys.modules
+        assert client.get("/nowhere").status_code == 404
+        assert "snapshot_fixture" not in sys.modules
+
+        assert client.get("/").text == "index"
+        assert "snapshot_fixture" in sys.modules
+
+    def test_routes_behave_as_registered(self, snapshot):
+        """Params, methods, route middleware and SSE should survive the snapshot."""
+        app = load_snapshot(str(snapshot), App())
+        client = Client(app)
+
+        response = client.get("/users/42")
+        assert response.text == "User 42 (int)"
+        assert response.headers["X-Shout"] == "yes"
+        assert client.post("/users").status_code == 201
+        assert client.put("/users").status_code == 405
+        with client.stream("/updates") as events:
+            sys.modules["snapshot_fixture"].updates.publish("hi")
+            assert events.get(1) == b"data: hi\n\n"
+
+    def test_resolves_once(self, snapshot):
+        """Later requests should reuse the resolved handler."""
+        app = load_snapshot(str(snapshot), App())
+        client = Client(app)
+        client.get("/")
+        module = sys.modules["snapshot_fixture"]
+
+        client.get("/")
+        assert sys.modules["snapshot_fixture"] is module
+        entry, _ = app.routes["GET"]["/"]
+        assert entry is module.index
+
+    def test_import_registers_into_app(self, snapshot):
+        """The module decorators should register into the snapshot's app only."""
+        app = load_snapshot(str(snapshot), App())
+
+        assert Client(app).get("/").text == "index"
+
+        module = sys.modules["snapshot_fixture"]
+        assert app.routes["GET"]["/users/{id}"][0] is module.get_user
+        assert not default_app.routes["GET"]
+        assert Client().get("/").status_code == 404
+
+    def test_batch_route(self, routes_module, tmp_path):
+        """Batch routes should be registered again with their options."""
+        app = load_app("snapshot_fixture")
+        app.batch("/batch", max_items=2, workers=2)
+        path = tmp_path / "batch.snapshot"
+        save_snapshot(app, str(path))
+        del sys.modules["snapshot_fixture"]
+
+        app = load_snapshot(str(path), App())
+        client = Client(app)
+
+        results = client.post("/batch", json=[{"path": "/users/5"}, {"path": "/"}]).json()
+        assert [r["body"] for r in results] == ["User 5 (int)", "index"]
+        assert client.post("/batch", json=[{"path": "/"}] * 3).status_code == 413
+        handler, _ = app.routes["POST"]["/batch"]
+        assert handler.workers == 2
+        handler.shutdown()
+
+    def test_default_app(self, snapshot):
+        """Loading into the default app should work with the module decorators."""
+        load_snapshot(str(snapshot))
+        client = Client()
+
+        assert client.get("/users/7").text == "User 7 (int)"
+        assert client.get("/").text == "index"
+
+    def test_import_rebuilds_once(self, snapshot, monkeypatch):
+        """Routes registered by a lazy import should be published in one rebuild."""
+        app = load_snapshot(str(snapshot))
+        app._compile()
+        builds = []
+        build = app._build_table
+        monkeypatch.setattr(app, "_build_table", lambda: builds.append(1) or build())
+
+        assert Client().get("/").text == "index"
+
+        assert len(builds) == 1
+        entry, _ = app.routes["GET"]["/users/{id}"]
+        assert not isinstance(entry, LazyHandler)
+
+
+class TestStaleness:
+    """Tests for rejecting outdated snapshots."""
+
+    def test_changed_source_rejected(self, snapshot, routes_module):
+        """Editing a handler module should invalidate the snapshot."""
+        routes_module.write_text(ROUTES + "\n# edited\n")
+
+        with pytest.raises(StaleSnapshotError):
+            load_snapshot(str(snapshot), App())
+
+    def test_missing_source_rejected(self, snapshot, routes_module):
+        """A deleted handler module should invalidate the snapshot."""
+        routes_module.unlink()
+
+        with pytest.raises(StaleSnapshotError):
+            load_snapshot(str(snapshot), App())
+
+    def test_changed_route_module_rejected(self, routes_module, tmp_path):
+        """Editing a snapshotted module without handlers should invalidate it too."""
+        extra = tmp_path / "snapshot_extra.py"
+        extra.write_text("import snapshot_fixture\n")
+        path = tmp_path / "extra.snapshot"
+        try:
+            main(["snapshot_fixture", "snapshot_extra", "-o", str(path)])
+        finally:
+            sys.modules.pop("snapshot_extra", None)
+        load_snapshot(str(path), App())
+
+        extra.write_text("import snapshot_fixture  # edited\n")
+
+        with pytest.raises(StaleSnapshotError):
+            load_snapshot(str(path), App())
+
+    def test_missing_source_chained(self, snapshot, routes_module):
+        """The OSError of a missing source should be kept as the cause."""
+        routes_module.unlink()
+
+        with pytest.raises(StaleSnapshotError) as info:
+            load_snapshot(str(snapshot), App())
+        assert isinstance(info.value.__cause__, FileNotFoundError)
+
+    def test_check_can_be_skipped(self, snapshot, routes_module):
+        """check=False should load regardless of the sources."""
+        routes_module.write_text(ROUTES + "\n# edited\n")
+
+        app = load_snapshot(str(snapshot), App(), check=False)
+
+        assert Client(app).get("/").text == "index"
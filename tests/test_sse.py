@@ -0,0 +1,260 @@
+import socket
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+from blank import SSE, App, Broadcaster, Response, Router
+from blank.core.sse import Subscription, format_event
+from blank.testing import Client
+
+
+def subscribe(address, path="/events"):
+    """Open a raw socket and send an SSE request."""
+    sock = socket.create_connection(address, timeout=5)
+    sock.sendall(f"GET {path} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+    return sock
+
+
+def read_until(sock, marker):
+    """Read from sock until marker has been received."""
+    data = b""
+    while marker not in data:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+def wait_for(condition, timeout=5):
+    """Poll condition until it holds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+class TestFormatEvent:
+    """Tests for event serialization."""
+
+    def test_text(self):
+        """Strings should become data lines."""
+        assert format_event("hi") == b"data: hi\n\n"
+
+    def test_fields_and_multiline(self):
+        """event, id and multi-line data should follow the SSE format."""
+        assert format_event("a\nb", event="tick", id="3") == (
+            b"event: tick\nid: 3\ndata: a\ndata: b\n\n"
+        )
+
+    def test_json(self):
+        """Non-string data should be sent as JSON."""
+        assert format_event({"cpu": 1}) == b'data: {"cpu": 1}\n\n'
+
+
+class TestClientStream:
+    """Tests for SSE routes through the test Client."""
+
+    def test_receives_events(self):
+        """Published events should reach the subscriber."""
+        updates = Broadcaster(heartbeat=None)
+
+        @SSE("/events")
+        def events():
+            return updates
+
+        with Client().stream("/events") as stream:
+            updates.publish("one")
+            updates.publish({"n": 2}, event="count")
+            assert stream.get(1) == b"data: one\n\n"
+            assert stream.get(1) == b'event: count\ndata: {"n": 2}\n\n'
+
+        assert updates.stats()["subscribers"] == 0
+
+    def test_channel_by_path_param(self, app):
+        """Handlers may pick a broadcaster per path and refuse unknown ones."""
+        channels = {"cpu": Broadcaster(heartbeat=None)}
+
+        @app.sse("/channels/{name}")
+        def channel(name):
+            if name not in channels:
+                return Response("No such channel", status=404)
+            return channels[name]
+
+        client = Client(app)
+        assert client.get("/channels/disk").status_code == 404
+        with client.stream("/channels/cpu") as stream:
+            channels["cpu"].publish("42")
+            assert stream.get(1) == b"data: 42\n\n"
+
+    def test_get_reports_stream_headers(self, app):
+        """A plain GET should report the stream's status and headers."""
+        app.sse("/events")(lambda: Broadcaster(heartbeat=None))
+
+        response = Client(app).get("/events")
+
+        assert response.status_code == 200
+        assert response.headers["Content-Type"] == "text/event-stream"
+
+    def test_close_ends_stream(self, app):
+        """Closing the broadcaster should end iteration."""
+        updates = Broadcaster(heartbeat=None)
+        app.sse("/events")(lambda: updates)
+
+        stream = Client(app).stream("/events")
+        updates.publish("last")
+        updates.close()
+
+        assert list(stream) == [b"data: last\n\n"]
+
+    def test_event_during_subscribe(self):
+        """An event delivered before subscribe() returns should be received."""
+        class Eager(Broadcaster):
+            def subscribe(self, hub):
+                subscribed = super().subscribe(hub)
+                self.publish("early")
+                return subscribed
+
+        updates = Eager(heartbeat=None)
+        stream = Subscription(updates)
+        updates.close()
+
+        assert list(stream) == [b"data: early\n\n"]
+
+    def test_slow_subscriber_dropped(self, app):
+        """A subscriber falling too far behind should be dropped."""
+        updates = Broadcaster(heartbeat=None, max_buffer=100)
+        app.sse("/events")(lambda: updates)
+
+        stream = Client(app).stream("/events")
+        for _ in range(10):
+            updates.publish("x" * 20)
+
+        assert len(list(stream)) == 3
+        assert updates.stats()["slow"] == 1
+        assert updates.stats()["subscribers"] == 0
+
+
+class TestSelectorServerStreams:
+    """Tests for SSE streams held open on the selector loop."""
+
+    def test_fan_out(self, serve):
+        """Every subscriber should get the same event bytes."""
+        app = App()
+        updates = Broadcaster(heartbeat=None, retry=1000)
+        app.sse("/events")(lambda: updates)
+        server = serve(app)
+
+        socks = [subscribe(server.server_address) for _ in range(20)]
+        for sock in socks:
+            head = read_until(sock, b"retry: 1000\n\n")
+            assert head.startswith(b"HTTP/1.1 200 OK\r\n")
+            assert b"Content-Type: text/event-stream" in head
+        wait_for(lambda: updates.stats()["subscribers"] == 20)
+
+        updates.publish("hello", id="1")
+        for sock in socks:
+            assert read_until(sock, b"\n\n") == b"id: 1\ndata: hello\n\n"
+            sock.close()
+
+        wait_for(lambda: updates.stats()["subscribers"] == 0)
+        assert server.connection_count == 0
+
+    def test_heartbeat(self, serve):
+        """Idle streams should receive periodic comment lines."""
+        app = App()
+        updates = Broadcaster(heartbeat=0.05)
+        app.sse("/events")(lambda: updates)
+        server = serve(app)
+
+        sock = subscribe(server.server_address)
+        read_until(sock, b"\r\n\r\n")
+
+        assert read_until(sock, b":\n\n").endswith(b":\n\n")
+        sock.close()
+        updates.close()
+
+    def test_slow_consumer_disconnected(self, serve):
+        """A stream that stops reading should be dropped, not buffered forever."""
+        app = App()
+        updates = Broadcaster(heartbeat=None, max_buffer=64 * 1024)
+        app.sse("/events")(lambda: updates)
+        server = serve(app)
+
+        sock = socket.socket()
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        sock.connect(server.server_address)
+        sock.sendall(b"GET /events HTTP/1.1\r\n\r\n")
+        wait_for(lambda: updates.stats()["subscribers"] == 1)
+
+        chunk = "x" * 16384
+        for _ in range(1000):
+            updates.publish(chunk)
+            if server.stats["slow_consumers"]:
+                break
+            time.sleep(0.001)
+
+        wait_for(lambda: server.stats["slow_consumers"] == 1)
+        assert updates.stats()["slow"] == 1
+        assert server.connection_count == 0
+        sock.close()
+
+    def test_regular_routes_still_served(self, serve):
+        """Open streams should not block other requests."""
+        app = App()
+        updates = Broadcaster(heartbeat=None)
+        app.sse("/events")(lambda: updates)
+        app.get("/ping")(lambda: "pong")
+        server = serve(app)
+
+        streams = [subscribe(server.server_address) for _ in range(50)]
+        wait_for(lambda: updates.stats()["subscribers"] == 50)
+
+        ping = socket.create_connection(server.server_address, timeout=5)
+        ping.sendall(b"GET /ping HTTP/1.1\r\nConnection: close\r\n\r\n")
+        assert read_until(ping, b"pong").endswith(b"pong")
+
+        for sock in streams + [ping]:
+            sock.close()
+
+    def test_close_ends_streams(self, serve):
+        """Closing the broadcaster should flush and close every stream."""
+        app = App()
+        updates = Broadcaster(heartbeat=None)
+        app.sse("/events")(lambda: updates)
+        server = serve(app)
+
+        sock = subscribe(server.server_address)
+        wait_for(lambda: updates.stats()["subscribers"] == 1)
+        updates.publish("bye")
+        updates.close()
+
+        data = read_until(sock, b"never")
+        assert data.endswith(b"data: bye\n\n")
+        sock.close()
+
+
+class TestRouterStreams:
+    """Tests for SSE on the thread-per-connection Router."""
+
+    def test_stream(self):
+        """Router should relay events until the broadcaster closes."""
+        app = App()
+        updates = Broadcaster(heartbeat=None)
+        app.sse("/events")(lambda: updates)
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Router)
+        server.app = app
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            sock = subscribe(server.server_address)
+            read_until(sock, b"\r\n\r\n")
+            wait_for(lambda: updates.stats()["subscribers"] == 1)
+            updates.publish("hi")
+            assert read_until(sock, b"\n\n").endswith(b"data: hi\n\n")
+            updates.close()
+            assert read_until(sock, b"never") == b""
+            sock.close()
+        finally:
+            server.shutdown()
+            server.server_close()
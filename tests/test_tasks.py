@@ -0,0 +1,243 @@
+import http.client
+import threading
+import time
+
+import pytest
+
+from blank import POST, SelectorServer, TaskQueue
+from blank.testing import Client
+
+
+class TestScheduling:
+    """Tests for scheduling tasks from handlers."""
+
+    def test_runs_after_handler(self, client):
+        """Tasks should run after the handler returned."""
+        calls = []
+
+        @POST("/signup")
+        def signup(email, request):
+            request.add_task(calls.append, f"welcome {email}")
+            calls.append("handler")
+            return "ok"
+
+        response = client.post("/signup?email=ada")
+
+        assert response.text == "ok"
+        assert calls == ["handler", "welcome ada"]
+
+    def test_kwargs_are_passed(self, client):
+        """Keyword arguments should reach the task."""
+        seen = {}
+
+        @POST("/audit")
+        def audit(request):
+            request.add_task(seen.update, action="login", user=7)
+            return "ok"
+
+        client.post("/audit")
+        assert seen == {"action": "login", "user": 7}
+
+    def test_request_injected_only_when_declared(self, client):
+        """Handlers without a request parameter should not receive it."""
+        @POST("/plain")
+        def plain(**params):
+            return ",".join(sorted(params))
+
+        assert client.post("/plain?a=1").text == "a"
+
+    def test_no_tasks_when_handler_fails(self, client):
+        """Tasks of a failed request should not run."""
+        calls = []
+
+        @POST("/fail")
+        def fail(request):
+            request.add_task(calls.append, "task")
+            raise RuntimeError("boom")
+
+        assert client.post("/fail").status_code == 500
+        assert calls == []
+
+
+class TestClientModes:
+    """Tests for Client sync_tasks."""
+
+    def test_sync_mode_runs_before_return(self, app):
+        """With sync_tasks the task should have run when the call returns."""
+        done = []
+
+        @app.post("/job")
+        def job(request):
+            request.add_task(lambda: (time.sleep(0.05), done.append(1)))
+            return "queued"
+
+        Client(app, sync_tasks=True).post("/job")
+        assert done == [1]
+
+    def test_async_mode_uses_app_queue(self, app):
+        """Without sync_tasks the task should go through app.tasks."""
+        ran = threading.Event()
+
+        @app.post("/job")
+        def job(request):
+            request.add_task(ran.set)
+            return "queued"
+
+        Client(app, sync_tasks=False).post("/job")
+
+        assert ran.wait(5)
+        app.tasks.shutdown(5)
+        assert app.tasks.stats()["completed"] == 1
+
+
+class TestTaskQueue:
+    """Tests for the bounded executor."""
+
+    def test_reports_failures(self):
+        """Failing tasks should be reported through on_error."""
+        errors = []
+        tasks = TaskQueue(on_error=lambda error, task: errors.append((str(error), task[1])))
+
+        def boom(x):
+            raise ValueError("bad")
+
+        tasks.run([(boom, (1,), {})])
+
+        assert errors == [("bad", (1,))]
+        assert tasks.stats()["failed"] == 1
+
+    def test_failing_error_hook(self, capsys):
+        """An error hook that raises should not stop the worker."""
+        def hook(error, task):
+            raise RuntimeError("hook down")
+
+        results = []
+        tasks = TaskQueue(workers=1, on_error=hook)
+
+        tasks.submit([(lambda: 1 / 0, (), {})])
+        tasks.submit([(results.append, (1,), {})])
+        tasks.shutdown(5)
+
+        assert results == [1]
+        assert tasks.stats()["completed"] == 1
+        assert "hook down" in capsys.readouterr().err
+
+    def test_drop_policy(self):
+        """With 'drop' a full queue should discard new tasks."""
+        release = threading.Event()
+        tasks = TaskQueue(workers=1, max_queue=1, policy="drop")
+
+        tasks.submit([(release.wait, (5,), {})])
+        time.sleep(0.05)
+        assert tasks.submit([(print, (), {})])
+        assert not tasks.submit([(print, (), {})])
+
+        release.set()
+        tasks.shutdown(5)
+        assert tasks.stats()["dropped"] == 1
+
+    def test_block_policy(self):
+        """With 'block' a full queue should make the submitter wait."""
+        release = threading.Event()
+        results = []
+        tasks = TaskQueue(workers=1, max_queue=1, policy="block")
+
+        tasks.submit([(release.wait, (5,), {})])
+        time.sleep(0.05)
+        tasks.submit([(results.append, (1,), {})])
+
+        submitter = threading.Thread(target=tasks.submit, args=([(results.append, (2,), {})],))
+        submitter.start()
+        time.sleep(0.05)
+        assert submitter.is_alive()
+
+        release.set()
+        submitter.join(5)
+        tasks.shutdown(5)
+        assert results == [1, 2]
+        assert tasks.stats()["dropped"] == 0
+
+    def test_shutdown_drains(self):
+        """shutdown() should wait for every queued task."""
+        results = []
+        tasks = TaskQueue(workers=2)
+
+        for i in range(50):
+            tasks.submit([(lambda i=i: (time.sleep(0.001), results.append(i)), (), {})])
+        tasks.shutdown()
+
+        assert sorted(results) == list(range(50))
+        assert not tasks.submit([(results.append, (99,), {})])
+
+    def test_shutdown_timeout_with_full_queue(self):
+        """shutdown() should return after its timeout even if the queue is full."""
+        release = threading.Event()
+        results = []
+        tasks = TaskQueue(workers=1, max_queue=1)
+        tasks.submit([(release.wait, (5,), {})])
+        time.sleep(0.05)
+        assert tasks.submit([(results.append, (1,), {})])
+
+        started = time.monotonic()
+        tasks.shutdown(0.2)
+        assert time.monotonic() - started < 1.0
+
+        release.set()
+        for thread in tasks._threads:
+            thread.join(5)
+            assert not thread.is_alive()
+        assert results == [1]
+
+    def test_rejects_unknown_policy(self):
+        """Only 'drop' and 'block' are valid policies."""
+        with pytest.raises(ValueError):
+            TaskQueue(policy="ignore")
+
+
+class TestServerIntegration:
+    """Tests for running tasks after the response is written."""
+
+    def test_runs_after_response_flushed(self, app):
+        """The client should get the response before a slow task finishes."""
+        finished = threading.Event()
+
+        @app.post("/signup")
+        def signup(request):
+            request.add_task(lambda: (time.sleep(0.5), finished.set()))
+            return "ok"
+
+        server = SelectorServer(("127.0.0.1", 0), app)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        try:
+            conn = http.client.HTTPConnection(*server.server_address)
+            started = time.monotonic()
+            conn.request("POST", "/signup")
+            assert conn.getresponse().read() == b"ok"
+            assert time.monotonic() - started < 0.4
+            assert not finished.is_set()
+            assert finished.wait(5)
+        finally:
+            server.shutdown()
+            server.server_close()
+            app.tasks.shutdown(5)
+
+    def test_full_block_queue_does_not_stall_loop(self, app, serve):
+        """With policy='block', SelectorServer should drop rather than freeze its loop."""
+        release = threading.Event()
+        app.tasks = TaskQueue(workers=1, max_queue=1, policy="block")
+
+        @app.post("/signup")
+        def signup(request):
+            request.add_task(release.wait, 5)
+            return "ok"
+
+        server = serve(app)
+        try:
+            conn = http.client.HTTPConnection(*server.server_address, timeout=2)
+            for _ in range(4):
+                conn.request("POST", "/signup")
+                assert conn.getresponse().read() == b"ok"
+            assert app.tasks.stats()["dropped"] >= 1
+        finally:
+            release.set()
+            app.tasks.shutdown(5)
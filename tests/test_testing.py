@@ -0,0 +1,121 @@
+import multiprocessing
+import sys
+import time
+
+import pytest
+
+from blank import App, Runner, testing
+
+
+@pytest.fixture
+def users(app):
+    """App echoing user ids and JSON bodies."""
+    @app.get("/users/{id}")
+    def get_user(id):
+        return f"User {id}"
+
+    @app.post("/users")
+    def create_user(request):
+        return f"created {request.json()['name']}"
+
+    return app
+
+
+class TestRunner:
+    """Tests for running many requests concurrently."""
+
+    def test_results_in_request_order(self, users):
+        """Results should line up with the requests, whichever worker ran them."""
+        result = Runner(users, workers=3).run([f"/users/{i}" for i in range(50)])
+
+        assert len(result) == 50
+        assert result.bodies == [f"User {i}" for i in range(50)]
+        assert result[7] == (200, "User 7")
+        assert result.status_counts() == {200: 50}
+        assert result.responses is None
+
+    def test_request_tuples(self, users):
+        """Tuples should carry method, headers and a str, bytes or JSON body."""
+        result = Runner(users, workers=2).run([
+            ("POST", "/users", None, {"name": "ada"}),
+            ("POST", "/users", {"Content-Type": "application/json"}, '{"name": "bob"}'),
+            ("GET", "/missing"),
+        ])
+        assert list(result.statuses) == [200, 200, 404]
+        assert result.bodies[:2] == ["created ada", "created bob"]
+
+    def test_responses_on_request(self, users):
+        """responses=True should also build TestResponse objects."""
+        result = Runner(users).run(["/users/1"], responses=True)
+        (response,) = result.responses
+        assert isinstance(response, testing.TestResponse)
+        assert (response.status_code, response.text) == (200, "User 1")
+        assert isinstance(response.headers, dict)
+
+    def test_summary(self, users):
+        """summary() should report throughput and latency percentiles."""
+        users.get("/slow")(lambda: time.sleep(0.01) or "slow")
+
+        summary = Runner(users, workers=2).run(["/slow"] * 4).summary()
+
+        assert summary["requests"] == 4
+        assert summary["failures"] == 0
+        assert summary["rps"] > 0
+        assert 10 <= summary["p50_ms"] <= summary["p99_ms"] <= summary["max_ms"]
+        assert summary["mean_ms"] >= 10
+
+    def test_failures(self):
+        """Handler errors and exceptions escaping dispatch should be reported."""
+        class Broken(App):
+            def dispatch(self, method, target, *args):
+                if target == "/broken":
+                    raise KeyError("dispatch")
+                return super().dispatch(method, target, *args)
+
+        app = Broken()
+        app.get("/fail")(lambda: 1 / 0)
+        app.get("/ok")(lambda: "ok")
+
+        failures = Runner(app).run(["/ok", "/fail", "/broken"]).failures()
+
+        assert [(index, status) for index, status, _ in failures] == [(1, 500), (2, 0)]
+        assert "KeyError: 'dispatch'" in failures[1][2]
+
+    def test_surfaces_race(self, app):
+        """An unsynchronized read-modify-write should lose updates under the runner."""
+        state = {"count": 0}
+
+        @app.post("/increment")
+        def increment():
+            count = state["count"]
+            time.sleep(0)
+            state["count"] = count + 1
+            return str(count)
+
+        result = Runner(app, workers=8, switch_interval=1e-6).run([("POST", "/increment")] * 400)
+
+        assert result.failures() == []
+        assert state["count"] < 400
+        assert len(set(result.bodies)) < 400
+
+    def test_switch_interval_restored(self, app):
+        """The thread switch interval should be restored after the run."""
+        interval = sys.getswitchinterval()
+        Runner(app, switch_interval=1e-6).run(["/"])
+        assert sys.getswitchinterval() == interval
+
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+    )
+    def test_processes(self, users):
+        """The process executor should return the same results."""
+        result = Runner(users, workers=2, executor="process").run(
+            [f"/users/{i}" for i in range(20)], responses=True
+        )
+        assert result.bodies == [f"User {i}" for i in range(20)]
+        assert result.responses[3].text == "User 3"
+
+    def test_unknown_executor(self, app):
+        """Unknown executors should be rejected."""
+        with pytest.raises(ValueError):
+            Runner(app, executor="fiber")
@@ -0,0 +1,172 @@
+import http.client
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from blank import Response, Router, server_timing
+from blank.core.app import INTERNAL_ERROR
+from blank.core.http import StaticResponse
+from blank.core.timing import ServerTiming
+from blank.testing import Client
+
+
+@pytest.fixture
+def timed(app):
+    """App with Server-Timing enabled."""
+    app.server_timing = True
+    return app
+
+
+def metrics(header):
+    """Server-Timing header as {name: duration or None}."""
+    result = {}
+    for part in header.split(", "):
+        name, *params = part.split(";")
+        durations = [float(p[4:]) for p in params if p.startswith("dur=")]
+        result[name] = durations[0] if durations else None
+    return result
+
+
+class TestServerTiming:
+    """Tests for the Server-Timing header."""
+
+    def test_disabled_by_default(self, app):
+        """Without the option no header should be added."""
+        app.get("/hello")(lambda: "hello")
+        assert "Server-Timing" not in Client(app).get("/hello").headers
+
+    def test_phases(self, timed):
+        """All four phases should be reported, in order."""
+        timed.get("/users/{id}")(lambda id, q=None: f"User {id}")
+
+        header = Client(timed).get("/users/42?q=x").headers["Server-Timing"]
+
+        assert list(metrics(header)) == ["parse", "lookup", "binding", "handler"]
+        assert all(value >= 0 for value in metrics(header).values())
+        assert re.fullmatch(r"(\w+;dur=\d+\.\d{3}(, )?)+", header)
+
+    def test_handler_duration(self, timed):
+        """The handler phase should include the handler's own time."""
+        timed.get("/slow")(lambda: time.sleep(0.02) or "done")
+        header = Client(timed).get("/slow").headers["Server-Timing"]
+        assert metrics(header)["handler"] >= 20
+
+    def test_unmatched(self, timed):
+        """A 404 should report parsing and lookup only."""
+        response = Client(timed).get("/missing")
+        assert response.status_code == 404
+        assert list(metrics(response.headers["Server-Timing"])) == ["parse", "lookup"]
+
+    def test_handler_error(self, timed):
+        """A 500 should still carry the header."""
+        @timed.get("/fail")
+        def fail():
+            raise RuntimeError("boom")
+
+        response = Client(timed).get("/fail")
+        assert response.status_code == 500
+        assert "handler" in metrics(response.headers["Server-Timing"])
+
+    def test_static_response_not_mutated(self, timed):
+        """A shared StaticResponse should be copied, not modified."""
+        shared = StaticResponse("busy", 503, "Service Unavailable", {"Content-Type": "text/plain"})
+        timed.get("/busy")(lambda: shared)
+
+        response = Client(timed).get("/busy")
+        assert response.status_code == 503
+        assert "Server-Timing" in response.headers
+        assert "Server-Timing" not in shared.headers
+
+    def test_head_of_static_response(self, timed):
+        """HEAD on a failing route should not add the header to the shared 500."""
+        timed.production = True
+        timed.log_sample_rate = 0.0
+        timed.get("/fail")(lambda: 1 / 0)
+
+        response = timed.dispatch("HEAD", "/fail")
+
+        assert "Server-Timing" in response.headers
+        assert "Server-Timing" not in INTERNAL_ERROR.headers
+
+    def test_router(self, timed):
+        """Router should send the header."""
+        timed.get("/hello")(lambda: "hello")
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Router)
+        server.app = timed
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            conn = http.client.HTTPConnection(*server.server_address)
+            conn.request("GET", "/hello")
+            response = conn.getresponse()
+            response.read()
+            conn.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert "handler" in metrics(response.getheader("Server-Timing"))
+
+
+class TestCustomMetrics:
+    """Tests for metrics added by handlers."""
+
+    def test_metric(self, timed):
+        """Handlers should be able to add named metrics with descriptions."""
+        @timed.get("/report")
+        def report():
+            server_timing("db", 12.5, 'query "users"')
+            server_timing("cache-hit")
+            return "ok"
+
+        header = Client(timed).get("/report").headers["Server-Timing"]
+        assert header.endswith(', db;dur=12.500;desc="query \\"users\\"", cache-hit')
+
+    def test_noop_when_disabled(self, app):
+        """server_timing() should do nothing without the option."""
+        @app.get("/report")
+        def report():
+            server_timing("db", 1.0)
+            return "ok"
+
+        response = Client(app).get("/report")
+        assert response.text == "ok"
+        assert "Server-Timing" not in response.headers
+        server_timing("outside", 1.0)
+
+    def test_nested_dispatch(self, timed):
+        """Sub-requests of a batch should keep their metrics to themselves."""
+        @timed.get("/inner")
+        def inner():
+            server_timing("inner")
+            return "inner"
+
+        timed.batch()
+        response = Client(timed).post("/batch", json=[{"path": "/inner"}])
+
+        assert "inner" not in metrics(response.headers["Server-Timing"])
+        sub = response.json()[0]["headers"]["Server-Timing"]
+        assert "inner" in metrics(sub)
+
+    def test_rejected_target_releases_timer(self, timed):
+        """A target that fails to parse should not leave its timer current."""
+        with pytest.raises(ValueError):
+            timed.dispatch("GET", "//[oops")
+
+        server_timing("leaked", 1.0)
+        timing = ServerTiming.start()
+        assert timing.previous is None and timing.metrics is None
+        timing.finish(Response(""), 0)
+
+    def test_timers_are_reused(self, timed):
+        """Requests on one thread should reuse the same pooled timer."""
+        timed.get("/hello")(lambda: "hello")
+        client = Client(timed)
+        client.get("/hello")
+        first = ServerTiming.start()
+        first.finish(Response(""), 0)
+        client.get("/hello")
+        second = ServerTiming.start()
+        second.finish(Response(""), 0)
+        assert second is first
@@ -0,0 +1,231 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from blank import App, JSONLinesExporter, MemoryExporter, SelectorServer, Tracer, span
+from blank.core.tracing import parse_traceparent, traceparent
+from blank.testing import Client
+
+PARENT = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+
+@pytest.fixture
+def traced():
+    """App tracing every request into an in-process collector."""
+    app = App()
+    exporter = MemoryExporter()
+    app.tracer = Tracer(sample_rate=1.0, exporter=exporter)
+    yield app, exporter
+    app.tracer.shutdown(5)
+
+
+def spans_by_name(exporter):
+    """Map span name -> span dict (names are unique in these tests)."""
+    return {item["name"]: item for item in exporter.spans}
+
+
+class TestTraceparent:
+    """Tests for W3C traceparent parsing."""
+
+    def test_valid(self):
+        """A well-formed header should yield ids and the sampled flag."""
+        assert parse_traceparent(PARENT) == (
+            "0af7651916cd43dd8448eb211c80319c", "b7ad6b7169203331", True
+        )
+
+    @pytest.mark.parametrize("value", [
+        None,
+        "",
+        "garbage",
+        "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331",
+        "00-00000000000000000000000000000000-b7ad6b7169203331-01",
+        "ff-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01",
+        "00-0af7651916cd43dd8448eb211c80319c-zzzzzzzzzzzzzzzz-01",
+    ])
+    def test_invalid(self, value):
+        """Malformed headers should be ignored."""
+        assert parse_traceparent(value) is None
+
+
+class TestSpans:
+    """Tests for the spans recorded per request."""
+
+    def test_phases(self, traced):
+        """A sampled request should record parse, match and handler under the root."""
+        app, exporter = traced
+        app.get("/users/{id}")(lambda id, x: f"User {id}")
+
+        Client(app).get("/users/42?x=1")
+        app.tracer.flush(5)
+
+        spans = spans_by_name(exporter)
+        assert set(spans) == {"request", "parse", "match", "handler"}
+        root = spans["request"]
+        assert root["parent_id"] is None
+        assert root["attributes"] == {"method": "GET", "target": "/users/42?x=1", "status": 200}
+        for name in ("parse", "match", "handler"):
+            assert spans[name]["parent_id"] == root["span_id"]
+            assert spans[name]["trace_id"] == root["trace_id"]
+            assert spans[name]["duration_ns"] >= 0
+
+    def test_handler_child_spans(self, traced):
+        """Spans opened by the handler should nest under the handler span."""
+        app, exporter = traced
+
+        @app.get("/report")
+        def report():
+            with span("db", table="orders") as db:
+                db.set("rows", 3)
+                with span("decode"):
+                    pass
+            return "ok"
+
+        Client(app).get("/report")
+        app.tracer.flush(5)
+
+        spans = spans_by_name(exporter)
+        assert spans["db"]["parent_id"] == spans["handler"]["span_id"]
+        assert spans["db"]["attributes"] == {"table": "orders", "rows": 3}
+        assert spans["decode"]["parent_id"] == spans["db"]["span_id"]
+
+    def test_handler_error_recorded(self, traced):
+        """A failing handler should mark its span and the root status."""
+        app, exporter = traced
+
+        @app.get("/boom")
+        def boom():
+            raise RuntimeError("kaput")
+
+        assert Client(app).get("/boom").status_code == 500
+        app.tracer.flush(5)
+
+        spans = spans_by_name(exporter)
+        assert "kaput" in spans["handler"]["attributes"]["error"]
+        assert spans["request"]["attributes"]["status"] == 500
+
+    def test_not_found_traced(self, traced):
+        """Unmatched requests should still be exported."""
+        app, exporter = traced
+
+        Client(app).get("/missing")
+        app.tracer.flush(5)
+
+        assert spans_by_name(exporter)["request"]["attributes"]["status"] == 404
+
+
+class TestSampling:
+    """Tests for head-based sampling and propagation."""
+
+    def test_unsampled_records_nothing(self):
+        """With rate 0, handlers get a no-op span and nothing is exported."""
+        app = App()
+        exporter = MemoryExporter()
+        app.tracer = Tracer(sample_rate=0.0, exporter=exporter)
+
+        @app.get("/x")
+        def x():
+            with span("work") as s:
+                s.set("a", 1)
+            return str(traceparent())
+
+        assert Client(app).get("/x").text == "None"
+        app.tracer.flush(5)
+        assert exporter.spans == []
+        assert app.tracer.stats()["sampled"] == 0
+
+    def test_rate_is_respected(self):
+        """Roughly sample_rate of requests should be sampled."""
+        app = App()
+        app.tracer = Tracer(sample_rate=0.25)
+        app.get("/x")(lambda: "x")
+        client = Client(app)
+
+        for _ in range(2000):
+            client.get("/x")
+
+        assert 350 < app.tracer.stats()["sampled"] < 650
+        app.tracer.shutdown(5)
+
+    def test_joins_incoming_trace(self, traced):
+        """A sampled traceparent should set the trace id and root parent."""
+        app, exporter = traced
+
+        @app.get("/x")
+        def x():
+            return traceparent()
+
+        outgoing = Client(app).get("/x", headers={"traceparent": PARENT}).text
+        app.tracer.flush(5)
+
+        spans = spans_by_name(exporter)
+        assert spans["request"]["trace_id"] == "0af7651916cd43dd8448eb211c80319c"
+        assert spans["request"]["parent_id"] == "b7ad6b7169203331"
+        assert outgoing == f"00-0af7651916cd43dd8448eb211c80319c-{spans['handler']['span_id']}-01"
+
+    def test_honours_unsampled_parent(self, traced):
+        """An unsampled traceparent should not be traced even at rate 1."""
+        app, exporter = traced
+        app.get("/x")(lambda: "x")
+
+        Client(app).get("/x", headers={"traceparent": PARENT[:-2] + "00"})
+        app.tracer.flush(5)
+
+        assert exporter.spans == []
+
+
+class TestExport:
+    """Tests for batched export."""
+
+    def test_batches(self):
+        """Spans should be exported in batches of at most batch_size."""
+        batches = []
+
+        class Recorder:
+            def export(self, spans):
+                batches.append(len(spans))
+
+        app = App()
+        app.tracer = Tracer(sample_rate=1.0, exporter=Recorder(), batch_size=10)
+        app.get("/x")(lambda: "x")
+        client = Client(app)
+        for _ in range(20):
+            client.get("/x")
+        app.tracer.shutdown(5)
+
+        assert sum(batches) == 80
+        assert max(batches) <= 10
+
+    def test_json_lines_file(self, tmp_path):
+        """The JSON-lines exporter should write one span per line."""
+        path = tmp_path / "spans.jsonl"
+        app = App()
+        app.tracer = Tracer(sample_rate=1.0, exporter=JSONLinesExporter(str(path)))
+        app.get("/x")(lambda: "x")
+
+        Client(app).get("/x")
+        app.tracer.shutdown(5)
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert sorted(item["name"] for item in lines) == ["handler", "match", "parse", "request"]
+
+    def test_selector_server_records_write(self, traced):
+        """SelectorServer should add the write phase before exporting."""
+        app, exporter = traced
+        app.get("/x")(lambda: "x")
+
+        server = SelectorServer(("127.0.0.1", 0), app)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        try:
+            conn = http.client.HTTPConnection(*server.server_address)
+            conn.request("GET", "/x")
+            assert conn.getresponse().read() == b"x"
+            conn.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+        app.tracer.flush(5)
+
+        spans = spans_by_name(exporter)
+        assert spans["write"]["parent_id"] == spans["request"]["span_id"]